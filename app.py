@@ -1,48 +1,197 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import folium
-from streamlit_folium import folium_static
 import os
-import plotly.graph_objects as go
-from utils.visualization import create_choropleth_map, create_time_series, create_folium_map, add_markers_to_map
+from utils.data_cache import cached_read_processed, processed_file, file_version, get_dataset_cache
+from utils.geography import location_centroids, build_dim_state, build_dim_region
+from utils.facets import get_facet_index
+from utils.rollups import ROLLUPS, build_rollup, rollup_file_name
+from utils.search import SOURCES, DOCUMENTS_NAME, INDEX_NAME, SearchIndex, build_documents, get_search_index
+from utils import spatial
+from utils.seasonal import MONTHS, CUBE_NAME, SeasonalCube
+from utils.metrics import (span, record_span, start_trace, current_trace, trace_seconds,
+                           configure_logging, prometheus_enabled, write_prometheus)
+
+# Every rerun records a fresh set of timing spans for the debug panel
+configure_logging()
+start_trace()
 
 # Initialize session state for favorites
 if 'favorites' not in st.session_state:
     st.session_state.favorites = []
 
+# Processed datasets used by the app, keyed by the name pages refer to them by
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'processed')
+PROCESSED_DATASETS = {
+    'tourism': 'tourism_statistics_processed',  # Tourism Statistics
+    'sites': 'cultural_sites_processed',  # Cultural Sites
+    'art': 'art_forms_processed',  # Art Forms
+    'funding': 'government_funding_processed',  # Government Funding
+    'places': 'places_processed',  # Top Indian Places to Visit
+    'dim_state': 'dim_state',  # State dimension with centroids
+    'dim_region': 'dim_region'  # Region dimension with centroids
+}
+
+# Dimensions are static tables, so they are rebuilt in memory when their
+# files have not been written yet, e.g. before the pipeline was re-run
+DIMENSION_BUILDERS = {
+    'dim_state': build_dim_state,
+    'dim_region': build_dim_region
+}
+
+# Datasets each page reads; pages not listed load nothing. Plotting and
+# mapping libraries are likewise imported inside the pages that draw with
+# them, so a cold process serving the Home page never pays for them.
+PAGE_DATASETS = {
+    "Art Forms Explorer": ['art', 'dim_state', 'dim_region'],
+    "Cultural Tourism Analysis": ['tourism', 'sites'],
+    "Government Initiatives": ['funding'],
+    "Places Explorer": ['places'],
+    "Itinerary Planner": ['places']
+}
+
 # Function to load data
-def load_data():
-    """Load processed data for visualization"""
-    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'processed')
+def load_data(keys=None):
+    """
+    Load processed data for visualization.
+    Files are read through the process-wide dataset cache, so reruns and
+    other sessions reuse the parsed frames until a file changes on disk.
+    Each dataset is read from its memory-mapped Parquet file when the
+    pipeline produced one, falling back to the CSV export otherwise;
+    missing dimension files are built from DIMENSION_BUILDERS.
     
+    Args:
+        keys (list, optional): Keys of PROCESSED_DATASETS to load. Defaults to all
+    """
     data = {}
     
-    # Tourism Statistics
-    tourism_file = os.path.join(data_dir, 'tourism_statistics_processed.csv')
-    if os.path.exists(tourism_file):
-        data['tourism'] = pd.read_csv(tourism_file)
+    for key in PROCESSED_DATASETS if keys is None else keys:
+        df = cached_read_processed(DATA_DIR, PROCESSED_DATASETS[key])
+        if df is None and key in DIMENSION_BUILDERS:
+            df = DIMENSION_BUILDERS[key]()
+        if df is not None:
+            data[key] = df
     
-    # Cultural Sites
-    sites_file = os.path.join(data_dir, 'cultural_sites_processed.csv')
-    if os.path.exists(sites_file):
-        data['sites'] = pd.read_csv(sites_file)
+    return data
+
+def load_data_versions(keys=None):
+    """Return a version token per dataset, used to key caches of derived views such as maps"""
+    return {
+        key: file_version(processed_file(DATA_DIR, PROCESSED_DATASETS[key]))
+        for key in (PROCESSED_DATASETS if keys is None else keys)
+    }
+
+def load_rollup(name):
+    """
+    Load a pre-aggregated rollup table produced by the data processing step.
+    Falls back to aggregating the source dataset when the rollup has not
+    been materialized yet, e.g. before the pipeline was re-run.
     
-    # Art Forms
-    art_file = os.path.join(data_dir, 'art_forms_processed.csv')
-    if os.path.exists(art_file):
-        data['art'] = pd.read_csv(art_file)
+    Returns:
+        tuple: (rollup DataFrame or None, version token for cache keys)
+    """
+    path = processed_file(DATA_DIR, rollup_file_name(name))
+    if path is not None:
+        return cached_read_processed(DATA_DIR, rollup_file_name(name)), file_version(path)
     
-    # Government Funding
-    funding_file = os.path.join(data_dir, 'government_funding_processed.csv')
-    if os.path.exists(funding_file):
-        data['funding'] = pd.read_csv(funding_file)
+    spec = ROLLUPS[name]
+    source_key = next((key for key, source in PROCESSED_DATASETS.items() if source == spec['source']), None)
+    if source_key not in data:
+        return None, None
+    return build_rollup(data[source_key], spec), data_versions[source_key]
+
+def facet_filters(index, labels, key_prefix, combine='and'):
+    """
+    Render one sidebar multiselect per facet of a FacetIndex, labelling each
+    value with the number of rows it would match given the other selections.
     
-    return data
+    Args:
+        index (FacetIndex): Index over the dataset being filtered
+        labels (dict): Facet column mapped to its widget label
+        key_prefix (str): Prefix for the widget keys
+        combine (str): 'and' or 'or', how the facets are combined
+        
+    Returns:
+        dict: Facet column mapped to the list of selected values
+    """
+    # Widget values from the previous run drive the counts shown in this one
+    selections = {col: st.session_state.get(f"{key_prefix}_{col}", []) for col in index.columns}
+    counts = index.facet_counts(selections, combine)
+    for col in index.columns:
+        selections[col] = st.sidebar.multiselect(
+            labels.get(col, col), index.values[col], key=f"{key_prefix}_{col}",
+            format_func=lambda value, col_counts=counts[col]: f"{value} ({col_counts.get(value, 0)})"
+        )
+    return selections
+
+def load_search_index():
+    """
+    Load the search index over places, cultural sites and art forms built by
+    the data processing step. The index is shared across reruns and sessions
+    until its files change; before the pipeline has built it, it is built
+    here from the processed datasets.
+    
+    Returns:
+        SearchIndex: Index to query
+    """
+    documents_file = processed_file(DATA_DIR, DOCUMENTS_NAME)
+    index_file = os.path.join(DATA_DIR, INDEX_NAME)
+    if documents_file is not None:
+        def load():
+            documents = cached_read_processed(DATA_DIR, DOCUMENTS_NAME)
+            if os.path.exists(index_file):
+                return SearchIndex.load(documents, index_file)
+            return SearchIndex(documents)
+        return get_search_index(('search', file_version(documents_file), file_version(index_file)), load)
+    
+    names = [source['dataset'] for source in SOURCES.values()]
+    key = ('datasets',) + tuple(file_version(processed_file(DATA_DIR, name)) for name in names)
+    return get_search_index(key, lambda: SearchIndex(build_documents(
+        {name: cached_read_processed(DATA_DIR, name) for name in names}
+    )))
+
+def load_spatial_index():
+    """
+    Load the proximity index over cultural sites and places from the points
+    table built by the data processing step, shared across reruns and
+    sessions until that table changes. Before the pipeline has built it,
+    it is built here from the processed datasets.
+    
+    Returns:
+        SpatialIndex: Index to query
+    """
+    points_file = processed_file(DATA_DIR, spatial.POINTS_NAME)
+    if points_file is not None:
+        return spatial.get_spatial_index(('spatial', file_version(points_file)), lambda: spatial.SpatialIndex(
+            cached_read_processed(DATA_DIR, spatial.POINTS_NAME)
+        ))
+    
+    names = [source['dataset'] for source in spatial.SOURCES.values()]
+    key = ('datasets',) + tuple(file_version(processed_file(DATA_DIR, name)) for name in names)
+    return spatial.get_spatial_index(key, lambda: spatial.SpatialIndex(spatial.build_points(
+        {name: cached_read_processed(DATA_DIR, name) for name in names}
+    )))
+
+def load_seasonal_cube():
+    """
+    Load the year × month × region visitors cube written by the seasonal
+    tourism stage, through the process-wide dataset cache.
+    
+    Returns:
+        SeasonalCube: Cube to slice, or None before the pipeline has built it
+    """
+    path = os.path.join(DATA_DIR, CUBE_NAME)
+    if not os.path.exists(path):
+        return None
+    return get_dataset_cache().get(path, SeasonalCube.load)
 
-# Load data
-data = load_data()
+def set_search_query(query):
+    """Replace the sidebar search text, e.g. with a suggested completion"""
+    st.session_state.search_query = query
+
+def save_favorites():
+    """Keep the places picked in the itinerary planner as the session's favorites"""
+    st.session_state.favorites = list(st.session_state.itinerary_stops)
 
 # Page configuration
 st.set_page_config(
@@ -78,7 +227,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Create a row for the navigation buttons
-col1, col2, col3, col4, col5 = st.columns(5)
+col1, col2, col3, col4, col5, col6, col7 = st.columns(7)
 
 # Set default page if not in session state
 if 'page' not in st.session_state:
@@ -105,6 +254,14 @@ with col5:
     if st.button("Responsible Tourism", key="resp_btn", use_container_width=True):
         st.session_state.page = "Responsible Tourism"
 
+with col6:
+    if st.button("Places Explorer", key="places_btn", use_container_width=True):
+        st.session_state.page = "Places Explorer"
+
+with col7:
+    if st.button("Itinerary Planner", key="itinerary_btn", use_container_width=True):
+        st.session_state.page = "Itinerary Planner"
+
 # Add a separator after navigation
 st.markdown("<hr>", unsafe_allow_html=True)
 
@@ -117,7 +274,33 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
+# Sidebar search across places, cultural sites and art forms; the index is
+# only loaded once something has been typed
+SEARCH_KINDS = {'place': "Place", 'site': "Cultural site", 'art_form': "Art form"}
+st.sidebar.title("Search")
+search_query = st.sidebar.text_input("Search places, sites and art forms", key="search_query",
+                                     placeholder="e.g. Red Fort, kathakali, goa beach")
+if search_query.strip():
+    with span('app.search') as search_span:
+        search_index = load_search_index()
+        search_results = search_index.search(search_query, limit=10)
+        suggestions = search_index.complete(search_query, limit=3)
+        search_span.record_frame(search_results)
+    
+    # Completions of the word being typed, most common first
+    for suggestion in suggestions:
+        st.sidebar.button(suggestion, key=f"search_suggestion_{suggestion}",
+                          on_click=set_search_query, args=(suggestion,))
+    
+    if len(search_results) == 0:
+        st.sidebar.write("No matches found.")
+    for result in search_results.itertuples():
+        rating = "" if pd.isna(result.Rating) else f" · ★ {result.Rating:.1f}"
+        st.sidebar.markdown(f"**{result.Title}**  \n{SEARCH_KINDS.get(result.Kind, result.Kind)} · "
+                            f"{result.Subtitle}{rating}")
+
 # Sidebar customization
+st.sidebar.markdown("---")
 st.sidebar.title("Customization")
 theme = st.sidebar.radio(
     "Select Theme",
@@ -147,6 +330,13 @@ else:
 # Get current page from session state
 page = st.session_state.page
 
+# Load only the datasets the selected page uses
+with span('app.load_data', page=page) as load_span:
+    data = load_data(PAGE_DATASETS.get(page, []))
+    data_versions = load_data_versions(PAGE_DATASETS.get(page, []))
+    for df in data.values():
+        load_span.record_frame(df)
+
 # Main content based on page selection
 if page == "Home":
     st.header("Welcome to India's Cultural Journey")
@@ -186,151 +376,223 @@ if page == "Home":
         st.metric(label="Cultural Sites Preserved", value="250+")
 
 elif page == "Art Forms Explorer":
+    import plotly.express as px
+    from utils.visualization import create_folium_map, add_markers_to_map, show_chart
+    from utils.map_cache import show_cached_map
+    
     st.header("Traditional Art Forms Explorer")
     
     if 'art' in data:
-        # Sidebar filters
-        st.sidebar.subheader("Filter Art Forms")
-        art_types = ['All'] + sorted(data['art']['Type'].unique().tolist())
-        selected_type = st.sidebar.selectbox("Art Type", art_types)
-        
-        regions = ['All'] + sorted(data['art']['Region'].unique().tolist())
-        selected_region = st.sidebar.selectbox("Region", regions)
+        with span('app.art.filters') as filter_span:
+            # Sidebar filters, backed by a bitmap index built once per data version
+            st.sidebar.subheader("Filter Art Forms")
+            art_index = get_facet_index(('art', data_versions['art']), data['art'], ['Type', 'Region'])
+            selections = facet_filters(art_index, {'Type': "Art Type", 'Region': "Region"}, 'art_filter')
         
-        # Filter data based on selections
-        filtered_art = data['art']
-        if selected_type != 'All':
-            filtered_art = filtered_art[filtered_art['Type'] == selected_type]
-        if selected_region != 'All':
-            filtered_art = filtered_art[filtered_art['Region'] == selected_region]
+            # Filter data based on selections
+            filtered_art = art_index.filter(selections)
+            filter_span.record_frame(filtered_art)
         
         # Display art forms in two columns
         st.subheader("Explore Traditional Art Forms")
         
-        # Map visualization
-        st.subheader("Geographic Distribution of Art Forms")
+        with span('app.art.map'):
+            # Map visualization
+            st.subheader("Geographic Distribution of Art Forms")
+            art_by_region, art_by_region_version = load_rollup('art_forms_by_region')
         
-        # Create a map centered on India
-        m = create_folium_map()
+            def build_art_map():
+                # Create a map centered on India
+                m = create_folium_map()
+            
+                # Art forms per region come from the materialized rollup, which keeps the dimension keys
+                region_art = art_by_region
+            
+                # Coordinates come from the state (or, for broader regions, the region)
+                # dimension; places without a known centroid are skipped by add_markers_to_map
+                lat, lon = location_centroids(region_art['State_ID'], region_art['Region_ID'],
+                                              data['dim_state'], data['dim_region'])
+                region_art = region_art.assign(
+                    Latitude=lat,
+                    Longitude=lon,
+                    Popup="<b>" + region_art['Region'] + "</b><br>Art Forms: " + region_art['Art_Forms'].astype(str)
+                          + "<br>Significance: " + region_art['Cultural_Significance'].round(2).map('{:.2f}'.format)
+                )
+                add_markers_to_map(m, region_art, 'Latitude', 'Longitude', 'Popup', color='red', icon='info-sign')
+            
+                return m
         
-        # Group art forms by region for the map
-        region_art = data['art'].groupby('Region').agg({
-            'Art_Form': 'count',
-            'Cultural_Significance': 'mean'
-        }).reset_index()
+            # The map only depends on the art forms rollup and geography datasets, so
+            # its rendered HTML is reused across reruns and sessions until they change
+            show_cached_map(('art_regions', art_by_region_version, data_versions['dim_state'], data_versions['dim_region']),
+                            build_art_map)
         
-        # Add region information (this would need actual lat/long for regions)
-        region_coords = {
-            'Tamil Nadu': [11.1271, 78.6569],
-            'Kerala': [10.8505, 76.2711],
-            'North India': [28.7041, 77.1025],
-            'Odisha': [20.9517, 85.0985],
-            'Andhra Pradesh': [15.9129, 79.7400],
-            'Manipur': [24.6637, 93.9063],
-            'Assam': [26.2006, 92.9376],
-            'Bihar': [25.0961, 85.3131],
-            'Maharashtra': [19.7515, 75.7139],
-            'Punjab': [31.1471, 75.3412],
-            'Kashmir': [34.0837, 74.7973]
-        }
+        with span('app.art.table', df=filtered_art):
+            # Display art forms in a table
+            st.subheader("Art Forms List")
+            st.dataframe(filtered_art[['Art_Form', 'Type', 'Region', 'Practitioners_Estimate', 'Govt_Recognition',
+                                       'Tourism_Potential', 'Cultural_Significance']])
         
-        for idx, row in region_art.iterrows():
-            if row['Region'] in region_coords:
-                lat, lon = region_coords[row['Region']]
-                popup_content = f"<b>{row['Region']}</b><br>Art Forms: {row['Art_Form']}<br>Significance: {row['Cultural_Significance']:.2f}"
-                folium.Marker(
-                    location=[lat, lon],
-                    popup=popup_content,
-                    icon=folium.Icon(color='red', icon='info-sign')
-                ).add_to(m)
+        with span('app.art.charts'):
+            # Visualization of art forms by type
+            st.subheader("Art Forms by Type")
+            art_by_type, _ = load_rollup('art_forms_by_type')
+            fig = px.pie(art_by_type, values='Art_Forms', names='Type', title='Distribution of Art Forms by Type')
+            show_chart(fig, 'art.by_type', use_container_width=True)
         
-        # Display the map
-        folium_static(m)
-        
-        # Display art forms in a table
-        st.subheader("Art Forms List")
-        st.dataframe(filtered_art[['Art_Form', 'Type', 'Region', 'Description', 'Cultural_Significance']])
-        
-        # Visualization of art forms by type
-        st.subheader("Art Forms by Type")
-        fig = px.pie(data['art'], names='Type', title='Distribution of Art Forms by Type')
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Visualization of art forms by region
-        st.subheader("Art Forms by Region")
-        fig = px.bar(data['art'].groupby('Region').size().reset_index(name='count'), 
-                    x='Region', y='count', title='Number of Art Forms by Region')
-        st.plotly_chart(fig, use_container_width=True)
+            # Visualization of art forms by region
+            st.subheader("Art Forms by Region")
+            fig = px.bar(art_by_region.groupby('Region', as_index=False)['Art_Forms'].sum(),
+                        x='Region', y='Art_Forms', title='Number of Art Forms by Region')
+            show_chart(fig, 'art.by_region', use_container_width=True)
     else:
         st.error("Art forms data not found. Please check the data processing step.")
 
 elif page == "Cultural Tourism Analysis":
+    import plotly.express as px
+    from utils.visualization import create_folium_map, add_markers_to_map, create_time_series, show_chart
+    from utils.map_cache import show_cached_map
+    
     st.header("Cultural Tourism Analysis")
     
     if 'tourism' in data and 'sites' in data:
-        # Tourism trends over time
-        st.subheader("Tourism Trends Over Time")
-        fig = px.line(data['tourism'], x='Year', y=['Domestic_Visitors', 'International_Visitors'], 
-                     title='Domestic vs International Tourism Trends')
-        st.plotly_chart(fig, use_container_width=True)
+        with span('app.tourism.charts', df=data['tourism']):
+            # Tourism trends over time
+            st.subheader("Tourism Trends Over Time")
+            fig = create_time_series(data['tourism'], 'Year', ['Domestic_Visitors', 'International_Visitors'],
+                                     'Domestic vs International Tourism Trends')
+            show_chart(fig, 'tourism.trends', use_container_width=True)
         
-        # Revenue analysis
-        st.subheader("Tourism Revenue Analysis")
-        fig = px.bar(data['tourism'], x='Year', y='Revenue_Crores', 
-                    title='Annual Tourism Revenue (in Crores ₹)')
-        st.plotly_chart(fig, use_container_width=True)
+            # Revenue analysis
+            st.subheader("Tourism Revenue Analysis")
+            fig = px.bar(data['tourism'], x='Year', y='Revenue_Crores', 
+                        title='Annual Tourism Revenue (in Crores ₹)')
+            show_chart(fig, 'tourism.revenue', use_container_width=True)
         
-        # Cultural sites map
-        st.subheader("Popular Cultural Sites")
+        with span('app.tourism.map', df=data['sites']):
+            # Cultural sites map
+            st.subheader("Popular Cultural Sites")
         
-        # Create a map for cultural sites
-        sites_map = create_folium_map()
+            def build_sites_map():
+                # Create a map for cultural sites
+                sites_map = create_folium_map()
+            
+                # Add markers for cultural sites; large site lists switch to a
+                # single GeoJSON layer or a client-side cluster automatically
+                sites = data['sites']
+                unesco = sites['UNESCO_Heritage'].astype(bool)
+                site_markers = pd.DataFrame({
+                    'Latitude': sites['Latitude'],
+                    'Longitude': sites['Longitude'],
+                    'Popup': "<b>" + sites['Site_Name'] + "</b><br>Region: " + sites['Region'].astype(str)
+                             + "<br>Visitors: " + sites['Visitors_2022'].map('{:,}'.format)
+                             + "<br>UNESCO: " + np.where(unesco, 'Yes', 'No'),
+                    'Color': np.where(unesco, 'green', 'blue')
+                })
+                add_markers_to_map(sites_map, site_markers, 'Latitude', 'Longitude', 'Popup',
+                                   color_col='Color', icon='info-sign')
+            
+                return sites_map
         
-        # Add markers for cultural sites
-        for idx, row in data['sites'].iterrows():
-            popup_content = f"<b>{row['Site_Name']}</b><br>Type: {row['Type']}<br>Visitors: {row['Annual_Visitors']:,}<br>UNESCO: {'Yes' if row['UNESCO_Site'] else 'No'}"
-            folium.Marker(
-                location=[row['Latitude'], row['Longitude']],
-                popup=popup_content,
-                icon=folium.Icon(color='green' if row['UNESCO_Site'] else 'blue', icon='info-sign')
-            ).add_to(sites_map)
+            show_cached_map(('cultural_sites', data_versions['sites']), build_sites_map)
         
-        # Display the map
-        folium_static(sites_map)
+        with span('app.tourism.nearby') as nearby_span:
+            # Sites and places around a selected site
+            st.subheader("Nearby Sites and Places")
+            nearby_col1, nearby_col2 = st.columns([2, 1])
+            with nearby_col1:
+                selected_site = st.selectbox("Site", sorted(data['sites']['Site_Name'].unique()), key="nearby_site")
+            with nearby_col2:
+                radius_km = st.slider("Radius (km)", 5, 500, 50, step=5, key="nearby_radius")
+            
+            site = data['sites'][data['sites']['Site_Name'] == selected_site].iloc[0]
+            spatial_index = load_spatial_index()
+            nearby = spatial_index.within(site['Latitude'], site['Longitude'], radius_km, limit=21)
+            nearby = nearby[~((nearby['Kind'] == 'site') & (nearby['Name'] == selected_site))].head(20)
+            if len(nearby) == 0:
+                st.info(f"Nothing within {radius_km} km of {selected_site}; showing the closest instead.")
+                nearby = spatial_index.nearest(site['Latitude'], site['Longitude'], k=6)
+                nearby = nearby[~((nearby['Kind'] == 'site') & (nearby['Name'] == selected_site))].head(5)
+            nearby_span.record_frame(nearby)
+            
+            st.dataframe(pd.DataFrame({
+                'Name': nearby['Name'],
+                'Kind': nearby['Kind'].map(SEARCH_KINDS),
+                'Location': nearby['Subtitle'],
+                'Distance (km)': nearby['Distance_km']
+            }), hide_index=True, use_container_width=True)
+            st.caption("Places are located by their city, or by their state where the city is not known, "
+                       "so their distances are approximate.")
         
-        # Top cultural sites by visitors
-        st.subheader("Top Cultural Sites by Visitors")
-        top_sites = data['sites'].sort_values('Annual_Visitors', ascending=False).head(10)
-        fig = px.bar(top_sites, x='Site_Name', y='Annual_Visitors', 
-                    title='Top 10 Cultural Sites by Annual Visitors')
-        st.plotly_chart(fig, use_container_width=True)
+        with span('app.tourism.seasonal'):
+            # Seasonal patterns, sliced straight from the precomputed cube
+            st.subheader("Seasonal Tourism Patterns")
+            cube = load_seasonal_cube()
+            if cube is None:
+                st.info("Seasonal data has not been processed yet. Run scripts/data_processing.py.")
+            else:
+                selected_years = None
+                if len(cube.years) > 1:
+                    first_year, last_year = st.select_slider(
+                        "Years", options=cube.years.tolist(),
+                        value=(int(cube.years[0]), int(cube.years[-1])), key="seasonal_years"
+                    )
+                    selected_years = cube.years[(cube.years >= first_year) & (cube.years <= last_year)]
+                
+                regions = cube.active_regions()
+                region_names = [cube.regions[i] for i in regions]
+                monthly = cube.month_region(selected_years)[:, regions]
+                fig = px.imshow(monthly.T, x=MONTHS, y=region_names, aspect='auto',
+                                color_continuous_scale='YlOrRd', labels={'color': 'Visitors'},
+                                title='Average Monthly Visitors by Region')
+                show_chart(fig, 'tourism.seasonal', use_container_width=True)
+                
+                # Busiest months of one region, with how often they were flagged as peak season
+                st.subheader("Best Months to Visit")
+                region = st.selectbox("Region", region_names, key="seasonal_region")
+                best = cube.best_months(region, count=3, years=selected_years)
+                month_cols = st.columns(len(best))
+                for col, month in zip(month_cols, best.itertuples()):
+                    col.metric(month.Month, f"{month.Visitors:,} visitors",
+                               f"peak season {month.Peak_Share:.0%}", delta_color="off")
+        
+        with span('app.tourism.top_sites'):
+            # Top cultural sites by visitors
+            st.subheader("Top Cultural Sites by Visitors")
+            top_sites, _ = load_rollup('top_sites_by_visitors')
+            fig = px.bar(top_sites, x='Site_Name', y='Visitors_2022', 
+                        title='Top 10 Cultural Sites by Annual Visitors')
+            show_chart(fig, 'tourism.top_sites', use_container_width=True)
     else:
         st.error("Tourism or cultural sites data not found. Please check the data processing step.")
 
 elif page == "Government Initiatives":
+    import plotly.express as px
+    from utils.visualization import create_time_series, show_chart
+    
     st.header("Government Initiatives for Cultural Preservation")
     
     if 'funding' in data:
-        # Funding trends over time
-        st.subheader("Government Funding Trends")
-        fig = px.line(data['funding'], x='Year', y='Amount_Crores', 
-                     title='Government Funding for Cultural Preservation (in Crores ₹)')
-        st.plotly_chart(fig, use_container_width=True)
+        with span('app.government.charts'):
+            # Funding trends over time
+            st.subheader("Government Funding Trends")
+            funding_by_year, _ = load_rollup('funding_by_year')
+            fig = create_time_series(funding_by_year, 'Year', ['Budget_Allocation_Crores', 'Actual_Utilization_Crores'],
+                                     'Government Funding for Cultural Preservation (in Crores ₹)')
+            show_chart(fig, 'government.trends', use_container_width=True)
         
-        # Funding by category
-        st.subheader("Funding by Category")
-        funding_by_category = data['funding'].groupby('Category').sum().reset_index()
-        fig = px.pie(funding_by_category, values='Amount_Crores', names='Category', 
-                    title='Distribution of Funding by Category')
-        st.plotly_chart(fig, use_container_width=True)
+            # Funding by ministry
+            st.subheader("Funding by Ministry")
+            funding_by_ministry, _ = load_rollup('funding_by_ministry')
+            fig = px.pie(funding_by_ministry, values='Budget_Allocation_Crores', names='Ministry', 
+                        title='Distribution of Funding by Ministry')
+            show_chart(fig, 'government.by_ministry_share', use_container_width=True)
         
-        # Funding by state
-        st.subheader("Funding by State")
-        funding_by_state = data['funding'].groupby('State').sum().reset_index()
-        fig = px.bar(funding_by_state.sort_values('Amount_Crores', ascending=False), 
-                    x='State', y='Amount_Crores', 
-                    title='Government Funding by State')
-        st.plotly_chart(fig, use_container_width=True)
+            # Budget utilization by ministry
+            st.subheader("Budget Utilization by Ministry")
+            fig = px.bar(funding_by_ministry, x='Ministry', y=['Budget_Allocation_Crores', 'Actual_Utilization_Crores'], 
+                        barmode='group', title='Allocated vs Utilized Budget by Ministry (in Crores ₹)')
+            show_chart(fig, 'government.by_ministry', use_container_width=True)
         
         # Key initiatives
         st.subheader("Key Government Initiatives")
@@ -348,6 +610,9 @@ elif page == "Government Initiatives":
         st.error("Government funding data not found. Please check the data processing step.")
 
 elif page == "Responsible Tourism":
+    from utils.visualization import create_folium_map, add_markers_to_map
+    from utils.map_cache import show_cached_map
+    
     st.header("Responsible Tourism Recommendations")
     
     # Sustainable tourism practices
@@ -394,32 +659,168 @@ elif page == "Responsible Tourism":
     for i, case in enumerate(case_studies):
         st.markdown(f"**{case['title']}**: {case['description']}")
     
-    # Recommendations map
-    st.subheader("Recommended Responsible Tourism Destinations")
+    with span('app.responsible.map'):
+        # Recommendations map
+        st.subheader("Recommended Responsible Tourism Destinations")
     
-    # Create a map for recommended destinations
-    rec_map = create_folium_map()
+        def build_recommendations_map():
+            # Create a map for recommended destinations
+            rec_map = create_folium_map()
+        
+            # Sample recommended destinations
+            recommendations = [
+                {"name": "Khonoma Green Village", "lat": 25.6573, "lon": 94.0244, "type": "Eco-Tourism"},
+                {"name": "Hodka Artist Village", "lat": 23.3352, "lon": 69.6281, "type": "Cultural Tourism"},
+                {"name": "Spiti Valley", "lat": 32.2464, "lon": 78.0349, "type": "Sustainable Tourism"},
+                {"name": "Kumbalangi Model Village", "lat": 9.8723, "lon": 76.2711, "type": "Community Tourism"},
+                {"name": "Majuli Island", "lat": 26.9452, "lon": 94.1780, "type": "Cultural Preservation"}
+            ]
+        
+            # Add markers for recommended destinations
+            rec_df = pd.DataFrame(recommendations)
+            rec_df['popup'] = "<b>" + rec_df['name'] + "</b><br>Type: " + rec_df['type']
+            add_markers_to_map(rec_map, rec_df, 'lat', 'lon', 'popup', color='green', icon='leaf')
+        
+            return rec_map
     
-    # Sample recommended destinations
-    recommendations = [
-        {"name": "Khonoma Green Village", "lat": 25.6573, "lon": 94.0244, "type": "Eco-Tourism"},
-        {"name": "Hodka Artist Village", "lat": 23.3352, "lon": 69.6281, "type": "Cultural Tourism"},
-        {"name": "Spiti Valley", "lat": 32.2464, "lon": 78.0349, "type": "Sustainable Tourism"},
-        {"name": "Kumbalangi Model Village", "lat": 9.8723, "lon": 76.2711, "type": "Community Tourism"},
-        {"name": "Majuli Island", "lat": 26.9452, "lon": 94.1780, "type": "Cultural Preservation"}
-    ]
+        # The destinations are static, so the map is rendered once per process
+        show_cached_map(('responsible_tourism', 1), build_recommendations_map)
+
+elif page == "Places Explorer":
+    import plotly.express as px
+    from utils.visualization import show_chart
     
-    # Add markers for recommended destinations
-    for rec in recommendations:
-        popup_content = f"<b>{rec['name']}</b><br>Type: {rec['type']}"
-        folium.Marker(
-            location=[rec['lat'], rec['lon']],
-            popup=popup_content,
-            icon=folium.Icon(color='green', icon='leaf')
-        ).add_to(rec_map)
+    st.header("Top Places to Visit")
     
-    # Display the map
-    folium_static(rec_map)
+    if 'places' in data:
+        with span('app.places.filters') as filter_span:
+            # Sidebar filters, backed by a bitmap index built once per data version
+            st.sidebar.subheader("Filter Places")
+            combine = st.sidebar.radio("Show places matching", ["All filters", "Any filter"], key="places_combine")
+            combine = 'and' if combine == "All filters" else 'or'
+            place_facets = {
+                'Zone': "Zone",
+                'State': "State",
+                'Type': "Type",
+                'Weekly_Off': "Weekly Off",
+                'DSLR_Allowed': "DSLR Allowed",
+                'Best_Time_To_Visit': "Best Time to Visit"
+            }
+            places_index = get_facet_index(('places', data_versions['places']), data['places'], list(place_facets))
+            selections = facet_filters(places_index, place_facets, 'places_filter', combine)
+            filtered_places = places_index.filter(selections, combine)
+            filter_span.record_frame(filtered_places)
+        
+        st.metric(label="Matching Places", value=f"{len(filtered_places)} of {len(data['places'])}")
+        
+        with span('app.places.table', df=filtered_places):
+            # Display matching places, best rated first
+            st.subheader("Places")
+            st.dataframe(filtered_places.sort_values(['Google_Rating', 'Google_Reviews_Lakhs'], ascending=False)[
+                ['Name', 'City', 'State', 'Type', 'Google_Rating', 'Google_Reviews_Lakhs', 'Entrance_Fee_INR',
+                 'Visit_Hours', 'Weekly_Off', 'Best_Time_To_Visit']
+            ])
+        
+        with span('app.places.chart'):
+            # Visualization of matching places by zone and type
+            if len(filtered_places) > 0:
+                st.subheader("Matching Places by Zone and Type")
+                if len(filtered_places) == len(data['places']):
+                    places_by_zone_type, _ = load_rollup('places_by_zone_type')
+                else:
+                    places_by_zone_type = filtered_places.groupby(['Zone', 'Type']).size().reset_index(name='Places')
+                fig = px.sunburst(places_by_zone_type, path=['Zone', 'Type'], values='Places', title='Places by Zone and Type')
+                show_chart(fig, 'places.zone_type', use_container_width=True)
+    else:
+        st.error("Places data not found. Please check the data processing step.")
+
+elif page == "Itinerary Planner":
+    from datetime import date
+    from utils.itinerary import plan_itinerary
+    from utils.visualization import create_folium_map, add_markers_to_map
+    from utils.map_cache import show_cached_map
+    import folium
+    
+    st.header("Itinerary Planner")
+    
+    if 'places' in data:
+        places = data['places'].assign(Label=data['places']['Name'] + ", " + data['places']['City'])
+        places = places.drop_duplicates('Label')
+        
+        # Stops: every place in a city, or a hand-picked list kept as the favorites
+        plan_from = st.radio("Plan from", ["A city", "Your favorites"], horizontal=True, key="itinerary_source")
+        if plan_from == "A city":
+            city_counts = places['City'].value_counts()
+            city = st.selectbox("City", sorted(city_counts.index), key="itinerary_city",
+                                format_func=lambda name: f"{name} ({city_counts[name]} places)")
+            stops = places[places['City'] == city]
+        else:
+            labels = sorted(places['Label'])
+            st.multiselect("Places to visit", labels, key="itinerary_stops", on_change=save_favorites,
+                           default=[label for label in st.session_state.favorites if label in labels])
+            stops = places[places['Label'].isin(st.session_state.itinerary_stops)]
+        
+        plan_col1, plan_col2, plan_col3, plan_col4 = st.columns(4)
+        with plan_col1:
+            start_date = st.date_input("First day", date.today(), key="itinerary_start")
+        with plan_col2:
+            days = st.slider("Days", 1, 14, 3, key="itinerary_days")
+        with plan_col3:
+            hours_per_day = st.slider("Hours per day", 4, 12, 8, key="itinerary_hours")
+        with plan_col4:
+            speed_kmh = st.slider("Travel speed (km/h)", 20, 80, 40, step=5, key="itinerary_speed")
+        
+        if len(stops) == 0:
+            st.info("Pick some places to plan a route through them.")
+        else:
+            with span('app.itinerary.plan', stops=len(stops)) as plan_span:
+                itinerary, left_out = plan_itinerary(stops, days, start_date, hours_per_day, speed_kmh)
+                plan_span.record_frame(itinerary)
+            
+            metric_col1, metric_col2, metric_col3 = st.columns(3)
+            metric_col1.metric("Stops planned", f"{len(itinerary)} of {len(stops)}")
+            metric_col2.metric("Travel", f"{itinerary['Travel_km'].sum():,.0f} km")
+            # Travel days between stops count towards the days used
+            metric_col3.metric("Days used", int(itinerary['Day'].max()) if len(itinerary) else 0)
+            st.caption("Distances are estimated from straight-line distances between the places' cities, "
+                       "or their states where the city is not known.")
+            
+            with span('app.itinerary.days', df=itinerary):
+                for day, visits in itinerary.groupby('Day'):
+                    st.subheader(f"Day {day} · {visits['Weekday'].iloc[0]}, {visits['Date'].iloc[0]:%d %b}")
+                    travel_days = visits['Travel_Days'].iloc[0]
+                    if travel_days > 0:
+                        st.caption(f"After {travel_days} day{'s' if travel_days > 1 else ''} of travel "
+                                   f"({visits['Travel_Hours'].iloc[0]:.1f} hrs) from the previous stop")
+                    st.dataframe(pd.DataFrame({
+                        'Start': visits['Start'],
+                        'Place': visits['Name'],
+                        'Visit (hrs)': visits['Visit_Hours'],
+                        'Travel (km)': visits['Travel_km'],
+                        'Best time': visits['Best_Time_To_Visit']
+                    }), hide_index=True, use_container_width=True)
+                if len(left_out) > 0:
+                    st.subheader("Not Scheduled")
+                    st.dataframe(left_out, hide_index=True, use_container_width=True)
+            
+            with span('app.itinerary.map'):
+                def build_route_map():
+                    route_map = create_folium_map()
+                    stops_on_map = itinerary.assign(
+                        Popup="Day " + itinerary['Day'].astype(str) + ", stop " + itinerary['Stop'].astype(str)
+                              + ": <b>" + itinerary['Name'] + "</b>"
+                    )
+                    add_markers_to_map(route_map, stops_on_map, 'Latitude', 'Longitude', 'Popup', icon='flag')
+                    if len(itinerary) > 1:
+                        folium.PolyLine(itinerary[['Latitude', 'Longitude']].to_numpy().tolist(),
+                                        weight=3, opacity=0.8).add_to(route_map)
+                    return route_map
+                
+                st.subheader("Route")
+                show_cached_map(('itinerary', data_versions['places'], tuple(itinerary['Name']),
+                                 tuple(itinerary['Day'])), build_route_map)
+    else:
+        st.error("Places data not found. Please check the data processing step.")
 
 # Add a feedback section at the bottom of the app
 st.markdown("---")
@@ -446,4 +847,24 @@ st.markdown("""
 <div style='text-align: center;'>
 <p>Developed for YourStory Project | Data sourced from data.gov.in</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# Whole-rerun timing, exported with the section spans
+record_span('app.rerun', trace_seconds(), page=page)
+# The cache counters are only collected when there is a file to export them to
+if prometheus_enabled():
+    write_prometheus(extra=[get_dataset_cache().to_prometheus()])
+
+# Optional breakdown of this rerun, slowest sections first
+st.sidebar.markdown("---")
+if st.sidebar.checkbox("Show performance breakdown", key="show_perf"):
+    breakdown = pd.DataFrame(current_trace())
+    breakdown = breakdown.assign(
+        ms=(breakdown['seconds'] * 1000).round(1),
+        MB=(breakdown.get('memory_bytes', pd.Series(np.nan, index=breakdown.index)) / 1e6).round(3)
+    )
+    columns = ['span', 'ms', 'rows', 'MB']
+    st.sidebar.dataframe(
+        breakdown.reindex(columns=columns).sort_values('ms', ascending=False),
+        hide_index=True
+    )
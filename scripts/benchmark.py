@@ -0,0 +1,402 @@
+import pandas as pd
+import numpy as np
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+import contextlib
+from datetime import datetime
+
+# Add parent directory to path to import utils
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+if script_dir not in sys.path:
+    sys.path.append(script_dir)
+
+import data_processing
+import synthetic_data
+from utils.data_cache import cached_read_processed, get_dataset_cache
+
+# Timings are machine-specific, so the history is kept out of version control (see .gitignore)
+DEFAULT_HISTORY = os.path.join(project_dir, 'benchmarks', 'history.json')
+DEFAULT_SCALES = ['1k', '100k', '1M']
+
+# Tables produced by the synthetic data generator; places are resampled from the shipped dataset
+GENERATED_TABLES = ['tourism_statistics', 'cultural_sites', 'art_forms', 'government_funding', 'seasonal_tourism']
+
+# Datasets loaded by the app, as in app.PROCESSED_DATASETS
+APP_DATASETS = ['tourism_statistics_processed', 'cultural_sites_processed', 'art_forms_processed',
+                'government_funding_processed', 'places_processed', 'dim_state', 'dim_region']
+
+def parse_scale(label):
+    """Converts a scale label such as '100k' or '1M' to a row count"""
+    multipliers = {'k': 1000, 'm': 1000000}
+    label = label.strip()
+    if label[-1].lower() in multipliers:
+        return int(float(label[:-1]) * multipliers[label[-1].lower()])
+    return int(label)
+
+def make_inputs(raw_dir, rows, seed=42):
+    """
+    Writes synthetic raw datasets of the given size. The pipeline tables come
+    from the seeded generator in synthetic_data.py; places are sampled from
+    the shipped dataset with replacement.
+
+    Args:
+        raw_dir (str): Directory to write the raw CSV files to
+        rows (int): Rows per dataset
+        seed (int): Random seed, so runs are comparable
+
+    Returns:
+        dict: Dataset name mapped to the path of its raw file
+    """
+    paths = synthetic_data.write_datasets(raw_dir, rows, seed, GENERATED_TABLES)
+    places = pd.read_csv(data_processing.PLACES_FILE)
+    sample = places.iloc[np.random.default_rng(seed).integers(0, len(places), rows)]
+    paths['places'] = os.path.join(raw_dir, 'places_synthetic.csv')
+    sample.to_csv(paths['places'], index=False)
+    return paths
+
+class StubConnection:
+    """
+    DB-API connection that accepts every statement without a server, so the
+    upload benchmarks time only the client-side work (chunking, Parquet
+    encoding, row conversion).
+    """
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=None):
+        self.statements += 1
+
+    def executemany(self, query, rows):
+        self.statements += 1
+        self.rows += len(rows)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+class BenchmarkContext:
+    """Inputs and working directories shared by the benchmarks of one scale"""
+
+    def __init__(self, rows, work_dir, seed=42):
+        self.rows = rows
+        self.raw_dir = os.path.join(work_dir, 'raw')
+        self.processed_dir = os.path.join(work_dir, 'processed')
+        self.output_dir = os.path.join(work_dir, 'output')
+        for path in (self.raw_dir, self.processed_dir, self.output_dir):
+            os.makedirs(path, exist_ok=True)
+        self.raw = make_inputs(self.raw_dir, rows, seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            data_processing.process_all_datasets(force=True, raw_dir=self.raw_dir, processed_dir=self.processed_dir)
+        self.sites = cached_read_processed(self.processed_dir, 'cultural_sites_processed')
+        self.tourism = cached_read_processed(self.processed_dir, 'tourism_statistics_processed')
+
+def bench_processor(processor, dataset):
+    """Benchmark of one process_* function on the raw file of a dataset"""
+    def setup(ctx):
+        output_file = os.path.join(ctx.output_dir, f"{dataset}_processed.csv")
+        return lambda: processor(ctx.raw[dataset], output_file)
+    return setup
+
+def bench_process_all(ctx):
+    return lambda: data_processing.process_all_datasets(force=True, raw_dir=ctx.raw_dir,
+                                                        processed_dir=ctx.output_dir)
+
+def bench_load_data_cold(ctx):
+    def run():
+        get_dataset_cache().clear()
+        for name in APP_DATASETS:
+            cached_read_processed(ctx.processed_dir, name)
+    return run
+
+def bench_load_data_warm(ctx):
+    # Room for every dataset, so the timed reads are cache hits at any scale
+    cache = get_dataset_cache()
+    cache.resize(max(cache.max_bytes / 1024 / 1024, 4096))
+    for name in APP_DATASETS:
+        cached_read_processed(ctx.processed_dir, name)
+    return lambda: [cached_read_processed(ctx.processed_dir, name) for name in APP_DATASETS]
+
+def bench_add_markers(ctx):
+    from utils.visualization import create_folium_map, add_markers_to_map
+    sites = ctx.sites.assign(Popup=ctx.sites['Site_Name'])
+    return lambda: add_markers_to_map(create_folium_map(), sites, 'Latitude', 'Longitude', 'Popup')
+
+def bench_time_series(downsample):
+    """Benchmark of building and serializing a time series chart, downsampled or with every point"""
+    def setup(ctx):
+        from utils.visualization import create_time_series
+        tourism = ctx.tourism.reset_index().rename(columns={'index': 'Period'})
+        return lambda: create_time_series(tourism, 'Period', 'Total_Visitors', 'Visitors',
+                                          downsample=downsample).to_json()
+    return setup
+
+# Typical sidebar searches: exact, multi-word, prefix and misspelled
+SEARCH_QUERIES = ['taj mahal', 'heritage site', 'kerala', 'textile of', 'rajastan', 'paintng', 'fo']
+
+def bench_search(ctx):
+    from utils.search import DOCUMENTS_NAME, INDEX_NAME, SearchIndex
+    index = SearchIndex.load(cached_read_processed(ctx.processed_dir, DOCUMENTS_NAME),
+                             os.path.join(ctx.processed_dir, INDEX_NAME))
+    return lambda: [index.search(query, limit=10) for query in SEARCH_QUERIES]
+
+# Nearby lookups around fixed points spread over India
+SPATIAL_QUERIES = np.random.default_rng(0).uniform([8, 68], [35, 97], (50, 2))
+
+def bench_spatial(ctx):
+    from utils.spatial import POINTS_NAME, SpatialIndex
+    index = SpatialIndex(cached_read_processed(ctx.processed_dir, POINTS_NAME))
+    return lambda: [(index.within(lat, lon, 25, limit=20), index.nearest(lat, lon, k=10))
+                    for lat, lon in SPATIAL_QUERIES]
+
+def bench_itinerary(ctx):
+    from datetime import date
+    from utils.itinerary import plan_itinerary
+    places = cached_read_processed(ctx.processed_dir, 'places_processed')
+    stops = places.drop_duplicates(['Latitude', 'Longitude']).head(50)
+    return lambda: plan_itinerary(stops, days=7, start_date=date(2026, 1, 5))
+
+def bench_seasonal_views(ctx):
+    from utils.seasonal import CUBE_NAME, SeasonalCube
+    cube = SeasonalCube.load(os.path.join(ctx.processed_dir, CUBE_NAME))
+    regions = [cube.regions[i] for i in cube.active_regions()]
+    return lambda: (cube.month_region(), [cube.best_months(region) for region in regions])
+
+def bench_upload(method):
+    def setup(ctx):
+        from utils.snowflake_conn import upload_dataframe_to_snowflake
+        return lambda: upload_dataframe_to_snowflake(ctx.sites, 'CULTURAL_SITES', method=method, conn=StubConnection())
+    return setup
+
+# Benchmark name mapped to a setup function that takes a BenchmarkContext
+# and returns the zero-argument callable to time
+BENCHMARKS = {
+    'process_tourism_statistics': bench_processor(data_processing.process_tourism_statistics, 'tourism_statistics'),
+    'process_cultural_sites': bench_processor(data_processing.process_cultural_sites, 'cultural_sites'),
+    'process_art_forms': bench_processor(data_processing.process_art_forms, 'art_forms'),
+    'process_government_funding': bench_processor(data_processing.process_government_funding, 'government_funding'),
+    'process_places': bench_processor(data_processing.process_places, 'places'),
+    'process_seasonal_tourism': bench_processor(data_processing.process_seasonal_tourism, 'seasonal_tourism'),
+    'process_all_datasets': bench_process_all,
+    'load_data_cold': bench_load_data_cold,
+    'load_data_warm': bench_load_data_warm,
+    'add_markers_to_map': bench_add_markers,
+    'create_time_series': bench_time_series('lttb'),
+    'create_time_series_full': bench_time_series(None),
+    'search_queries': bench_search,
+    'spatial_queries': bench_spatial,
+    'plan_itinerary': bench_itinerary,
+    'seasonal_views': bench_seasonal_views,
+    'upload_dataframe_copy': bench_upload('copy'),
+    'upload_dataframe_insert': bench_upload('insert'),
+}
+
+def time_callable(fn, repeat):
+    """Runs a callable `repeat` times with its output suppressed and returns the elapsed seconds of each run"""
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    return times
+
+def run_benchmarks(scales=None, names=None, repeat=3, seed=42):
+    """
+    Runs the benchmark suite on synthetic inputs at each scale.
+
+    Args:
+        scales (list, optional): Scale labels such as '1k' or '1M'. Defaults to DEFAULT_SCALES
+        names (list, optional): Benchmarks to run. Defaults to all of BENCHMARKS
+        repeat (int): Timed runs per benchmark; the median is recorded
+        seed (int): Seed of the synthetic inputs
+
+    Returns:
+        dict: 'name[scale]' mapped to the timings of that benchmark, or to
+            its error with status 'failed' if it raised
+    """
+    results = {}
+    default_cache_mb = get_dataset_cache().max_bytes / 1024 / 1024
+    for label in scales or DEFAULT_SCALES:
+        rows = parse_scale(label)
+        work_dir = tempfile.mkdtemp(prefix=f"bench_{label}_")
+        try:
+            print(f"Preparing {rows:,} row inputs...")
+            ctx = BenchmarkContext(rows, work_dir, seed)
+            for name in names or BENCHMARKS:
+                try:
+                    times = time_callable(BENCHMARKS[name](ctx), repeat)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    print(f"  {name}[{label}] failed: {error}")
+                    results[f"{name}[{label}]"] = {
+                        'name': name, 'scale': label, 'rows': rows, 'repeat': repeat,
+                        'status': 'failed', 'error': error
+                    }
+                    continue
+                median = statistics.median(times)
+                results[f"{name}[{label}]"] = {
+                    'name': name,
+                    'scale': label,
+                    'rows': rows,
+                    'repeat': repeat,
+                    'status': 'ok',
+                    'median_seconds': round(median, 6),
+                    'min_seconds': round(min(times), 6),
+                    'rows_per_second': round(rows / median) if median > 0 else None
+                }
+                print(f"  {name}[{label}]: {median:.4f}s")
+        finally:
+            get_dataset_cache().clear()
+            get_dataset_cache().resize(default_cache_mb)
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+def git_commit():
+    """Returns the short hash of the checked-out commit, or None outside a git repository"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=project_dir, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path):
+    """Loads the list of recorded benchmark runs"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def save_history(history, path):
+    """Writes the benchmark history atomically"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(history, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+def record_run(results, path, label=None):
+    """Appends a benchmark run with its environment to the history file and returns the run"""
+    run = {
+        'id': datetime.now().strftime('%Y%m%d_%H%M%S'),
+        'label': label,
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'results': results
+    }
+    history = load_history(path)
+    history.append(run)
+    save_history(history, path)
+    return run
+
+def find_run(history, ref):
+    """Finds a run by list index (e.g. -1 for the latest), id, label or commit"""
+    try:
+        return history[int(ref)]
+    except (ValueError, IndexError):
+        pass
+    for run in reversed(history):
+        if ref in (run['id'], run.get('label'), run.get('commit')):
+            return run
+    raise KeyError(f"No benchmark run matches {ref!r}")
+
+def compare_runs(base, head, threshold=10.0):
+    """
+    Compares the median timings of two runs.
+
+    Args:
+        base (dict): Reference run
+        head (dict): Run to check
+        threshold (float): Change in percent beyond which a benchmark is flagged
+
+    Returns:
+        list: (benchmark, base seconds, head seconds, change percent, flag) tuples;
+            the times and change are None for runs that failed
+    """
+    rows = []
+    for key, result in head['results'].items():
+        if key not in base['results']:
+            continue
+        before = base['results'][key].get('median_seconds')
+        after = result.get('median_seconds')
+        if before is None or after is None:
+            rows.append((key, before, after, None, 'FAILED' if after is None else ''))
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        flag = 'REGRESSION' if change > threshold else 'improved' if change < -threshold else ''
+        rows.append((key, before, after, change, flag))
+    return rows
+
+def print_comparison(base, head, rows):
+    """Prints a comparison table of two runs"""
+    print(f"Base: {base['id']} ({base.get('label') or base.get('commit')})  "
+          f"Head: {head['id']} ({head.get('label') or head.get('commit')})")
+    print(f"  {'Benchmark':<40}{'Base (s)':>12}{'Head (s)':>12}{'Change':>10}")
+    for key, before, after, change, flag in rows:
+        before = '-' if before is None else f"{before:.4f}"
+        after = '-' if after is None else f"{after:.4f}"
+        change = '-' if change is None else f"{change:.1f}%"
+        print(f"  {key:<40}{before:>12}{after:>12}{change:>10}  {flag}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline, visualization helpers and loaders")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="run the benchmarks and record the results")
+    run_parser.add_argument('--scales', nargs='*', default=DEFAULT_SCALES, help="row counts, e.g. 1k 100k 1M")
+    run_parser.add_argument('--only', nargs='*', default=None, choices=list(BENCHMARKS), help="benchmarks to run")
+    run_parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark")
+    run_parser.add_argument('--seed', type=int, default=42, help="seed of the synthetic inputs")
+    run_parser.add_argument('--label', default=None, help="name to record the run under")
+    run_parser.add_argument('--history', default=DEFAULT_HISTORY, help="JSON history file")
+
+    compare_parser = subparsers.add_parser('compare', help="compare two recorded runs")
+    compare_parser.add_argument('base', nargs='?', default='-2', help="index, id, label or commit (default: -2)")
+    compare_parser.add_argument('head', nargs='?', default='-1', help="index, id, label or commit (default: -1)")
+    compare_parser.add_argument('--threshold', type=float, default=10.0, help="percent change to flag")
+    compare_parser.add_argument('--fail-on-regression', action='store_true',
+                                help="exit with status 1 on regressions or failed benchmarks")
+    compare_parser.add_argument('--history', default=DEFAULT_HISTORY, help="JSON history file")
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = run_benchmarks(args.scales, args.only, args.repeat, args.seed)
+        run = record_run(results, args.history, args.label)
+        print(f"Recorded run {run['id']} in {args.history}")
+        failed = [key for key, result in results.items() if result.get('status') == 'failed']
+        if failed:
+            print(f"{len(failed)} benchmark(s) failed: {', '.join(failed)}")
+            sys.exit(1)
+    else:
+        history = load_history(args.history)
+        base, head = find_run(history, args.base), find_run(history, args.head)
+        rows = compare_runs(base, head, args.threshold)
+        print_comparison(base, head, rows)
+        if args.fail_on_regression and any(row[4] in ('REGRESSION', 'FAILED') for row in rows):
+            sys.exit(1)
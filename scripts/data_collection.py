@@ -1,9 +1,33 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import requests
 import os
 import json
+import hashlib
+import random
+import threading
+import time
+import sys
+import argparse
+import dotenv
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 from datetime import datetime
 
+# Add parent directory to path to import utils, and this directory for the sibling scripts
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+if script_dir not in sys.path:
+    sys.path.append(script_dir)
+
+from utils.metrics import span, record_span, start_trace, configure_logging, write_prometheus
+import synthetic_data
+
+# Load environment variables
+dotenv.load_dotenv()
+
 # Create data directories if they don't exist
 os.makedirs('../data/raw', exist_ok=True)
 os.makedirs('../data/processed', exist_ok=True)
@@ -27,56 +51,444 @@ def fetch_data_from_api(api_url, params=None):
         print(f"Error fetching data from API: {e}")
         return None
 
-def fetch_data_gov_in_datasets():
+# Network settings for data.gov.in collection, overridable from the environment
+DATA_GOV_IN_BASE_URL = os.getenv("DATA_GOV_IN_BASE_URL", "https://api.data.gov.in/resource")
+DEFAULT_MAX_WORKERS = int(os.getenv("DATA_GOV_IN_MAX_WORKERS", "8"))
+DEFAULT_RATE_LIMIT = float(os.getenv("DATA_GOV_IN_RATE_LIMIT", "5"))
+DEFAULT_PAGE_SIZE = int(os.getenv("DATA_GOV_IN_PAGE_SIZE", "1000"))
+# Pages requested ahead of those being written, per worker
+PAGES_IN_FLIGHT_PER_WORKER = 2
+# Whether the server's ETag/Last-Modified describe a whole dataset rather
+# than just the page they were returned with
+DATASET_VALIDATORS = os.getenv("DATA_GOV_IN_DATASET_VALIDATORS", "0") == "1"
+
+# List of dataset IDs to fetch (these are examples and would need to be replaced with actual IDs)
+DATA_GOV_IN_DATASETS = [
+    "tourism-statistics",
+    "cultural-sites",
+    "art-forms",
+    "government-funding"
+]
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+def default_raw_dir():
+    """Returns the absolute path of the project's data/raw directory"""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "raw")
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces requests evenly at `rate` per second.
+    """
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """Blocks until the caller may send its next request"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+def make_session(pool_size=DEFAULT_MAX_WORKERS):
+    """
+    Creates a requests session whose connection pool can serve `pool_size`
+    concurrent requests, so connections are reused across pages and datasets.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def fetch_with_retries(session, url, params, limiter=None, max_retries=5, backoff=0.5, timeout=30, headers=None):
+    """
+    Sends a GET request, retrying transient failures with exponential backoff.
+    Connection errors, timeouts, HTTP 429 and 5xx responses are retried;
+    a Retry-After header from the server takes precedence over the backoff.
+    
+    Args:
+        session (requests.Session): Session to send the request with
+        url (str): URL of the API endpoint
+        params (dict): Query parameters
+        limiter (RateLimiter, optional): Shared rate limiter
+        max_retries (int): Retries after the first attempt
+        backoff (float): Base delay in seconds, doubled on every retry
+        timeout (float): Per-request timeout in seconds
+        headers (dict, optional): Extra request headers, e.g. conditional validators
+        
+    Returns:
+        requests.Response: Successful response (including 304 Not Modified)
+        
+    Raises:
+        requests.exceptions.RequestException: If every attempt failed
+    """
+    for attempt in range(max_retries + 1):
+        if limiter:
+            limiter.wait()
+        retry_after = None
+        try:
+            response = session.get(url, params=params, timeout=timeout, headers=headers)
+            if response.status_code not in RETRYABLE_STATUS:
+                response.raise_for_status()
+                return response
+            retry_after = response.headers.get("Retry-After")
+            error = requests.exceptions.HTTPError(f"HTTP {response.status_code}", response=response)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = e
+        
+        if attempt == max_retries:
+            raise error
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = backoff * (2 ** attempt) * (0.5 + random.random())
+        time.sleep(delay)
+
+# data.gov.in field types mapped to the Arrow types used for raw snapshots.
+# Anything else (keyword, text, date, ...) is kept as a string.
+FIELD_TYPES = {
+    "double": pa.float64(),
+    "float": pa.float64(),
+    "integer": pa.int64(),
+    "int": pa.int64(),
+    "long": pa.int64()
+}
+
+def records_schema(first_page):
+    """
+    Builds the fixed schema of a dataset's raw snapshot from its first page.
+    Uses the 'field' metadata data.gov.in returns when present, otherwise
+    every key of the first record as a string column.
+    """
+    fields = first_page.get("field") or []
+    if fields:
+        return pa.schema([(f.get("id") or f.get("name"), FIELD_TYPES.get(str(f.get("type")).lower(), pa.string()))
+                          for f in fields])
+    records = first_page.get("records") or [{}]
+    return pa.schema([(key, pa.string()) for key in records[0]])
+
+def records_to_table(records, schema):
+    """
+    Converts one page of JSON records to an Arrow table with the given schema.
+    Values that do not fit a numeric column become nulls.
+    """
+    columns = {}
+    for field in schema:
+        values = [record.get(field.name) for record in records]
+        if pa.types.is_string(field.type):
+            columns[field.name] = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+        else:
+            numeric = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+            if pa.types.is_integer(field.type) and numeric.notna().all():
+                numeric = numeric.astype("int64")
+            columns[field.name] = pa.array(numeric, type=field.type, from_pandas=True, safe=False)
+    return pa.table(columns, schema=schema)
+
+class SnapshotWriter:
+    """
+    Append-only writer for one dataset's raw snapshot.
+    Pages are written as they arrive, as Parquet row groups or NDJSON lines,
+    so memory use is bounded by the pages in flight rather than the dataset size.
+    Output goes to a .part file until commit(), and a content hash is kept
+    per page so that the snapshot can be compared with the previous one
+    regardless of the order in which pages arrived.
+    """
+    
+    def __init__(self, path, schema, output_format="parquet"):
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.schema = schema
+        self.output_format = output_format
+        self.rows = 0
+        self.nbytes = 0
+        self._page_hashes = {}
+        self._closed = False
+        self._lock = threading.Lock()
+        if output_format == "parquet":
+            self._writer = pq.ParquetWriter(self.part_path, schema, compression="zstd")
+        else:
+            self._writer = open(self.part_path, "w", encoding="utf-8")
+    
+    def write_page(self, records, offset=0):
+        """Appends one page of records"""
+        table = records_to_table(records, self.schema)
+        digest = hashlib.sha256(json.dumps(records, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        with self._lock:
+            if self.output_format == "parquet":
+                self._writer.write_table(table)
+            else:
+                for row in table.to_pylist():
+                    self._writer.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self.rows += table.num_rows
+            self.nbytes += table.nbytes
+            self._page_hashes[offset] = digest
+    
+    def content_hash(self):
+        """Returns a hash of the schema and all records, independent of page arrival order"""
+        digest = hashlib.sha256(str(self.schema).encode("utf-8"))
+        for offset in sorted(self._page_hashes):
+            digest.update(self._page_hashes[offset].encode("ascii"))
+        return digest.hexdigest()
+    
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self._writer.close()
+                self._closed = True
+    
+    def commit(self):
+        """Closes the writer and moves the snapshot to its final path"""
+        self.close()
+        os.replace(self.part_path, self.path)
+    
+    def discard(self):
+        """Closes the writer and deletes the partial snapshot"""
+        self.close()
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
+
+COLLECTION_STATE_NAME = "collection_state.json"
+
+def load_collection_state(raw_dir):
+    """Loads the per-dataset validators and content hashes from the last collection run"""
+    try:
+        with open(os.path.join(raw_dir, COLLECTION_STATE_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_collection_state(state, raw_dir):
+    """Writes the collection state atomically"""
+    path = os.path.join(raw_dir, COLLECTION_STATE_NAME)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(state, f, indent=4, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+def conditional_headers(entry, page_size, dataset_validators=False):
+    """
+    Builds If-None-Match / If-Modified-Since headers for a dataset's first
+    page from its stored validators.
+    
+    A 304 only says that the first page is unchanged, so validators are sent
+    only when that proves the whole dataset unchanged: the last snapshot fit
+    in a single, not full, page of the same size, or the server's validators
+    are known to cover the whole dataset (dataset_validators). Otherwise no
+    headers are sent and the content hash decides whether anything changed.
+    
+    Args:
+        entry (dict): The dataset's entry in the collection state, or None
+        page_size (int): Records requested per page
+        dataset_validators (bool): The validators describe the whole dataset
+        
+    Returns:
+        dict: Request headers, empty for an unconditional request
+    """
+    headers = {}
+    if not entry or not entry.get("snapshot") or not os.path.exists(entry["snapshot"]):
+        return headers
+    single_page = entry.get("page_size") == page_size and entry.get("rows", page_size) < page_size
+    if not (single_page or dataset_validators):
+        return headers
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+def fetch_data_gov_in_datasets(dataset_ids=None, base_url=None, api_key=None, raw_dir=None,
+                               max_workers=DEFAULT_MAX_WORKERS, rate_limit=DEFAULT_RATE_LIMIT,
+                               page_size=DEFAULT_PAGE_SIZE, output_format="parquet",
+                               dataset_validators=DATASET_VALIDATORS):
     """
     Fetches datasets related to art, culture, and tourism from data.gov.in.
-    Saves the raw data to files in the data/raw directory.
+    All pages of all datasets are requested concurrently over a pooled
+    session, with bounded concurrency, a shared rate limit and retries;
+    at most PAGES_IN_FLIGHT_PER_WORKER pages per worker are requested ahead
+    of those written, so memory does not grow with the dataset size.
+    Each page is streamed into an append-only snapshot in the data/raw
+    directory as soon as it arrives, with a fixed schema taken from the
+    dataset's field metadata, next to a small JSON file with the metadata.
+    ETag/Last-Modified validators and a content hash are kept per dataset in
+    collection_state.json, and no new snapshot is written when the records
+    are identical to the previous snapshot. The first page is requested
+    conditionally, and a 304 skips the dataset, only when conditional_headers
+    can tell that the first page's validators cover the whole dataset.
+    
+    Args:
+        dataset_ids (list, optional): Dataset IDs to fetch. Defaults to DATA_GOV_IN_DATASETS
+        base_url (str, optional): API base URL, e.g. a local stub server for testing
+        api_key (str, optional): API key. Defaults to DATA_GOV_IN_API_KEY
+        raw_dir (str, optional): Output directory. Defaults to the project's data/raw
+        max_workers (int): Maximum concurrent requests
+        rate_limit (float): Maximum requests per second across all workers
+        page_size (int): Records requested per page
+        output_format (str): 'parquet' or 'ndjson'
+        dataset_validators (bool): Trust a 304 for the first page of a dataset
+            of several pages, i.e. the server's validators describe the whole
+            dataset. Defaults to DATA_GOV_IN_DATASET_VALIDATORS=1
+        
+    Returns:
+        dict: Dataset ID mapped to its current snapshot path (the previous one
+            if unchanged), or None if it failed
     """
-    # Base URL for data.gov.in API
-    base_url = "https://api.data.gov.in/resource"
-    
-    # List of dataset IDs to fetch (these are examples and would need to be replaced with actual IDs)
-    dataset_ids = [
-        "tourism-statistics",
-        "cultural-sites",
-        "art-forms",
-        "government-funding"
-    ]
+    dataset_ids = dataset_ids or DATA_GOV_IN_DATASETS
+    base_url = (base_url or DATA_GOV_IN_BASE_URL).rstrip("/")
+    raw_dir = raw_dir or default_raw_dir()
     
     # API key (would need to be obtained from data.gov.in)
-    api_key = os.getenv("DATA_GOV_IN_API_KEY")
+    api_key = api_key or os.getenv("DATA_GOV_IN_API_KEY")
     
     if not api_key:
         print("Warning: DATA_GOV_IN_API_KEY environment variable not set.")
         print("You will need to register at data.gov.in to obtain an API key.")
-        return
+        return {}
     
-    for dataset_id in dataset_ids:
-        print(f"Fetching dataset: {dataset_id}")
-        
-        # Construct API URL
-        api_url = f"{base_url}/{dataset_id}"
-        
-        # Set up parameters
+    os.makedirs(raw_dir, exist_ok=True)
+    session = make_session(max_workers)
+    limiter = RateLimiter(rate_limit)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    extension = "parquet" if output_format == "parquet" else "ndjson"
+    state = load_collection_state(raw_dir)
+    start_trace()
+    start = time.perf_counter()
+    
+    def fetch_page(dataset_id, offset, headers=None):
         params = {
             "api-key": api_key,
-            "format": "json"
+            "format": "json",
+            "offset": offset,
+            "limit": page_size
         }
+        return fetch_with_retries(session, f"{base_url}/{dataset_id}", params, limiter, headers=headers)
+    
+    writers = {}
+    metadata = {}
+    validators = {}
+    failed = set()
+    not_modified = set()
+    finished = {}
+    
+    def write_page(dataset_id, page, offset):
+        if dataset_id not in failed:
+            writers[dataset_id].write_page(page.get("records", []), offset)
+            finished[dataset_id] = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # The first page of each dataset may be a conditional request; it
+        # also gives the schema and the record count
+        futures = {
+            executor.submit(fetch_page, dataset_id, 0,
+                            conditional_headers(state.get(dataset_id), page_size, dataset_validators)): dataset_id
+            for dataset_id in dataset_ids
+        }
+        for future in as_completed(futures):
+            dataset_id = futures.pop(future)
+            finished[dataset_id] = time.perf_counter()
+            print(f"Fetching dataset: {dataset_id}")
+            try:
+                response = future.result()
+                if response.status_code == 304:
+                    not_modified.add(dataset_id)
+                    continue
+                first_page = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"Error fetching data from API: {e}")
+                failed.add(dataset_id)
+                continue
+            validators[dataset_id] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")
+            }
+            path = os.path.join(raw_dir, f"{dataset_id}_{timestamp}.{extension}")
+            writers[dataset_id] = SnapshotWriter(path, records_schema(first_page), output_format)
+            metadata[dataset_id] = {k: v for k, v in first_page.items() if k not in ("records", "offset", "count")}
+            write_page(dataset_id, first_page, 0)
         
-        # Fetch data
-        data = fetch_data_from_api(api_url, params)
+        # Remaining pages of every dataset are fetched together through a
+        # bounded window: the next page is submitted as each one is written,
+        # so only the pages in flight are ever held in memory
+        pending = ((dataset_id, offset) for dataset_id in list(writers)
+                   for offset in range(page_size, int(metadata[dataset_id].get("total", 0) or 0), page_size))
+        in_flight = {}
         
-        if data:
-            # Save raw data to file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"../data/raw/{dataset_id}_{timestamp}.json"
-            
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=4)
-            
-            print(f"Saved raw data to {filename}")
-        else:
+        def submit_next():
+            for dataset_id, offset in pending:
+                if dataset_id not in failed:
+                    in_flight[executor.submit(fetch_page, dataset_id, offset)] = (dataset_id, offset)
+                    return True
+            return False
+        
+        while len(in_flight) < max_workers * PAGES_IN_FLIGHT_PER_WORKER and submit_next():
+            pass
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                dataset_id, offset = in_flight.pop(future)
+                try:
+                    write_page(dataset_id, future.result().json(), offset)
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    print(f"Error fetching {dataset_id} at offset {offset}: {e}")
+                    failed.add(dataset_id)
+                submit_next()
+    
+    session.close()
+    
+    saved = {}
+    checked_at = datetime.now().isoformat(timespec="seconds")
+    for dataset_id in dataset_ids:
+        writer = writers.get(dataset_id)
+        previous = state.get(dataset_id, {})
+        # Datasets are fetched concurrently, so each one is timed from the
+        # start of collection to its last page
+        record_span(f"collection.{dataset_id}", finished.get(dataset_id, time.perf_counter()) - start,
+                    writer.rows if writer else None, writer.nbytes if writer else None,
+                    status='not_modified' if dataset_id in not_modified else 'failed' if dataset_id in failed
+                    else 'fetched')
+        
+        if dataset_id in not_modified:
+            print(f"{dataset_id} not modified since the last run; keeping {previous['snapshot']}")
+            previous["checked_at"] = checked_at
+            saved[dataset_id] = previous["snapshot"]
+            continue
+        
+        if dataset_id in failed:
+            if writer:
+                writer.discard()
             print(f"Failed to fetch data for {dataset_id}")
+            saved[dataset_id] = None
+            continue
+        
+        content_hash = writer.content_hash()
+        if content_hash == previous.get("content_hash") and os.path.exists(previous.get("snapshot", "")):
+            # Same records as the last snapshot: nothing new to write
+            writer.discard()
+            print(f"{dataset_id} unchanged (content hash match); keeping {previous['snapshot']}")
+            previous.update(validators[dataset_id], page_size=page_size, checked_at=checked_at)
+            saved[dataset_id] = previous["snapshot"]
+            continue
+        
+        writer.commit()
+        metadata[dataset_id].update(count=writer.rows, content_hash=content_hash)
+        with open(os.path.join(raw_dir, f"{dataset_id}_{timestamp}.meta.json"), 'w') as f:
+            json.dump(metadata[dataset_id], f)
+        
+        state[dataset_id] = dict(validators[dataset_id], content_hash=content_hash, snapshot=writer.path,
+                                 rows=writer.rows, page_size=page_size, checked_at=checked_at)
+        print(f"Saved {writer.rows} records to {writer.path}")
+        saved[dataset_id] = writer.path
+    
+    save_collection_state(state, raw_dir)
+    record_span("collection.run", time.perf_counter() - start)
+    return saved
 
 def download_sample_datasets():
     """
@@ -104,11 +516,25 @@ def download_sample_datasets():
         except Exception as e:
             print(f"Error downloading sample dataset {name}: {e}")
 
-def create_mock_datasets():
+def create_mock_datasets(raw_dir=None, scale=None, seed=42):
     """
     Creates mock datasets for development when API access or sample datasets are not available.
+    By default the small hand-written tables are used, with seeded seasonal
+    data; with `scale` every table is generated synthetically at that size.
+    
+    Args:
+        raw_dir (str, optional): Output directory. Defaults to the project's data/raw
+        scale (int, optional): Rows per table for synthetic datasets
+        seed (int): Random seed of the generated data
     """
     print("Creating mock datasets for development...")
+    raw_dir = raw_dir or default_raw_dir()
+    os.makedirs(raw_dir, exist_ok=True)
+    
+    if scale is not None:
+        paths = synthetic_data.write_datasets(raw_dir, scale, seed, suffix="mock")
+        print(f"Generated {scale:,} rows per table for {', '.join(paths)} in {raw_dir}")
+        return
     
     # 1. Tourism Statistics Mock Data
     tourism_data = {
@@ -118,7 +544,7 @@ def create_mock_datasets():
         "Revenue_Crores": [50000, 55000, 60000, 65000, 70000, 75000, 80000, 85000, 90000, 95000, 40000, 60000, 85000]
     }
     tourism_df = pd.DataFrame(tourism_data)
-    tourism_df.to_csv("../data/raw/tourism_statistics_mock.csv", index=False)
+    tourism_df.to_csv(os.path.join(raw_dir, "tourism_statistics_mock.csv"), index=False)
     
     # 2. Cultural Sites Mock Data
     sites = [
@@ -156,7 +582,7 @@ def create_mock_datasets():
         "UNESCO_Heritage": [True, True, True, True, True, True, True, True, True, True, False, False, False, False, False]
     }
     sites_df = pd.DataFrame(sites_data)
-    sites_df.to_csv("../data/raw/cultural_sites_mock.csv", index=False)
+    sites_df.to_csv(os.path.join(raw_dir, "cultural_sites_mock.csv"), index=False)
     
     # 3. Art Forms Mock Data
     art_forms = [
@@ -184,7 +610,7 @@ def create_mock_datasets():
         "Tourism_Potential": ["High", "High", "High", "Medium", "Medium", "Medium", "Medium", "Low", "High", "Medium", "Medium", "High", "High", "Medium", "High"]
     }
     art_df = pd.DataFrame(art_data)
-    art_df.to_csv("../data/raw/art_forms_mock.csv", index=False)
+    art_df.to_csv(os.path.join(raw_dir, "art_forms_mock.csv"), index=False)
     
     # 4. Government Funding Mock Data
     years = list(range(2015, 2023))
@@ -203,94 +629,16 @@ def create_mock_datasets():
         ]
     }
     funding_df = pd.DataFrame(funding_data)
-    funding_df.to_csv("../data/raw/government_funding_mock.csv", index=False)
-    
-    # 5. Seasonal Tourism Trends Mock Data
-    months = ["January", "February", "March", "April", "May", "June", 
-              "July", "August", "September", "October", "November", "December"]
-    
-    regions = ["North India", "South India", "East India", "West India", "Central India", "Northeast India"]
-    
-    # Create empty lists for each column
-    month_col = []
-    region_col = []
-    visitors_col = []
-    peak_season_col = []
+    funding_df.to_csv(os.path.join(raw_dir, "government_funding_mock.csv"), index=False)
     
-    # Generate data for each region and month combination
-    for region in regions:
-        for month in months:
-            month_col.append(month)
-            region_col.append(region)
-            
-            # Assign visitor numbers based on region and month (simulating seasonal patterns)
-            if region == "North India":
-                if month in ["October", "November", "December", "January", "February"]:
-                    visitors = np.random.randint(800000, 1200000)
-                    peak = "Yes"
-                else:
-                    visitors = np.random.randint(300000, 700000)
-                    peak = "No"
-            elif region == "South India":
-                if month in ["December", "January", "February", "March"]:
-                    visitors = np.random.randint(900000, 1300000)
-                    peak = "Yes"
-                else:
-                    visitors = np.random.randint(400000, 800000)
-                    peak = "No"
-            elif region == "East India":
-                if month in ["October", "November", "December", "January"]:
-                    visitors = np.random.randint(600000, 900000)
-                    peak = "Yes"
-                else:
-                    visitors = np.random.randint(200000, 500000)
-                    peak = "No"
-            elif region == "West India":
-                if month in ["November", "December", "January", "February"]:
-                    visitors = np.random.randint(700000, 1100000)
-                    peak = "Yes"
-                else:
-                    visitors = np.random.randint(300000, 600000)
-                    peak = "No"
-            elif region == "Central India":
-                if month in ["October", "November", "February", "March"]:
-                    visitors = np.random.randint(500000, 800000)
-                    peak = "Yes"
-                else:
-                    visitors = np.random.randint(150000, 400000)
-                    peak = "No"
-            else:  # Northeast India
-                if month in ["March", "April", "October", "November"]:
-                    visitors = np.random.randint(300000, 600000)
-                    peak = "Yes"
-                else:
-                    visitors = np.random.randint(100000, 250000)
-                    peak = "No"
-            
-            visitors_col.append(visitors)
-            peak_season_col.append(peak)
-    
-    seasonal_data = {
-        "Month": month_col,
-        "Region": region_col,
-        "Visitors": visitors_col,
-        "Peak_Season": peak_season_col
-    }
-    
-    seasonal_df = pd.DataFrame(seasonal_data)
-    seasonal_df.to_csv("../data/raw/seasonal_tourism_mock.csv", index=False)
+    # 5. Seasonal Tourism Trends Mock Data (one year of every region and month)
+    seasonal_df = synthetic_data.generate_seasonal_tourism(
+        len(synthetic_data.SEASONS) * len(synthetic_data.MONTHS), seed
+    )
+    seasonal_df.to_csv(os.path.join(raw_dir, "seasonal_tourism_mock.csv"), index=False)
     
     print("Mock datasets created successfully in the data/raw directory.")
 
-# Add these imports at the top if not already present
-import numpy as np
-import os
-import dotenv
-
-# Load environment variables
-dotenv.load_dotenv()
-
-# Update the main execution section at the bottom of the file
 if __name__ == "__main__":
     # Create absolute paths for data directories
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -302,13 +650,27 @@ if __name__ == "__main__":
     os.makedirs(raw_data_dir, exist_ok=True)
     os.makedirs(processed_data_dir, exist_ok=True)
     
+    parser = argparse.ArgumentParser(description="Fetch datasets from data.gov.in or create mock datasets")
+    parser.add_argument("--scale", type=int, default=None,
+                        help="generate synthetic mock datasets with this many rows per table")
+    parser.add_argument("--seed", type=int, default=42, help="random seed of the mock datasets")
+    args = parser.parse_args()
+    configure_logging()
+    
+    # Synthetic data at a requested scale, for load tests and benchmarks
+    if args.scale is not None:
+        print(f"Generating synthetic datasets with {args.scale:,} rows per table...")
+        with span("collection.mock", scale=args.scale):
+            create_mock_datasets(raw_data_dir, scale=args.scale, seed=args.seed)
     # Try to fetch data from data.gov.in if API key is available
-    if os.getenv("DATA_GOV_IN_API_KEY"):
+    elif os.getenv("DATA_GOV_IN_API_KEY"):
         print("Using data.gov.in API key to fetch real data...")
         fetch_data_gov_in_datasets()
     else:
         # Otherwise create mock datasets for development
         print("No API key found. Creating mock datasets instead...")
-        create_mock_datasets()
-        
+        with span("collection.mock"):
+            create_mock_datasets(raw_data_dir, seed=args.seed)
+    
+    write_prometheus()
     print("Data collection complete!")
\ No newline at end of file
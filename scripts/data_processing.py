@@ -1,11 +1,183 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import os
 import json
 import glob
+import hashlib
+import argparse
+import time
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 
-def process_tourism_statistics(input_file, output_file):
+# Add parent directory to path to import utils
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from utils import geography, rollups, search, seasonal, spatial
+from utils.data_cache import processed_file
+from utils.metrics import record_span, start_trace, frame_memory, configure_logging, write_prometheus
+
+# Output formats written by the processors. CSV stays available for tools
+# that expect text files; Parquet is the typed format the app loads first.
+DEFAULT_FORMATS = tuple(
+    fmt.strip() for fmt in os.getenv('PROCESSED_FORMATS', 'csv,parquet').split(',') if fmt.strip()
+)
+
+# Explicit column types for the Parquet output of each processed dataset
+SCHEMAS = {
+    'tourism_statistics': pa.schema([
+        ('Year', pa.int32()),
+        ('Domestic_Visitors', pa.int64()),
+        ('International_Visitors', pa.int64()),
+        ('Revenue_Crores', pa.float64()),
+        ('Total_Visitors', pa.int64()),
+        ('International_Percentage', pa.float64()),
+    ]),
+    'cultural_sites': pa.schema([
+        ('Site_Name', pa.string()),
+        ('State', pa.string()),
+        ('Visitors_2022', pa.int64()),
+        ('Latitude', pa.float64()),
+        ('Longitude', pa.float64()),
+        ('UNESCO_Heritage', pa.bool_()),
+        ('Region', pa.string()),
+        ('Popularity', pa.dictionary(pa.int8(), pa.string(), ordered=True)),
+        ('State_ID', pa.int16()),
+        ('Region_ID', pa.int8()),
+    ]),
+    'art_forms': pa.schema([
+        ('Art_Form', pa.string()),
+        ('Type', pa.string()),
+        ('Region', pa.string()),
+        ('Practitioners_Estimate', pa.int64()),
+        ('Govt_Recognition', pa.string()),
+        ('Tourism_Potential', pa.string()),
+        ('Tourism_Potential_Score', pa.int8()),
+        ('Recognition_Score', pa.int8()),
+        ('Cultural_Significance', pa.float64()),
+        ('State_ID', pa.int16()),
+        ('Region_ID', pa.int8()),
+    ]),
+    'government_funding': pa.schema([
+        ('Year', pa.int32()),
+        ('Ministry', pa.string()),
+        ('Budget_Allocation_Crores', pa.float64()),
+        ('Utilization_Percentage', pa.float64()),
+        ('Actual_Utilization_Crores', pa.float64()),
+        ('YoY_Budget_Growth', pa.float64()),
+    ]),
+    'seasonal_tourism': pa.schema([
+        ('Year', pa.int32()),
+        ('Month', pa.string()),
+        ('Month_Num', pa.int8()),
+        ('Region_ID', pa.int8()),
+        ('Region', pa.string()),
+        ('Visitors', pa.int64()),
+        ('Records', pa.int64()),
+        ('Peak_Share', pa.float64()),
+    ]),
+    'places': pa.schema([
+        ('Zone', pa.string()),
+        ('State', pa.string()),
+        ('City', pa.string()),
+        ('Name', pa.string()),
+        ('Type', pa.string()),
+        ('Establishment_Year', pa.string()),
+        ('Visit_Hours', pa.float64()),
+        ('Google_Rating', pa.float64()),
+        ('Entrance_Fee_INR', pa.int32()),
+        ('Airport_Within_50km', pa.string()),
+        ('Weekly_Off', pa.string()),
+        ('Significance', pa.string()),
+        ('DSLR_Allowed', pa.string()),
+        ('Google_Reviews_Lakhs', pa.float64()),
+        ('Best_Time_To_Visit', pa.string()),
+        ('State_ID', pa.int16()),
+        ('Region_ID', pa.int8()),
+        ('Latitude', pa.float64()),
+        ('Longitude', pa.float64()),
+        ('Location_Precision', pa.string()),
+    ]),
+    'dim_region': pa.schema([
+        ('Region_ID', pa.int8()),
+        ('Region', pa.string()),
+        ('Latitude', pa.float64()),
+        ('Longitude', pa.float64()),
+    ]),
+    'dim_state': pa.schema([
+        ('State_ID', pa.int16()),
+        ('State', pa.string()),
+        ('Region_ID', pa.int8()),
+        ('Latitude', pa.float64()),
+        ('Longitude', pa.float64()),
+    ]),
+}
+
+def schema_dtypes(dataset):
+    """Returns the NumPy dtypes of the numeric and boolean columns declared in SCHEMAS for a dataset"""
+    schema = SCHEMAS.get(dataset, pa.schema([]))
+    return {
+        field.name: pd.api.types.pandas_dtype(field.type.to_pandas_dtype()) for field in schema
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type) or pa.types.is_boolean(field.type)
+    }
+
+def parquet_path(output_file):
+    """Returns the Parquet path that sits next to a processed CSV path"""
+    return os.path.splitext(output_file)[0] + '.parquet'
+
+def save_processed(df, output_file, dataset, formats=None):
+    """
+    Saves a processed DataFrame in the requested output formats.
+    
+    Args:
+        df (pandas.DataFrame): Processed data
+        output_file (str): CSV output path; the Parquet file uses the same name with a .parquet extension
+        dataset (str): Key into SCHEMAS for the Parquet column types; other datasets use inferred types
+        formats (iterable, optional): Any of 'csv' and 'parquet'. Defaults to DEFAULT_FORMATS
+        
+    Returns:
+        list: Paths of the files written
+    """
+    formats = DEFAULT_FORMATS if formats is None else tuple(formats)
+    written = []
+    
+    if 'csv' in formats:
+        df.to_csv(output_file, index=False)
+        written.append(output_file)
+    
+    if 'parquet' in formats:
+        # Columns not covered by the schema keep their inferred types
+        declared = SCHEMAS.get(dataset, pa.schema([]))
+        inferred = pa.Schema.from_pandas(df, preserve_index=False)
+        schema = pa.schema([
+            declared.field(name) if name in declared.names else inferred.field(name)
+            for name in inferred.names
+        ])
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        pq.write_table(table, parquet_path(output_file), compression='zstd')
+        written.append(parquet_path(output_file))
+    
+    return written
+
+def read_raw(input_file):
+    """
+    Reads a raw dataset by file type: mock or sample CSVs, or the Parquet and
+    NDJSON snapshots streamed by the collector, which are read directly as
+    columns without another JSON parse of the whole response.
+    """
+    if input_file.endswith('.parquet'):
+        return pq.read_table(input_file, memory_map=True).to_pandas()
+    if input_file.endswith('.ndjson'):
+        return pd.read_json(input_file, lines=True)
+    return pd.read_csv(input_file)
+
+def process_tourism_statistics(input_file, output_file, formats=None):
     """Process tourism statistics data"""
-    df = pd.read_csv(input_file)
+    df = read_raw(input_file)
     
     # Data cleaning and transformation
     # 1. Handle missing values
@@ -16,40 +188,20 @@ def process_tourism_statistics(input_file, output_file):
     df['International_Percentage'] = (df['International_Visitors'] / df['Total_Visitors'] * 100).round(2)
     
     # 3. Save processed data
-    df.to_csv(output_file, index=False)
-    print(f"Processed tourism statistics saved to {output_file}")
+    written = save_processed(df, output_file, 'tourism_statistics', formats)
+    print(f"Processed tourism statistics saved to {', '.join(written)}")
     return df
 
-def process_cultural_sites(input_file, output_file):
+def process_cultural_sites(input_file, output_file, formats=None):
     """Process cultural sites data"""
-    df = pd.read_csv(input_file)
+    df = read_raw(input_file)
     
     # Data cleaning and transformation
-    # 1. Add region classification based on state
-    north_states = ['Jammu and Kashmir', 'Himachal Pradesh', 'Punjab', 'Uttarakhand', 'Haryana', 'Delhi', 'Uttar Pradesh']
-    south_states = ['Karnataka', 'Andhra Pradesh', 'Tamil Nadu', 'Kerala', 'Telangana']
-    east_states = ['Bihar', 'Jharkhand', 'West Bengal', 'Odisha']
-    west_states = ['Rajasthan', 'Gujarat', 'Maharashtra', 'Goa']
-    central_states = ['Madhya Pradesh', 'Chhattisgarh']
-    northeast_states = ['Sikkim', 'Assam', 'Meghalaya', 'Tripura', 'Mizoram', 'Manipur', 'Nagaland', 'Arunachal Pradesh']
-    
-    def get_region(state):
-        if state in north_states:
-            return 'North India'
-        elif state in south_states:
-            return 'South India'
-        elif state in east_states:
-            return 'East India'
-        elif state in west_states:
-            return 'West India'
-        elif state in central_states:
-            return 'Central India'
-        elif state in northeast_states:
-            return 'Northeast India'
-        else:
-            return 'Other'
-    
-    df['Region'] = df['State'].apply(get_region)
+    # 1. Add region classification based on state, using vectorized
+    # lookups against the geography dimension tables
+    dim_region = geography.build_dim_region()
+    state_ids, region_ids = geography.resolve_locations(df['State'], dim_region=dim_region)
+    df['Region'] = dim_region['Region'].to_numpy()[region_ids]
     
     # 2. Categorize sites by visitor volume
     df['Popularity'] = pd.cut(
@@ -58,14 +210,18 @@ def process_cultural_sites(input_file, output_file):
         labels=['Low', 'Medium', 'High']
     )
     
-    # 3. Save processed data
-    df.to_csv(output_file, index=False)
-    print(f"Processed cultural sites data saved to {output_file}")
+    # 3. Keep the compact dimension keys alongside the readable names
+    df['State_ID'] = state_ids
+    df['Region_ID'] = region_ids
+    
+    # 4. Save processed data
+    written = save_processed(df, output_file, 'cultural_sites', formats)
+    print(f"Processed cultural sites data saved to {', '.join(written)}")
     return df
 
-def process_art_forms(input_file, output_file):
+def process_art_forms(input_file, output_file, formats=None):
     """Process art forms data"""
-    df = pd.read_csv(input_file)
+    df = read_raw(input_file)
     
     # Data cleaning and transformation
     # 1. Create a tourism potential score (numeric)
@@ -79,14 +235,63 @@ def process_art_forms(input_file, output_file):
     # 3. Calculate overall cultural significance score
     df['Cultural_Significance'] = (df['Tourism_Potential_Score'] + df['Recognition_Score']) / 2
     
-    # 4. Save processed data
-    df.to_csv(output_file, index=False)
-    print(f"Processed art forms data saved to {output_file}")
+    # 4. Resolve the region column, which mixes states and regions, to dimension keys
+    df['State_ID'], df['Region_ID'] = geography.resolve_locations(df['Region'])
+    
+    # 5. Save processed data
+    written = save_processed(df, output_file, 'art_forms', formats)
+    print(f"Processed art forms data saved to {', '.join(written)}")
     return df
 
-def process_government_funding(input_file, output_file):
+# Source column names of the places dataset and the names used downstream
+PLACES_COLUMNS = {
+    'Zone': 'Zone',
+    'State': 'State',
+    'City': 'City',
+    'Name': 'Name',
+    'Type': 'Type',
+    'Establishment Year': 'Establishment_Year',
+    'time needed to visit in hrs': 'Visit_Hours',
+    'Google review rating': 'Google_Rating',
+    'Entrance Fee in INR': 'Entrance_Fee_INR',
+    'Airport with 50km Radius': 'Airport_Within_50km',
+    'Weekly Off': 'Weekly_Off',
+    'Significance': 'Significance',
+    'DSLR Allowed': 'DSLR_Allowed',
+    'Number of google review in lakhs': 'Google_Reviews_Lakhs',
+    'Best Time to visit': 'Best_Time_To_Visit'
+}
+
+def process_places(input_file, output_file, formats=None):
+    """Process the top places to visit data"""
+    df = read_raw(input_file)
+    
+    # Data cleaning and transformation
+    # 1. Keep the known columns under underscore names (drops the saved index column)
+    df = df[list(PLACES_COLUMNS)].rename(columns=PLACES_COLUMNS)
+    
+    # 2. Tidy the categorical columns used as filters
+    for col in ['Zone', 'State', 'City', 'Type', 'Significance', 'DSLR_Allowed', 'Best_Time_To_Visit']:
+        df[col] = df[col].astype(str).str.strip()
+    df['Best_Time_To_Visit'] = df['Best_Time_To_Visit'].replace({'Anytime': 'All'})
+    df['Weekly_Off'] = df['Weekly_Off'].fillna('None').astype(str).str.strip()
+    
+    # 3. Resolve states to dimension keys
+    df['State_ID'], df['Region_ID'] = geography.resolve_locations(df['State'])
+    
+    # 4. Approximate coordinates: the city's when it is known, otherwise the state centroid
+    df['Latitude'], df['Longitude'], df['Location_Precision'] = geography.place_coordinates(
+        df['City'], df['State_ID'], geography.build_dim_state()
+    )
+    
+    # 5. Save processed data
+    written = save_processed(df, output_file, 'places', formats)
+    print(f"Processed places data saved to {', '.join(written)}")
+    return df
+
+def process_government_funding(input_file, output_file, formats=None):
     """Process government funding data"""
-    df = pd.read_csv(input_file)
+    df = read_raw(input_file)
     
     # Data cleaning and transformation
     # 1. Calculate actual utilization
@@ -98,53 +303,485 @@ def process_government_funding(input_file, output_file):
     df['YoY_Budget_Growth'] = df['YoY_Budget_Growth'].round(2)
     
     # 3. Save processed data
-    df.to_csv(output_file, index=False)
-    print(f"Processed government funding data saved to {output_file}")
+    written = save_processed(df, output_file, 'government_funding', formats)
+    print(f"Processed government funding data saved to {', '.join(written)}")
+    return df
+
+def process_seasonal_tourism(input_file, output_file, formats=None):
+    """Process seasonal tourism data into a year × month × region visitors cube"""
+    df = read_raw(input_file)
+    
+    # 1. Sum visitors and peak-season flags into the dense cube, with
+    # regions laid out by Region_ID
+    cube = seasonal.SeasonalCube.from_frame(df)
+    
+    # 2. Persist the cube next to the processed table; the app slices it directly
+    cube.save(os.path.join(os.path.dirname(output_file), seasonal.CUBE_NAME))
+    
+    # 3. Save the populated cells as a long table
+    processed = cube.to_frame()
+    written = save_processed(processed, output_file, 'seasonal_tourism', formats)
+    print(f"Processed seasonal tourism data saved to {', '.join(written)} and {seasonal.CUBE_NAME}")
+    return processed
+
+def process_dim_region(input_file, output_file, formats=None):
+    """Build the region dimension table from the geography reference data"""
+    df = geography.build_dim_region()
+    written = save_processed(df, output_file, 'dim_region', formats)
+    print(f"Region dimension saved to {', '.join(written)}")
+    return df
+
+def process_dim_state(input_file, output_file, formats=None):
+    """Build the state dimension table from the geography reference data"""
+    df = geography.build_dim_state()
+    written = save_processed(df, output_file, 'dim_state', formats)
+    print(f"State dimension saved to {', '.join(written)}")
     return df
 
-def process_all_datasets():
-    """Process all datasets in the raw data directory"""
+GEOGRAPHY_FILE = os.path.abspath(geography.__file__)
+SEASONAL_FILE = os.path.abspath(seasonal.__file__)
+
+# The places dataset ships with the repository instead of being collected
+PLACES_FILE = os.path.join(project_dir, 'data', 'processed', 'Top Indian Places to Visit.csv')
+
+# Pipeline stages: raw file patterns (or a fixed input file), processor and
+# processed output name. The most recently modified matching file is used,
+# so a newer API snapshot takes precedence over the mock CSV. Files listed in 'depends' are hashed into the
+# stage's input hash, so a change to them also rebuilds the stage. Files
+# named in 'extra_outputs' are written by the processor next to its table
+# and checked like the table itself.
+# Bump a stage's version whenever its processor logic changes so that the
+# manifest marks existing outputs as stale.
+STAGES = [
+    {'name': 'dim_region', 'input': GEOGRAPHY_FILE,
+     'processor': process_dim_region, 'output': 'dim_region.csv', 'version': 1},
+    {'name': 'dim_state', 'input': GEOGRAPHY_FILE,
+     'processor': process_dim_state, 'output': 'dim_state.csv', 'version': 1},
+    {'name': 'tourism_statistics',
+     'patterns': ['*tourism_statistics*.csv', 'tourism-statistics_*.parquet', 'tourism-statistics_*.ndjson'],
+     'processor': process_tourism_statistics, 'output': 'tourism_statistics_processed.csv', 'version': 1},
+    {'name': 'cultural_sites',
+     'patterns': ['*cultural_sites*.csv', 'cultural-sites_*.parquet', 'cultural-sites_*.ndjson'],
+     'depends': [GEOGRAPHY_FILE],
+     'processor': process_cultural_sites, 'output': 'cultural_sites_processed.csv', 'version': 2},
+    {'name': 'art_forms',
+     'patterns': ['*art_forms*.csv', 'art-forms_*.parquet', 'art-forms_*.ndjson'],
+     'depends': [GEOGRAPHY_FILE],
+     'processor': process_art_forms, 'output': 'art_forms_processed.csv', 'version': 2},
+    {'name': 'government_funding',
+     'patterns': ['*government_funding*.csv', 'government-funding_*.parquet', 'government-funding_*.ndjson'],
+     'processor': process_government_funding, 'output': 'government_funding_processed.csv', 'version': 1},
+    {'name': 'places', 'input': PLACES_FILE,
+     'depends': [GEOGRAPHY_FILE],
+     'processor': process_places, 'output': 'places_processed.csv', 'version': 2},
+    {'name': 'seasonal_tourism',
+     'patterns': ['*seasonal_tourism*.csv'],
+     'depends': [GEOGRAPHY_FILE, SEASONAL_FILE],
+     'processor': process_seasonal_tourism, 'output': 'seasonal_tourism_processed.csv',
+     'extra_outputs': [seasonal.CUBE_NAME], 'version': 1},
+]
+
+MANIFEST_NAME = 'manifest.json'
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Returns the SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def output_paths(output_file, formats=None):
+    """Returns the files a processor writes for the given output formats"""
+    formats = DEFAULT_FORMATS if formats is None else tuple(formats)
+    paths = []
+    if 'csv' in formats:
+        paths.append(output_file)
+    if 'parquet' in formats:
+        paths.append(parquet_path(output_file))
+    return paths
+
+def load_manifest(path):
+    """Loads the processing manifest, returning an empty one if it is missing or unreadable"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest, path):
+    """Writes the processing manifest atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def is_stage_current(entry, input_hash, version, formats, outputs):
+    """
+    Checks whether a manifest entry still describes the current outputs of a stage.
+    
+    Args:
+        entry (dict): Manifest entry recorded by the last run, or None
+        input_hash (str): Hash of the current raw input file
+        version (int): Current processor version
+        formats (tuple): Output formats requested for this run
+        outputs (list): Output paths the stage would write
+        
+    Returns:
+        bool: True if the stage can be skipped
+    """
+    if not entry:
+        return False
+    if entry.get('input_hash') != input_hash or entry.get('processor_version') != version:
+        return False
+    if sorted(entry.get('formats', [])) != sorted(formats):
+        return False
+    
+    # Outputs that were deleted or edited since the last run are stale
+    recorded = entry.get('outputs', {})
+    for path in outputs:
+        name = os.path.basename(path)
+        if name not in recorded or not os.path.exists(path):
+            return False
+        if file_sha256(path) != recorded[name]:
+            return False
+    return True
+
+def run_stage(processor, input_file, output_file, formats):
+    """
+    Runs one processor and times it, capturing any failure.
+    Only the timing, error and size of the result are returned so that
+    worker processes do not have to send the processed DataFrame back to
+    the parent.
+    
+    Returns:
+        tuple: (elapsed seconds, error message or None, output rows, output memory in bytes)
+    """
+    start = time.perf_counter()
+    try:
+        df = processor(input_file, output_file, formats)
+        error = None
+    except Exception as e:
+        df = None
+        error = f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+    if df is None:
+        return elapsed, error, None, None
+    return elapsed, error, len(df), frame_memory(df)
+
+def print_stage_summary(results, wall_seconds):
+    """Prints a per-stage status and timing table"""
+    print("\nStage summary:")
+    print(f"  {'Stage':<30}{'Status':<12}{'Seconds':>10}{'Rows':>12}{'MB':>10}")
+    for name, result in results.items():
+        rows = '' if result.get('rows') is None else f"{result['rows']:,}"
+        memory = '' if result.get('memory_bytes') is None else f"{result['memory_bytes'] / 1e6:.2f}"
+        print(f"  {name:<30}{result['status']:<12}{result['seconds']:>10.3f}{rows:>12}{memory:>10}")
+        if result.get('error'):
+            print(f"    error: {result['error']}")
+    print(f"  {'Total (stage time)':<42}{sum(r['seconds'] for r in results.values()):>10.3f}")
+    print(f"  {'Total (wall clock)':<42}{wall_seconds:>10.3f}")
+
+def manifest_entry(input_name, input_hash, version, formats, outputs):
+    """Builds the manifest entry recording a stage's input, processor version and output hashes"""
+    return {
+        'input': input_name,
+        'input_hash': input_hash,
+        'processor_version': version,
+        'formats': list(formats),
+        'outputs': {os.path.basename(path): file_sha256(path) for path in outputs},
+        'processed_at': datetime.now().isoformat(timespec='seconds')
+    }
+
+def build_derived(stage_name, source_files, outputs, build, formats, manifest, manifest_path,
+                  force=False, version=1, salt=''):
+    """
+    Builds an artifact derived from processed datasets, such as a rollup
+    table or a search index, and records it in the manifest. Like the
+    processing stages, it is skipped when its sources and outputs are
+    unchanged since the last build.
+    
+    Args:
+        stage_name (str): Manifest key of the artifact, also used in its span name
+        source_files (list): Processed files it is built from; none means 'missing'
+        outputs (list): Files the build writes
+        build (callable): Writes the outputs and returns the DataFrame they hold
+        formats (tuple): Output formats of the run
+        manifest (dict): Processing manifest, updated in place
+        manifest_path (str): Where the manifest is saved
+        force (bool): Rebuild regardless of the manifest
+        version (int): Version of the build, bumped when its output changes
+        salt (str): Further input to the hash, e.g. the hash of a rollup definition
+        
+    Returns:
+        dict: Status, elapsed seconds and error message, plus rows and memory when built
+    """
+    result = {'status': 'missing', 'seconds': 0.0, 'error': None}
+    if not source_files:
+        return result
+    
+    source_files = sorted(source_files)
+    input_hash = hashlib.sha256((''.join(file_sha256(path) for path in source_files) + salt).encode()).hexdigest()
+    if not force and is_stage_current(manifest.get(stage_name), input_hash, version, formats, outputs):
+        result['status'] = 'skipped'
+        return result
+    
+    start = time.perf_counter()
+    try:
+        df = build()
+    except Exception as e:
+        result.update(status='failed', error=f"{type(e).__name__}: {e}", seconds=time.perf_counter() - start)
+        print(f"Failed to build {stage_name}: {result['error']}")
+        return result
+    result.update(status='processed', seconds=time.perf_counter() - start,
+                  rows=len(df), memory_bytes=frame_memory(df))
+    record_span(f"processing.{stage_name.replace(':', '.')}", result['seconds'], len(df), result['memory_bytes'])
+    
+    manifest[stage_name] = manifest_entry([os.path.basename(path) for path in source_files],
+                                          input_hash, version, formats, outputs)
+    save_manifest(manifest, manifest_path)
+    return result
+
+def source_paths(processed_dir, sources):
+    """Returns the processed files of the datasets named by a SOURCES mapping that exist"""
+    paths = (processed_file(processed_dir, source['dataset']) for source in sources.values())
+    return [path for path in paths if path is not None]
+
+def build_rollups(processed_dir, formats, manifest, manifest_path, force=False):
+    """
+    Materializes the rollup tables defined in utils/rollups.py from the processed datasets.
+    A rollup is rebuilt only when its source file or its definition changed
+    (see build_derived). A registry file (rollups.json) lists every
+    available rollup with its source, grouping columns and row count; build
+    times are kept in the manifest only, so the registry changes only when
+    a rollup does.
+    
+    Args:
+        processed_dir (str): Directory holding the processed datasets
+        formats (tuple): Output formats to write
+        manifest (dict): Processing manifest, updated in place
+        manifest_path (str): Where the manifest is saved
+        force (bool): Rebuild every rollup regardless of the manifest
+        
+    Returns:
+        dict: Rollup stage name mapped to its status, elapsed seconds and error message
+    """
+    registry_path = os.path.join(processed_dir, rollups.REGISTRY_NAME)
+    registry = load_manifest(registry_path)
+    results = {}
+    
+    for name, spec in rollups.ROLLUPS.items():
+        source_file = processed_file(processed_dir, spec['source'])
+        output_file = os.path.join(processed_dir, rollups.rollup_file_name(name) + '.csv')
+        
+        def build(name=name, spec=spec, source_file=source_file, output_file=output_file):
+            # Types come from the source's declared schema, not from how its file was read
+            dtypes = rollups.output_dtypes(spec, schema_dtypes(spec['source'].removesuffix('_processed')))
+            table = rollups.build_rollup(read_raw(source_file), spec, dtypes)
+            save_processed(table, output_file, f"rollup:{name}", formats)
+            registry[name] = {
+                'file': rollups.rollup_file_name(name),
+                'source': spec['source'],
+                'group_by': spec.get('group_by', []),
+                'columns': list(table.columns),
+                'rows': len(table)
+            }
+            return table
+        
+        results[f"rollup:{name}"] = build_derived(
+            f"rollup:{name}", [source_file] if source_file else [], output_paths(output_file, formats), build,
+            formats, manifest, manifest_path, force=force or name not in registry,
+            version=rollups.ROLLUP_VERSION, salt=rollups.spec_hash(spec)
+        )
+    
+    # Drop rollups that are no longer defined
+    registry = {name: entry for name, entry in registry.items() if name in rollups.ROLLUPS}
+    save_manifest(registry, registry_path)
+    return results
+
+def build_search_index(processed_dir, formats, manifest, manifest_path, force=False):
+    """
+    Builds the search catalogue and its inverted and trigram indexes from the
+    processed places, cultural sites and art forms (see utils/search.py).
+    The catalogue is saved like a processed dataset and the index arrays
+    next to it as search_index.npz.
+    
+    Args:
+        processed_dir (str): Directory holding the processed datasets
+        formats (tuple): Output formats of the catalogue
+        manifest (dict): Processing manifest, updated in place
+        manifest_path (str): Where the manifest is saved
+        force (bool): Rebuild regardless of the manifest
+        
+    Returns:
+        dict: Stage name mapped to its status, elapsed seconds and error message
+    """
+    sources = source_paths(processed_dir, search.SOURCES)
+    output_file = os.path.join(processed_dir, search.DOCUMENTS_NAME + '.csv')
+    index_file = os.path.join(processed_dir, search.INDEX_NAME)
+    
+    def build():
+        documents = search.build_documents(
+            {os.path.splitext(os.path.basename(path))[0]: read_raw(path) for path in sources}
+        )
+        index = search.SearchIndex(documents)
+        save_processed(documents, output_file, 'search_index', formats)
+        index.save(index_file)
+        return documents
+    
+    return {'search_index': build_derived('search_index', sources, output_paths(output_file, formats) + [index_file],
+                                          build, formats, manifest, manifest_path, force)}
+
+def build_spatial_index(processed_dir, formats, manifest, manifest_path, force=False):
+    """
+    Builds the table of points behind the proximity index over the
+    coordinates of the processed cultural sites and places (see
+    utils/spatial.py). The points are saved sorted by grid cell like a
+    processed dataset; the index reads the grid straight from that order.
+    
+    Args:
+        processed_dir (str): Directory holding the processed datasets
+        formats (tuple): Output formats of the points table
+        manifest (dict): Processing manifest, updated in place
+        manifest_path (str): Where the manifest is saved
+        force (bool): Rebuild regardless of the manifest
+        
+    Returns:
+        dict: Stage name mapped to its status, elapsed seconds and error message
+    """
+    sources = source_paths(processed_dir, spatial.SOURCES)
+    output_file = os.path.join(processed_dir, spatial.POINTS_NAME + '.csv')
+    
+    def build():
+        points = spatial.build_points(
+            {os.path.splitext(os.path.basename(path))[0]: read_raw(path) for path in sources}
+        )
+        save_processed(points, output_file, 'spatial_index', formats)
+        return points
+    
+    return {'spatial_index': build_derived('spatial_index', sources, output_paths(output_file, formats),
+                                           build, formats, manifest, manifest_path, force, version=2)}
+
+def process_all_datasets(formats=None, force=False, workers=None, raw_dir=None, processed_dir=None):
+    """
+    Process all datasets in the raw data directory.
+    A manifest in the processed directory records the input hash, processor
+    version and output hashes of each stage; stages whose inputs and outputs
+    are unchanged since the last run are skipped. With more than one worker
+    the stale stages run in parallel across a process pool. A failing stage
+    is reported without stopping the others. The rollup tables, the search
+    index and the spatial index are rebuilt afterwards from the processed
+    outputs.
+    
+    Args:
+        formats (iterable, optional): Output formats passed to each processor
+        force (bool): Reprocess every stage regardless of the manifest
+        workers (int, optional): Number of worker processes. Defaults to the
+            PROCESSING_WORKERS environment variable, or 1 (sequential)
+        raw_dir (str, optional): Raw data directory. Defaults to data/raw
+        processed_dir (str, optional): Output directory. Defaults to data/processed
+        
+    Returns:
+        dict: Stage name mapped to its status ('processed', 'skipped',
+            'missing' or 'failed'), elapsed seconds and error message
+    """
     # Get script directory and construct paths
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_dir = os.path.dirname(script_dir)
-    raw_dir = os.path.join(project_dir, 'data', 'raw')
-    processed_dir = os.path.join(project_dir, 'data', 'processed')
+    raw_dir = raw_dir or os.path.join(project_dir, 'data', 'raw')
+    processed_dir = processed_dir or os.path.join(project_dir, 'data', 'processed')
     
     # Ensure processed directory exists
     os.makedirs(processed_dir, exist_ok=True)
     
-    # Process tourism statistics
-    tourism_files = glob.glob(os.path.join(raw_dir, '*tourism_statistics*.csv'))
-    if tourism_files:
-        process_tourism_statistics(
-            tourism_files[0], 
-            os.path.join(processed_dir, 'tourism_statistics_processed.csv')
-        )
+    run_start = time.perf_counter()
+    start_trace()
+    formats = DEFAULT_FORMATS if formats is None else tuple(formats)
+    if workers is None:
+        workers = int(os.getenv('PROCESSING_WORKERS', '1'))
+    manifest_path = os.path.join(processed_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    results = {}
     
-    # Process cultural sites
-    sites_files = glob.glob(os.path.join(raw_dir, '*cultural_sites*.csv'))
-    if sites_files:
-        process_cultural_sites(
-            sites_files[0], 
-            os.path.join(processed_dir, 'cultural_sites_processed.csv')
-        )
+    # Decide which stages need to run
+    pending = []
+    for stage in STAGES:
+        results[stage['name']] = {'status': 'missing', 'seconds': 0.0, 'error': None}
+        if 'input' in stage:
+            input_files = [stage['input']] if os.path.exists(stage['input']) else []
+        else:
+            input_files = [path for pattern in stage['patterns']
+                           for path in glob.glob(os.path.join(raw_dir, pattern))]
+        if not input_files:
+            continue
+        
+        input_file = max(sorted(input_files), key=os.path.getmtime)
+        output_file = os.path.join(processed_dir, stage['output'])
+        # Files written next to the processed table, e.g. binary arrays
+        outputs = output_paths(output_file, formats) + [
+            os.path.join(processed_dir, name) for name in stage.get('extra_outputs', [])
+        ]
+        input_hash = file_sha256(input_file)
+        if stage.get('depends'):
+            combined = [input_hash] + [file_sha256(path) for path in stage['depends']]
+            input_hash = hashlib.sha256(''.join(combined).encode()).hexdigest()
+        
+        if not force and is_stage_current(manifest.get(stage['name']), input_hash,
+                                          stage['version'], formats, outputs):
+            print(f"Skipping {stage['name']}: input and outputs unchanged")
+            results[stage['name']]['status'] = 'skipped'
+            continue
+        
+        pending.append((stage, input_file, output_file, outputs, input_hash))
     
-    # Process art forms
-    art_files = glob.glob(os.path.join(raw_dir, '*art_forms*.csv'))
-    if art_files:
-        process_art_forms(
-            art_files[0], 
-            os.path.join(processed_dir, 'art_forms_processed.csv')
-        )
+    def record(job, elapsed, error, rows, memory_bytes):
+        stage, input_file, _, outputs, input_hash = job
+        results[stage['name']].update(seconds=elapsed, error=error, rows=rows, memory_bytes=memory_bytes,
+                                      status='failed' if error else 'processed')
+        record_span(f"processing.{stage['name']}", elapsed, rows, memory_bytes,
+                    status=results[stage['name']]['status'])
+        if error:
+            print(f"Failed to process {stage['name']}: {error}")
+            return
+        manifest[stage['name']] = manifest_entry(os.path.relpath(input_file, project_dir), input_hash,
+                                                 stage['version'], formats, outputs)
+        save_manifest(manifest, manifest_path)
     
-    # Process government funding
-    funding_files = glob.glob(os.path.join(raw_dir, '*government_funding*.csv'))
-    if funding_files:
-        process_government_funding(
-            funding_files[0], 
-            os.path.join(processed_dir, 'government_funding_processed.csv')
-        )
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            futures = {
+                pool.submit(run_stage, job[0]['processor'], job[1], job[2], formats): job
+                for job in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    elapsed, error, rows, memory_bytes = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. out of memory)
+                    elapsed, error, rows, memory_bytes = 0.0, f"{type(e).__name__}: {e}", None, None
+                record(futures[future], elapsed, error, rows, memory_bytes)
+    else:
+        for job in pending:
+            record(job, *run_stage(job[0]['processor'], job[1], job[2], formats))
+    
+    # Rollups and the indexes read the processed outputs, so they are built once every stage has finished
+    results.update(build_rollups(processed_dir, formats, manifest, manifest_path, force))
+    results.update(build_search_index(processed_dir, formats, manifest, manifest_path, force))
+    results.update(build_spatial_index(processed_dir, formats, manifest, manifest_path, force))
+    
+    wall_seconds = time.perf_counter() - run_start
+    record_span('processing.run', wall_seconds, workers=workers)
+    write_prometheus()
+    print_stage_summary(results, wall_seconds)
+    return results
 
 if __name__ == "__main__":
-    process_all_datasets()
-    print("Data processing complete!")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Process raw datasets into data/processed")
+    parser.add_argument('--force', action='store_true', help="reprocess every dataset, ignoring the manifest")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes (default: PROCESSING_WORKERS or 1)")
+    args = parser.parse_args()
+    
+    configure_logging()
+    process_all_datasets(force=args.force, workers=args.workers)
+    print("Data processing complete!")
@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+
+PAGES = [
+    "Home",
+    "Art Forms Explorer",
+    "Cultural Tourism Analysis",
+    "Government Initiatives",
+    "Responsible Tourism",
+    "Places Explorer",
+    "Itinerary Planner"
+]
+
+# Modules whose import dominates start-up time when they are pulled in
+HEAVY_MODULES = ['plotly', 'folium', 'branca', 'pyarrow']
+
+# Runs in a fresh interpreter so every measurement starts cold
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+harness_ready = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+at.session_state.page = sys.argv[2]
+at.run()
+first_render = time.perf_counter()
+at.run()
+rerun = time.perf_counter()
+print(json.dumps({
+    'harness_seconds': harness_ready - start,
+    'first_render_seconds': first_render - harness_ready,
+    'rerun_seconds': rerun - first_render,
+    'exceptions': [e.message for e in at.exception],
+    'heavy_modules': sorted(m for m in sys.argv[3].split(',') if m in sys.modules)
+}))
+"""
+
+def measure_page(app_path, page):
+    """
+    Measures the cold first render and a warm rerun of one page in a new process.
+
+    Args:
+        app_path (str): Path of the Streamlit app
+        page (str): Page to render
+
+    Returns:
+        dict: Harness import, first render and rerun seconds, exceptions and loaded heavy modules
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', _PROBE, app_path, page, ','.join(HEAVY_MODULES)],
+        capture_output=True, text=True, cwd=project_dir
+    )
+    lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"Measuring {page} failed:\n{result.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+def measure_startup(app_path=None, pages=None, repeat=3):
+    """
+    Measures cold-start and per-page first-render time of the app.
+    Every run starts a new Python process, so module imports and dataset
+    loads are paid again as they would be after a container restart.
+
+    Args:
+        app_path (str, optional): Path of the Streamlit app. Defaults to app.py in the project
+        pages (list, optional): Pages to measure. Defaults to every page
+        repeat (int): Runs per page; the median is reported
+
+    Returns:
+        dict: Page mapped to its median timings and the heavy modules it loaded
+    """
+    app_path = app_path or os.path.join(project_dir, 'app.py')
+    results = {}
+
+    for page in pages or PAGES:
+        runs = [measure_page(app_path, page) for _ in range(repeat)]
+        results[page] = {
+            key: round(statistics.median(run[key] for run in runs), 4)
+            for key in ('harness_seconds', 'first_render_seconds', 'rerun_seconds')
+        }
+        results[page]['heavy_modules'] = runs[-1]['heavy_modules']
+        results[page]['exceptions'] = runs[-1]['exceptions']
+
+    return results
+
+def print_startup_report(results):
+    """Prints a per-page timing table"""
+    print(f"  {'Page':<28}{'First render (s)':>18}{'Rerun (s)':>12}  Heavy modules loaded")
+    for page, result in results.items():
+        print(f"  {page:<28}{result['first_render_seconds']:>18.3f}{result['rerun_seconds']:>12.3f}  "
+              f"{', '.join(result['heavy_modules']) or '-'}")
+        for message in result['exceptions']:
+            print(f"    exception: {message[:200]}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start and per-page first-render time of the app")
+    parser.add_argument('--app', default=None, help="path of the Streamlit app (default: app.py)")
+    parser.add_argument('--pages', nargs='*', default=None, help="pages to measure (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per page; the median is reported")
+    parser.add_argument('--json', default=None, help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = measure_startup(args.app, args.pages, args.repeat)
+    print_startup_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=4)
@@ -0,0 +1,256 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Add parent directory to path to import utils
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from utils import geography
+
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+
+# Peak months and (off-season, peak) monthly visitor ranges per region
+SEASONS = {
+    "North India": (["October", "November", "December", "January", "February"], (300000, 700000), (800000, 1200000)),
+    "South India": (["December", "January", "February", "March"], (400000, 800000), (900000, 1300000)),
+    "East India": (["October", "November", "December", "January"], (200000, 500000), (600000, 900000)),
+    "West India": (["November", "December", "January", "February"], (300000, 600000), (700000, 1100000)),
+    "Central India": (["October", "November", "February", "March"], (150000, 400000), (500000, 800000)),
+    "Northeast India": (["March", "April", "October", "November"], (100000, 250000), (300000, 600000))
+}
+
+ART_TYPES = ["Dance", "Painting", "Textile Art", "Embroidery", "Textile", "Music", "Theatre", "Craft"]
+MINISTRIES = ["Culture", "Tourism", "Textiles"]
+FIRST_YEAR = 2010
+YEARS = 13
+FUNDING_FIRST_YEAR = 2015
+FUNDING_YEARS = 8
+
+# Each table draws from its own stream, so the rows of one table do not
+# depend on the sizes requested for the others
+TABLE_STREAMS = {
+    'tourism_statistics': 0,
+    'cultural_sites': 1,
+    'art_forms': 2,
+    'government_funding': 3,
+    'seasonal_tourism': 4
+}
+
+def table_rng(table, seed):
+    """Returns the random generator of one table for a seed"""
+    return np.random.default_rng([seed, TABLE_STREAMS[table]])
+
+def _states():
+    """State names, regions and centroids as arrays"""
+    states = pd.DataFrame(geography.STATES, columns=['State', 'Region', 'Latitude', 'Longitude'])
+    return (states['State'].to_numpy(dtype=object), states['Region'].to_numpy(dtype=object),
+            states['Latitude'].to_numpy(), states['Longitude'].to_numpy())
+
+def generate_tourism_statistics(rows, seed=42):
+    """
+    Generates yearly visitor and revenue figures as a district-by-year panel.
+    Districts are spread over the known states and their visitors grow about
+    6% a year from a district-specific base.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        pandas.DataFrame: Year, State, District_ID, Domestic_Visitors,
+            International_Visitors, Revenue_Crores
+    """
+    rng = table_rng('tourism_statistics', seed)
+    names, _, _, _ = _states()
+    index = np.arange(rows)
+    district = index // YEARS
+    years = FIRST_YEAR + index % YEARS
+
+    district_base = rng.lognormal(mean=13.5, sigma=0.8, size=district[-1] + 1 if rows else 0)
+    growth = 1.06 ** (years - FIRST_YEAR)
+    domestic = district_base[district] * growth * rng.normal(1.0, 0.05, rows)
+    international = domestic * rng.uniform(0.05, 0.15, rows)
+    # Average spend of roughly ₹10,000 per visitor, in crores
+    revenue = (domestic + international) * rng.uniform(8000, 12000, rows) / 1e7
+
+    return pd.DataFrame({
+        'Year': years.astype(np.int32),
+        'State': names[district % len(names)],
+        'District_ID': district.astype(np.int32),
+        'Domestic_Visitors': domestic.round().astype(np.int64),
+        'International_Visitors': international.round().astype(np.int64),
+        'Revenue_Crores': revenue.round(2)
+    })
+
+def generate_cultural_sites(rows, seed=42):
+    """
+    Generates cultural sites placed around the centroid of a known state.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        pandas.DataFrame: Columns of the cultural sites mock dataset
+    """
+    rng = table_rng('cultural_sites', seed)
+    names, _, lats, lons = _states()
+    state_idx = rng.integers(0, len(names), rows)
+
+    return pd.DataFrame({
+        'Site_Name': pd.Series(names[state_idx], dtype=str) + ' Heritage Site ' + pd.Series(np.arange(1, rows + 1)).astype(str),
+        'State': names[state_idx],
+        'Visitors_2022': rng.lognormal(mean=13.8, sigma=0.9, size=rows).round().astype(np.int64),
+        'Latitude': (lats[state_idx] + rng.normal(0, 0.8, rows)).round(4),
+        'Longitude': (lons[state_idx] + rng.normal(0, 0.8, rows)).round(4),
+        'UNESCO_Heritage': rng.random(rows) < 0.1
+    })
+
+def generate_art_forms(rows, seed=42):
+    """
+    Generates art forms attributed to a state or, for one in ten, a whole region,
+    as in the mock dataset.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        pandas.DataFrame: Columns of the art forms mock dataset
+    """
+    rng = table_rng('art_forms', seed)
+    names, regions, _, _ = _states()
+    state_idx = rng.integers(0, len(names), rows)
+    locations = np.where(rng.random(rows) < 0.1, regions[state_idx], names[state_idx])
+    types = np.array(ART_TYPES, dtype=object)[rng.integers(0, len(ART_TYPES), rows)]
+
+    return pd.DataFrame({
+        'Art_Form': (pd.Series(types, dtype=str) + ' of ' + pd.Series(locations, dtype=str) + ' #'
+                     + pd.Series(np.arange(1, rows + 1)).astype(str)),
+        'Type': types,
+        'Region': locations,
+        'Practitioners_Estimate': rng.lognormal(mean=8.8, sigma=0.7, size=rows).round().astype(np.int64),
+        'Govt_Recognition': np.array(['State', 'National', 'International'], dtype=object)[
+            rng.choice(3, size=rows, p=[0.4, 0.5, 0.1])],
+        'Tourism_Potential': np.array(['Low', 'Medium', 'High'], dtype=object)[
+            rng.choice(3, size=rows, p=[0.2, 0.45, 0.35])]
+    })
+
+def generate_government_funding(rows, seed=42):
+    """
+    Generates budget allocations as a ministry-by-year panel over eight years.
+    Ministries beyond the three in the mock dataset are numbered departments.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        pandas.DataFrame: Year, Ministry, Budget_Allocation_Crores, Utilization_Percentage
+    """
+    rng = table_rng('government_funding', seed)
+    num_ministries = -(-rows // FUNDING_YEARS)
+    ministries = np.array(
+        MINISTRIES + [f"Department {i:06d}" for i in range(1, num_ministries - len(MINISTRIES) + 1)],
+        dtype=object
+    )[:num_ministries]
+    index = np.arange(rows)
+    ministry_idx = index // FUNDING_YEARS
+    years = FUNDING_FIRST_YEAR + index % FUNDING_YEARS
+
+    base = rng.uniform(1500, 5000, num_ministries)
+    budget = base[ministry_idx] * 1.04 ** (years - FUNDING_FIRST_YEAR) * rng.normal(1.0, 0.05, rows)
+
+    return pd.DataFrame({
+        'Year': years.astype(np.int32),
+        'Ministry': ministries[ministry_idx],
+        'Budget_Allocation_Crores': budget.round(-1),
+        'Utilization_Percentage': rng.integers(80, 98, rows)
+    })
+
+def generate_seasonal_tourism(rows, seed=42):
+    """
+    Generates monthly visitors as a destination-by-year-by-region-by-month
+    panel, with higher visitor ranges in each region's peak months.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        pandas.DataFrame: Year, Month, Region, Destination_ID, Visitors, Peak_Season
+    """
+    rng = table_rng('seasonal_tourism', seed)
+    regions = list(SEASONS)
+    index = np.arange(rows)
+    month_idx = index % len(MONTHS)
+    region_idx = (index // len(MONTHS)) % len(regions)
+    years = FIRST_YEAR + (index // (len(MONTHS) * len(regions))) % YEARS
+    destination = index // (len(MONTHS) * len(regions) * YEARS)
+
+    # Region-by-month lookup tables of the peak flag and visitor range
+    peak = np.array([[month in SEASONS[region][0] for month in MONTHS] for region in regions])
+    low = np.array([[SEASONS[region][2 if p else 1][0] for p in row] for region, row in zip(regions, peak)])
+    high = np.array([[SEASONS[region][2 if p else 1][1] for p in row] for region, row in zip(regions, peak)])
+    is_peak = peak[region_idx, month_idx]
+
+    return pd.DataFrame({
+        'Year': years.astype(np.int32),
+        'Month': np.array(MONTHS, dtype=object)[month_idx],
+        'Region': np.array(regions, dtype=object)[region_idx],
+        'Destination_ID': destination.astype(np.int32),
+        'Visitors': rng.integers(low[region_idx, month_idx], high[region_idx, month_idx]),
+        'Peak_Season': np.where(is_peak, 'Yes', 'No')
+    })
+
+GENERATORS = {
+    'tourism_statistics': generate_tourism_statistics,
+    'cultural_sites': generate_cultural_sites,
+    'art_forms': generate_art_forms,
+    'government_funding': generate_government_funding,
+    'seasonal_tourism': generate_seasonal_tourism
+}
+
+def generate_datasets(rows, seed=42, tables=None):
+    """
+    Generates referentially consistent synthetic datasets.
+    States and regions come from utils/geography.py, so every generated
+    site and art form resolves to the dimension tables of the pipeline.
+
+    Args:
+        rows (int or dict): Rows per table, or table name mapped to its row count
+        seed (int): Random seed; the same seed and sizes give identical data
+        tables (list, optional): Tables to generate. Defaults to all of GENERATORS
+
+    Returns:
+        dict: Table name mapped to its DataFrame
+    """
+    tables = tables or list(GENERATORS)
+    sizes = rows if isinstance(rows, dict) else {table: rows for table in tables}
+    return {table: GENERATORS[table](sizes[table], seed) for table in tables}
+
+def write_datasets(raw_dir, rows, seed=42, tables=None, suffix='synthetic'):
+    """
+    Generates synthetic datasets and writes them as raw CSV files.
+
+    Args:
+        raw_dir (str): Output directory
+        rows (int or dict): Rows per table, see generate_datasets
+        seed (int): Random seed
+        tables (list, optional): Tables to generate
+        suffix (str): File name suffix, e.g. 'mock' for tourism_statistics_mock.csv
+
+    Returns:
+        dict: Table name mapped to the path written
+    """
+    os.makedirs(raw_dir, exist_ok=True)
+    paths = {}
+    for table, df in generate_datasets(rows, seed, tables).items():
+        paths[table] = os.path.join(raw_dir, f"{table}_{suffix}.csv")
+        df.to_csv(paths[table], index=False)
+    return paths
@@ -1,6 +1,8 @@
 import pandas as pd
 import os
 import sys
+import time
+import argparse
 
 # Add parent directory to path to import utils
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,9 +10,20 @@ project_dir = os.path.dirname(script_dir)
 sys.path.append(project_dir)
 
 from utils.snowflake_conn import upload_dataframe_to_snowflake
+from utils.bulk_load import bulk_upload, connect_local
+from utils.metrics import span, configure_logging, write_prometheus
 
-def upload_all_processed_data():
-    """Upload all processed datasets to Snowflake"""
+def upload_all_processed_data(backend='snowflake', database=':memory:', method='copy', batch_size=None):
+    """
+    Upload all processed datasets to Snowflake, or to a local SQLite/DuckDB
+    database for offline throughput testing.
+    
+    Args:
+        backend (str): 'snowflake', 'sqlite' or 'duckdb'
+        database (str): Database file for local backends
+        method (str): 'copy' for Parquet bulk loading or 'insert' for chunked INSERTs
+        batch_size (int, optional): Rows per chunk
+    """
     # Get paths
     processed_dir = os.path.join(project_dir, 'data', 'processed')
     
@@ -19,18 +32,46 @@ def upload_all_processed_data():
         {'file': 'tourism_statistics_processed.csv', 'table': 'TOURISM_STATISTICS'},
         {'file': 'cultural_sites_processed.csv', 'table': 'CULTURAL_SITES'},
         {'file': 'art_forms_processed.csv', 'table': 'ART_FORMS'},
-        {'file': 'government_funding_processed.csv', 'table': 'GOVERNMENT_FUNDING'}
+        {'file': 'government_funding_processed.csv', 'table': 'GOVERNMENT_FUNDING'},
+        {'file': 'seasonal_tourism_processed.csv', 'table': 'SEASONAL_TOURISM'}
     ]
     
-    for dataset in datasets:
-        file_path = os.path.join(processed_dir, dataset['file'])
-        if os.path.exists(file_path):
-            print(f"Uploading {dataset['file']} to Snowflake table {dataset['table']}...")
-            df = pd.read_csv(file_path)
-            upload_dataframe_to_snowflake(df, dataset['table'])
-        else:
-            print(f"File not found: {file_path}")
+    local_conn = None
+    if backend != 'snowflake':
+        local_conn, local_backend = connect_local(backend, database)
+    
+    try:
+        for dataset in datasets:
+            file_path = os.path.join(processed_dir, dataset['file'])
+            if os.path.exists(file_path):
+                print(f"Uploading {dataset['file']} to {backend} table {dataset['table']}...")
+                with span(f"upload.read.{dataset['table']}") as read_span:
+                    df = pd.read_csv(file_path)
+                    read_span.record_frame(df)
+                start = time.perf_counter()
+                with span(f"upload.{dataset['table']}", df=df, backend=backend, method=method):
+                    if local_conn is None:
+                        upload_dataframe_to_snowflake(df, dataset['table'], method=method, batch_size=batch_size)
+                    else:
+                        bulk_upload(local_conn, df, dataset['table'], local_backend,
+                                    method=method, batch_size=batch_size)
+                elapsed = time.perf_counter() - start
+                print(f"Loaded {len(df)} rows in {elapsed:.3f}s ({len(df) / max(elapsed, 1e-9):,.0f} rows/s)")
+            else:
+                print(f"File not found: {file_path}")
+    finally:
+        if local_conn is not None:
+            local_conn.close()
+        write_prometheus()
 
 if __name__ == "__main__":
-    upload_all_processed_data()
-    print("Data upload to Snowflake complete!")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Upload processed datasets to Snowflake or a local database")
+    parser.add_argument('--backend', choices=['snowflake', 'sqlite', 'duckdb'], default='snowflake')
+    parser.add_argument('--database', default=':memory:', help="database file for local backends")
+    parser.add_argument('--method', choices=['copy', 'insert'], default='copy')
+    parser.add_argument('--batch-size', type=int, default=None)
+    args = parser.parse_args()
+    
+    configure_logging()
+    upload_all_processed_data(args.backend, args.database, args.method, args.batch_size)
+    print(f"Data upload to {args.backend} complete!")
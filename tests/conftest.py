@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Make the project's packages importable, as the scripts do
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
@@ -0,0 +1,68 @@
+import pytest
+
+from utils.connection_pool import ConnectionPool
+
+
+class OperationalError(Exception):
+    pass
+
+
+class ProgrammingError(Exception):
+    pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.healthy = True
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool():
+    return ConnectionPool(FakeConnection, health_check=lambda conn: conn.healthy)
+
+
+def test_query_error_keeps_connection():
+    pool = make_pool()
+    with pytest.raises(ProgrammingError):
+        with pool.connection():
+            raise ProgrammingError("syntax error")
+    with pool.connection():
+        pass
+    assert pool.metrics()['created'] == 1
+    assert pool.metrics()['reused'] == 1
+
+
+def test_early_generator_close_keeps_connection():
+    pool = make_pool()
+
+    def batches():
+        with pool.connection():
+            yield 1
+            yield 2
+
+    reader = batches()
+    next(reader)
+    reader.close()
+    assert pool.metrics()['idle'] == 1
+
+
+def test_connection_error_discards_connection():
+    pool = make_pool()
+    with pytest.raises(OperationalError):
+        with pool.connection() as conn:
+            raise OperationalError("connection reset")
+    assert conn.closed
+    assert pool.metrics()['open'] == 0
+
+
+def test_failed_health_check_after_error_discards_connection():
+    pool = make_pool()
+    with pytest.raises(ProgrammingError):
+        with pool.connection() as conn:
+            conn.healthy = False
+            raise ProgrammingError("session expired")
+    assert conn.closed
+    assert pool.metrics()['health_check_failures'] == 1
@@ -0,0 +1,38 @@
+import os
+
+import pandas as pd
+
+from utils.query_cache import QueryCache
+
+
+def test_invalidate_tables(tmp_path):
+    cache = QueryCache(directory=str(tmp_path))
+    df = pd.DataFrame({'x': [1, 2, 3]})
+    cache.put("SELECT * FROM a, b", None, df, ttl=60, tables=['a', 'db.s.b'])
+    cache.put("SELECT * FROM c", None, df, ttl=60, tables=['c'])
+    cache.put("SELECT * FROM TABLE(f())", None, df, ttl=60)
+
+    # Each entry is counted once, although it is removed from memory and disk
+    assert cache.invalidate_tables(['B']) == 2
+    assert cache.get("SELECT * FROM a, b") is None
+    assert cache.get("SELECT * FROM TABLE(f())") is None
+    assert cache.get("SELECT * FROM c") is not None
+
+
+def test_quoted_table_names_keep_their_case():
+    cache = QueryCache()
+    df = pd.DataFrame({'x': [1]})
+    cache.put('SELECT * FROM "Mixed Case"', None, df, ttl=60, tables=['"Mixed Case"'])
+
+    assert cache.invalidate_tables(['MIXED CASE']) == 0
+    assert cache.invalidate_tables(['"Mixed Case"']) == 1
+
+
+def test_disk_tier_leaves_no_temporary_files(tmp_path):
+    cache = QueryCache(directory=str(tmp_path))
+    df = pd.DataFrame({'x': [1, 2, 3]})
+    cache.put("SELECT * FROM a", None, df, ttl=60)
+
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    fresh = QueryCache(directory=str(tmp_path))
+    pd.testing.assert_frame_equal(fresh.get("SELECT * FROM a"), df)
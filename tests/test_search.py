@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.search import SOURCES, SearchIndex, build_documents, edit_distances
+
+PROCESSED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'processed')
+
+
+@pytest.fixture(scope='module')
+def index():
+    datasets = {source['dataset']: pd.read_csv(os.path.join(PROCESSED_DIR, f"{source['dataset']}.csv"))
+                for source in SOURCES.values()}
+    return SearchIndex(build_documents(datasets))
+
+
+def test_edit_distances():
+    # A swap of adjacent letters is one edit
+    assert edit_distances('frot', np.array(['fort', 'front', 'fo', 'frot'])).tolist() == [1, 1, 2, 0]
+    assert edit_distances('kathakli', np.array(['kathakali', 'kathak'])).tolist() == [1, 2]
+
+
+@pytest.mark.parametrize("query, title", [
+    ("red frot", "Red Fort"),
+    ("red fotr", "Red Fort"),
+    ("qutab minar", "Qutub Minar"),
+    ("ellora caevs", "Ellora Caves"),
+    ("taj mhal", "Taj Mahal"),
+])
+def test_typos_find_the_entry(index, query, title):
+    results = index.search(query, limit=5)
+    assert len(results) > 0
+    assert results['Title'].iloc[0] == title
+
+
+def test_closer_words_rank_first(index):
+    titles = index.search("kathakli", limit=5)['Title'].tolist()
+    assert titles.index("Kathakali") < titles.index("Kathak")
+
+
+def test_fuzzy_matches_are_bounded(index):
+    # Three edits away from "fort"; short words allow a single edit
+    assert len(index.search("xyzt", limit=5)) == 0
+
+
+def test_exact_and_prefix_matches(index):
+    assert index.search("red fort", limit=1)['Title'].iloc[0] == "Red Fort"
+    titles = index.search("kathak", limit=5)['Title'].tolist()
+    assert titles[0] == "Kathak" and "Kathakali" in titles
@@ -0,0 +1,227 @@
+import os
+import sqlite3
+import tempfile
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Rows per Parquet file (COPY path) or per executemany call (INSERT path)
+DEFAULT_BATCH_SIZE = int(os.getenv('UPLOAD_BATCH_SIZE', '100000'))
+
+
+def sql_column_type(dtype):
+    """Maps a pandas dtype to the SQL column type used when creating tables."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return "BOOLEAN"
+    elif pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    elif pd.api.types.is_float_dtype(dtype):
+        return "FLOAT"
+    return "VARCHAR(255)"
+
+
+def quote_columns(columns):
+    """Returns a comma-separated list of double-quoted column names."""
+    return ", ".join(f'"{col}"' for col in columns)
+
+
+def create_table_query(df, table_name):
+    """Builds a CREATE TABLE IF NOT EXISTS statement matching a DataFrame."""
+    columns = [f'"{col}" {sql_column_type(dtype)}' for col, dtype in df.dtypes.items()]
+    return f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(columns)})"
+
+
+def iter_chunks(df, batch_size):
+    """Yields consecutive row slices of at most `batch_size` rows."""
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size]
+
+
+def chunk_rows(chunk):
+    """Converts a DataFrame slice to plain Python tuples with NaN as None."""
+    values = chunk.astype(object).where(chunk.notna(), None)
+    return list(values.itertuples(index=False, name=None))
+
+
+def insert_chunks(cursor, df, table_name, batch_size, placeholder='%s'):
+    """
+    Inserts a DataFrame with one parameterised executemany call per chunk.
+
+    Args:
+        cursor: DB-API cursor
+        df (pandas.DataFrame): Data to insert
+        table_name (str): Target table
+        batch_size (int): Rows per executemany call
+        placeholder (str): Parameter marker of the driver ('%s' or '?')
+
+    Returns:
+        int: Number of rows inserted
+    """
+    markers = ", ".join([placeholder] * len(df.columns))
+    insert_query = f"INSERT INTO {table_name} ({quote_columns(df.columns)}) VALUES ({markers})"
+    rows = 0
+    for chunk in iter_chunks(df, batch_size):
+        cursor.executemany(insert_query, chunk_rows(chunk))
+        rows += len(chunk)
+    return rows
+
+
+def write_parquet_chunks(df, directory, batch_size, compression='snappy'):
+    """
+    Writes a DataFrame as a series of compressed Parquet files.
+
+    Args:
+        df (pandas.DataFrame): Data to write
+        directory (str): Output directory
+        batch_size (int): Rows per file
+        compression (str): Parquet compression codec
+
+    Returns:
+        list: Paths of the files written
+    """
+    paths = []
+    for i, chunk in enumerate(iter_chunks(df, batch_size)):
+        path = os.path.join(directory, f"chunk_{i:05d}.parquet")
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        pq.write_table(table, path, compression=compression)
+        paths.append(path)
+    return paths
+
+
+class SnowflakeBackend:
+    """Stages Parquet chunks in the table stage and loads them with COPY INTO."""
+
+    name = 'snowflake'
+    placeholder = '%s'
+    supports_copy = True
+
+    def copy_files(self, cursor, table_name, columns, paths):
+        # Each upload gets its own stage prefix, so files left by another
+        # upload (or a failed one) are never picked up by this COPY
+        prefix = f"@%{table_name}/{uuid.uuid4().hex}"
+        try:
+            for path in paths:
+                file_url = 'file://' + os.path.abspath(path).replace('\\', '/')
+                cursor.execute(f"PUT '{file_url}' {prefix}/ AUTO_COMPRESS=FALSE OVERWRITE=TRUE")
+            files = ", ".join(f"'{os.path.basename(path)}'" for path in paths)
+            # A single COPY statement loads every staged file or none of them
+            cursor.execute(
+                f"COPY INTO {table_name} FROM {prefix}/ FILES=({files}) "
+                f"FILE_FORMAT=(TYPE=PARQUET) MATCH_BY_COLUMN_NAME=CASE_SENSITIVE PURGE=TRUE"
+            )
+        finally:
+            # PURGE only removes files that loaded; clear whatever is left.
+            # A failed cleanup must not hide the COPY's outcome or its error
+            try:
+                cursor.execute(f"REMOVE {prefix}/")
+            except Exception as e:
+                print(f"Could not remove staged files under {prefix}: {e}")
+
+
+class DuckDBBackend:
+    """Local DuckDB backend that reads the Parquet chunks directly."""
+
+    name = 'duckdb'
+    placeholder = '?'
+    supports_copy = True
+
+    def connect(self, database=':memory:'):
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("The duckdb backend requires the duckdb package (pip install duckdb)")
+        return duckdb.connect(database)
+
+    def copy_files(self, cursor, table_name, columns, paths):
+        files = ", ".join("'" + path.replace("'", "''") + "'" for path in paths)
+        column_list = quote_columns(columns)
+        cursor.execute(
+            f"INSERT INTO {table_name} ({column_list}) SELECT {column_list} FROM read_parquet([{files}])"
+        )
+
+
+class SQLiteBackend:
+    """Local SQLite backend. SQLite cannot read Parquet, so it always uses chunked INSERTs."""
+
+    name = 'sqlite'
+    placeholder = '?'
+    supports_copy = False
+
+    def connect(self, database=':memory:'):
+        return sqlite3.connect(database)
+
+
+BACKENDS = {
+    'snowflake': SnowflakeBackend(),
+    'duckdb': DuckDBBackend(),
+    'sqlite': SQLiteBackend(),
+}
+
+
+def connect_local(backend='sqlite', database=':memory:'):
+    """
+    Opens a connection to a local backend for offline loading and benchmarks.
+
+    Args:
+        backend (str): 'sqlite' or 'duckdb'
+        database (str): Database file path, or ':memory:'
+
+    Returns:
+        tuple: (connection, backend object)
+    """
+    if backend not in ('sqlite', 'duckdb'):
+        raise ValueError(f"Unknown local backend: {backend}")
+    backend_obj = BACKENDS[backend]
+    return backend_obj.connect(database), backend_obj
+
+
+def bulk_upload(conn, df, table_name, backend, create_table=True, method='copy', batch_size=None):
+    """
+    Loads a DataFrame into a table in bounded-size chunks.
+
+    With method='copy' the data is written to compressed Parquet chunks that
+    the backend loads in bulk; if the load itself fails, or the backend
+    cannot read Parquet, the rows are sent with chunked INSERTs instead.
+
+    Args:
+        conn: Open DB-API connection for the backend
+        df (pandas.DataFrame): Data to upload
+        table_name (str): Target table
+        backend: One of the BACKENDS objects
+        create_table (bool): Whether to create the table if it doesn't exist
+        method (str): 'copy' or 'insert'
+        batch_size (int, optional): Rows per chunk. Defaults to DEFAULT_BATCH_SIZE
+
+    Returns:
+        int: Number of rows loaded
+    """
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    cursor = conn.cursor()
+    try:
+        if create_table:
+            cursor.execute(create_table_query(df, table_name))
+
+        if len(df) == 0:
+            return 0
+
+        if method == 'copy' and backend.supports_copy:
+            copied = False
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                try:
+                    paths = write_parquet_chunks(df, tmp_dir, batch_size)
+                    backend.copy_files(cursor, table_name, list(df.columns), paths)
+                    copied = True
+                except Exception as e:
+                    print(f"Bulk load into {table_name} failed ({e}); falling back to chunked INSERT")
+            # Only a COPY that did not load anything falls back, so rows are never loaded twice
+            if copied:
+                conn.commit()
+                return len(df)
+
+        rows = insert_chunks(cursor, df, table_name, batch_size, backend.placeholder)
+        conn.commit()
+        return rows
+    finally:
+        cursor.close()
@@ -0,0 +1,230 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# DB-API exception classes that mean the connection itself is unusable
+CONNECTION_ERROR_NAMES = ('OperationalError', 'InterfaceError')
+
+
+def is_connection_error(error):
+    """Returns True if an exception is a driver's OperationalError or InterfaceError."""
+    return any(cls.__name__ in CONNECTION_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of reusable database connections.
+
+    Connections are created lazily by `factory` up to `max_size`. Idle
+    connections older than `idle_timeout` seconds are closed instead of being
+    handed out, and connections that sat idle for more than
+    `health_check_interval` seconds are checked with `health_check` before
+    being reused. Borrowers wait up to `wait_timeout` seconds when every
+    connection is in use. Once close_all() has run, connections still
+    borrowed are closed as they are released.
+    """
+
+    def __init__(self, factory, max_size=4, idle_timeout=300, health_check=None,
+                 health_check_interval=30, wait_timeout=30):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check
+        self.health_check_interval = health_check_interval
+        self.wait_timeout = wait_timeout
+
+        self._idle = deque()
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.created = 0
+        self.reused = 0
+        self.borrows = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.expired = 0
+        self.health_check_failures = 0
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn):
+        if self.health_check is None:
+            return True
+        try:
+            return bool(self.health_check(conn))
+        except Exception:
+            return False
+
+    def acquire(self):
+        """
+        Borrows a connection from the pool, creating one if needed.
+
+        Returns:
+            A live connection. Return it with release() when done.
+
+        Raises:
+            TimeoutError: If no connection became free within wait_timeout
+            ConnectionError: If the factory could not open a connection
+            RuntimeError: If the pool was closed with close_all()
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            conn = None
+            last_used = None
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                elif self._total < self.max_size:
+                    # Reserve a slot, then connect outside the lock
+                    self._total += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No connection available after {self.wait_timeout}s")
+                    self.waits += 1
+                    wait_start = time.monotonic()
+                    self._cond.wait(remaining)
+                    self.wait_seconds += time.monotonic() - wait_start
+                    continue
+
+            if conn is not None:
+                idle_for = time.monotonic() - last_used
+                if idle_for > self.idle_timeout:
+                    self._discard(conn)
+                    with self._cond:
+                        self.expired += 1
+                    continue
+                if idle_for > self.health_check_interval and not self._is_healthy(conn):
+                    self._discard(conn)
+                    with self._cond:
+                        self.health_check_failures += 1
+                    continue
+                with self._cond:
+                    self.reused += 1
+                    self.borrows += 1
+                return conn
+
+            try:
+                conn = self.factory()
+            except Exception:
+                conn = None
+            if conn is None:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                raise ConnectionError("Could not open a new connection")
+            with self._cond:
+                self.created += 1
+                self.borrows += 1
+            return conn
+
+    def _discard(self, conn):
+        self._close(conn)
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def release(self, conn, discard=False):
+        """
+        Returns a borrowed connection to the pool.
+
+        Args:
+            conn: Connection obtained from acquire()
+            discard (bool): Close the connection instead of keeping it
+        """
+        with self._cond:
+            if not discard and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+                return
+        self._discard(conn)
+
+    def _is_broken(self, conn, error):
+        """Decides whether a connection whose block raised `error` must be discarded"""
+        if is_connection_error(error):
+            return True
+        if not isinstance(error, Exception):
+            # GeneratorExit from a caller that stopped reading early, and the like
+            return False
+        # Other errors (e.g. bad SQL) usually leave the connection usable
+        if self._is_healthy(conn):
+            return False
+        with self._cond:
+            self.health_check_failures += 1
+        return True
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that borrows a connection and returns it. A
+        connection whose block raised a driver connection error
+        (OperationalError / InterfaceError), or that fails its health check
+        after any other error, is closed instead of being reused; an
+        ordinary query error or an early GeneratorExit keeps it pooled.
+
+        Usage:
+            with pool.connection() as conn:
+                conn.cursor().execute(...)
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException as e:
+            self.release(conn, discard=self._is_broken(conn, e))
+            raise
+        self.release(conn)
+
+    def prune(self):
+        """Closes idle connections that exceeded the idle timeout."""
+        now = time.monotonic()
+        with self._cond:
+            stale = [item for item in self._idle if now - item[1] > self.idle_timeout]
+            for item in stale:
+                self._idle.remove(item)
+            self._total -= len(stale)
+            self.expired += len(stale)
+        for conn, _ in stale:
+            self._close(conn)
+
+    def close_all(self):
+        """Closes every idle connection and the pool; borrowed connections are closed when released."""
+        with self._cond:
+            self._closed = True
+            # Waiting borrowers find the pool closed instead of timing out
+            self._cond.notify_all()
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+        for conn, _ in idle:
+            self._close(conn)
+
+    def metrics(self):
+        """
+        Returns pool counters as a dictionary.
+
+        Returns:
+            dict: Creations, reuses, waits, expirations and current pool usage
+        """
+        with self._cond:
+            return {
+                'max_size': self.max_size,
+                'open': self._total,
+                'idle': len(self._idle),
+                'in_use': self._total - len(self._idle),
+                'created': self.created,
+                'reused': self.reused,
+                'borrows': self.borrows,
+                'reuse_rate': round(self.reused / self.borrows, 4) if self.borrows else 0.0,
+                'waits': self.waits,
+                'wait_seconds': round(self.wait_seconds, 4),
+                'expired': self.expired,
+                'health_check_failures': self.health_check_failures,
+            }
@@ -0,0 +1,257 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Default memory budget for cached datasets, overridable from the environment
+DEFAULT_MAX_MB = float(os.getenv('DATASET_CACHE_MAX_MB', '256'))
+
+
+def _frame_nbytes(df):
+    """Returns the deep in-memory size of a DataFrame, or of an array container with `nbytes`, in bytes."""
+    if not isinstance(df, pd.DataFrame) and hasattr(df, 'nbytes'):
+        return int(df.nbytes)
+    try:
+        return int(df.memory_usage(deep=True).sum())
+    except Exception:
+        return 0
+
+
+class DatasetCache:
+    """
+    Process-wide LRU cache for datasets loaded from disk.
+
+    Entries are keyed on the absolute file path together with the file's
+    modification time and size, so a reprocessed file is picked up on the
+    next read without any explicit invalidation. Cached frames are shared
+    between all Streamlit sessions and must be treated as read-only.
+    """
+
+    def __init__(self, max_mb=DEFAULT_MAX_MB):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _file_key(path, loader_name):
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, loader_name)
+
+    def get(self, path, loader=pd.read_csv, **kwargs):
+        """
+        Returns the dataset at `path`, loading it with `loader` on a miss.
+
+        Args:
+            path (str): Path of the file to load
+            loader (callable): Function taking the path and returning a DataFrame
+            **kwargs: Extra keyword arguments passed to the loader
+
+        Returns:
+            pandas.DataFrame: The cached or freshly loaded dataset
+        """
+        loader_name = getattr(loader, '__name__', repr(loader))
+        if kwargs:
+            loader_name = f"{loader_name}:{sorted(kwargs.items())!r}"
+        key = self._file_key(path, loader_name)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        # Load outside the lock so one slow file does not block other readers
+        df = loader(path, **kwargs)
+        size = _frame_nbytes(df)
+
+        with self._lock:
+            # Drop stale versions of the same file before storing the new one
+            for old_key in [k for k in self._entries if k[0] == key[0] and k[3] == key[3]]:
+                self._remove(old_key)
+            if size <= self.max_bytes:
+                self._entries[key] = (df, size)
+                self.current_bytes += size
+                self._evict()
+        return df
+
+    def _remove(self, key):
+        _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def resize(self, max_mb):
+        """Changes the memory budget, evicting entries if needed."""
+        with self._lock:
+            self.max_bytes = int(max_mb * 1024 * 1024)
+            self._evict()
+
+    def clear(self):
+        """Removes every cached dataset. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """
+        Returns cache counters as a dictionary.
+
+        Returns:
+            dict: Hits, misses, evictions, entry count and memory usage
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def to_prometheus(self, prefix='dataset_cache'):
+        """
+        Renders the cache counters in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Metrics text ready to be served or written to a file
+        """
+        s = self.stats()
+        lines = [
+            f"# TYPE {prefix}_hits_total counter",
+            f"{prefix}_hits_total {s['hits']}",
+            f"# TYPE {prefix}_misses_total counter",
+            f"{prefix}_misses_total {s['misses']}",
+            f"# TYPE {prefix}_evictions_total counter",
+            f"{prefix}_evictions_total {s['evictions']}",
+            f"# TYPE {prefix}_entries gauge",
+            f"{prefix}_entries {s['entries']}",
+            f"# TYPE {prefix}_bytes gauge",
+            f"{prefix}_bytes {s['bytes']}",
+            f"# TYPE {prefix}_max_bytes gauge",
+            f"{prefix}_max_bytes {s['max_bytes']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# Single cache instance shared by every session in this process
+_dataset_cache = DatasetCache()
+
+
+def get_dataset_cache():
+    """Returns the process-wide dataset cache."""
+    return _dataset_cache
+
+
+def cached_read_csv(path, **kwargs):
+    """
+    Reads a CSV file through the process-wide dataset cache.
+
+    Args:
+        path (str): Path of the CSV file
+        **kwargs: Extra keyword arguments passed to pandas.read_csv
+
+    Returns:
+        pandas.DataFrame: The dataset (shared, do not modify in place)
+    """
+    return _dataset_cache.get(path, pd.read_csv, **kwargs)
+
+
+def read_parquet_mmap(path, columns=None):
+    """
+    Reads a Parquet file through a memory map.
+
+    The file is mapped rather than copied into a read buffer, and the Arrow
+    buffers are released column by column while converting to pandas, so
+    peak memory stays close to the size of the resulting frame.
+
+    Args:
+        path (str): Path of the Parquet file
+        columns (list, optional): Subset of columns to read
+
+    Returns:
+        pandas.DataFrame: The dataset
+    """
+    # Imported here so that processes which only read CSV never load Arrow
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def cached_read_parquet(path, columns=None):
+    """
+    Reads a Parquet file through the process-wide dataset cache.
+
+    Args:
+        path (str): Path of the Parquet file
+        columns (list, optional): Subset of columns to read
+
+    Returns:
+        pandas.DataFrame: The dataset (shared, do not modify in place)
+    """
+    if columns is None:
+        return _dataset_cache.get(path, read_parquet_mmap)
+    return _dataset_cache.get(path, read_parquet_mmap, columns=list(columns))
+
+
+def processed_file(data_dir, name):
+    """
+    Returns the file a processed dataset is read from: its Parquet file if
+    present, otherwise its CSV, or None if neither exists.
+    """
+    for ext in ('parquet', 'csv'):
+        path = os.path.join(data_dir, f"{name}.{ext}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def file_version(path):
+    """
+    Returns a version token for a file that changes whenever the file is rewritten.
+
+    Args:
+        path (str): File path, or None
+
+    Returns:
+        str: Token built from the modification time and size, or None
+    """
+    if path is None or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def cached_read_processed(data_dir, name):
+    """
+    Reads a processed dataset, preferring its Parquet file over the CSV.
+
+    Args:
+        data_dir (str): Directory holding the processed files
+        name (str): File name without extension, e.g. 'art_forms_processed'
+
+    Returns:
+        pandas.DataFrame: The dataset, or None if neither file exists
+    """
+    path = processed_file(data_dir, name)
+    if path is None:
+        return None
+    if path.endswith('.parquet'):
+        return cached_read_parquet(path)
+    return cached_read_csv(path)
@@ -0,0 +1,191 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Label used for missing values so they can be selected like any other value
+MISSING_LABEL = '(none)'
+
+# Bits set in each byte value, for NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(words):
+    """Counts the set bits along the last axis of a uint64 bitmap array."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(words.shape[:-1] + (-1,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def _pack(mask):
+    """Packs a boolean row mask into uint64 words (bit i of the bitmap is row i)."""
+    packed = np.packbits(mask, bitorder='little')
+    padded = np.zeros(-(-len(packed) // 8) * 8, dtype=np.uint8)
+    padded[:len(packed)] = packed
+    return padded.view(np.uint64)
+
+
+class FacetIndex:
+    """
+    Bitmap index over the categorical columns of a DataFrame.
+
+    Every distinct value of every facet column gets a bitmap with one bit
+    per row, so a filter is a handful of word-wise ORs (values selected
+    within a facet) and ANDs (across facets) instead of a string comparison
+    over the whole column. Facet counts are computed from the same bitmaps,
+    each facet counted under the selections of the other facets so that
+    users can see how many rows every value would add.
+    """
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.columns = list(columns)
+        self.num_rows = len(df)
+        self.values = {}
+        self.bitmaps = {}
+        self._positions = {}
+        self._all = _pack(np.ones(self.num_rows, dtype=bool))
+        self._none = np.zeros_like(self._all)
+
+        for col in self.columns:
+            series = df[col]
+            labels = series.astype(object).where(series.notna(), MISSING_LABEL).astype(str)
+            codes, uniques = pd.factorize(labels, sort=True)
+            self.values[col] = list(uniques)
+            self._positions[col] = {value: i for i, value in enumerate(uniques)}
+            bitmaps = np.zeros((len(uniques), len(self._all)), dtype=np.uint64)
+            for i in range(len(uniques)):
+                bitmaps[i] = _pack(codes == i)
+            self.bitmaps[col] = bitmaps
+
+    def _facet_mask(self, col, selected):
+        """OR of the bitmaps of the selected values of one facet."""
+        positions = [self._positions[col][v] for v in selected if v in self._positions[col]]
+        if not positions:
+            return self._none
+        return np.bitwise_or.reduce(self.bitmaps[col][positions], axis=0)
+
+    def mask(self, selections, combine='and', exclude=None):
+        """
+        Builds the row bitmap matching a set of facet selections.
+
+        Args:
+            selections (dict): Column mapped to the list of selected values.
+                Columns with no selected values do not constrain the result
+            combine (str): 'and' to require every constrained facet to match,
+                'or' to accept rows matching any of them
+            exclude (str, optional): Facet to ignore, used for facet counts
+
+        Returns:
+            numpy.ndarray: uint64 bitmap words
+        """
+        active = [(col, values) for col, values in selections.items()
+                  if values and col != exclude and col in self.bitmaps]
+        if not active:
+            return self._all
+        masks = [self._facet_mask(col, values) for col, values in active]
+        if combine == 'or':
+            return np.bitwise_or.reduce(masks, axis=0)
+        return np.bitwise_and.reduce(masks, axis=0)
+
+    def count(self, mask):
+        """Returns the number of rows set in a bitmap."""
+        return int(_popcount(mask))
+
+    def rows(self, mask):
+        """Returns the positional row indexes set in a bitmap."""
+        bits = np.unpackbits(mask.view(np.uint8), count=self.num_rows, bitorder='little')
+        return np.flatnonzero(bits)
+
+    def filter(self, selections, combine='and'):
+        """
+        Returns the rows of the indexed DataFrame matching the selections.
+
+        Args:
+            selections (dict): Column mapped to the list of selected values
+            combine (str): 'and' or 'or', see mask()
+
+        Returns:
+            pandas.DataFrame: Matching rows in their original order
+        """
+        mask = self.mask(selections, combine)
+        if mask is self._all:
+            return self.df
+        return self.df.iloc[self.rows(mask)]
+
+    def facet_counts(self, selections, combine='and'):
+        """
+        Counts the matching rows for every value of every facet.
+
+        With combine='and', each facet is counted under the selections of
+        the other facets only, so selecting a value never hides its siblings.
+
+        Args:
+            selections (dict): Column mapped to the list of selected values
+            combine (str): 'and' or 'or', see mask()
+
+        Returns:
+            dict: Column mapped to a {value: count} dictionary
+        """
+        counts = {}
+        for col in self.columns:
+            if combine == 'and':
+                base = self.mask(selections, 'and', exclude=col)
+            else:
+                base = self._all
+            per_value = _popcount(self.bitmaps[col] & base)
+            counts[col] = dict(zip(self.values[col], per_value.tolist()))
+        return counts
+
+
+class IndexCache:
+    """
+    Process-wide LRU of indexes keyed by the version of the data they were
+    built from, so an index is built once per data version and shared
+    across reruns and sessions. Used for the facet, search and spatial
+    indexes.
+    """
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, load):
+        """
+        Returns the index for `key`, calling `load()` to build it on a miss.
+
+        Args:
+            key (hashable): Identifies the data, e.g. (dataset name, file version)
+            load (callable): Builds the index
+
+        Returns:
+            Shared index
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        index = load()
+
+        with self._lock:
+            self._entries[key] = index
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self):
+        """Removes every cached index."""
+        with self._lock:
+            self._entries.clear()
+
+
+_facet_cache = IndexCache()
+
+
+def get_facet_index(key, df, columns):
+    """Returns the shared facet index for a dataset version, building it on first use."""
+    return _facet_cache.get((key, tuple(columns)), lambda: FacetIndex(df, columns))
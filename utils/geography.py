@@ -0,0 +1,265 @@
+import numpy as np
+import pandas as pd
+
+# Reference data for the geography dimension tables built by the pipeline.
+# Region_ID 0 is reserved for places that do not match any known state or
+# region; State_ID -1 marks facts without a resolvable state.
+REGIONS = [
+    'Other',
+    'North India',
+    'South India',
+    'East India',
+    'West India',
+    'Central India',
+    'Northeast India'
+]
+
+# State or union territory, region, approximate centroid (lat, lon)
+STATES = [
+    ('Andaman and Nicobar Islands', 'South India', 11.7401, 92.6586),
+    ('Andhra Pradesh', 'South India', 15.9129, 79.7400),
+    ('Arunachal Pradesh', 'Northeast India', 28.2180, 94.7278),
+    ('Assam', 'Northeast India', 26.2006, 92.9376),
+    ('Bihar', 'East India', 25.0961, 85.3131),
+    ('Chandigarh', 'North India', 30.7333, 76.7794),
+    ('Chhattisgarh', 'Central India', 21.2787, 81.8661),
+    ('Dadra and Nagar Haveli and Daman and Diu', 'West India', 20.3974, 72.8328),
+    ('Delhi', 'North India', 28.7041, 77.1025),
+    ('Goa', 'West India', 15.2993, 74.1240),
+    ('Gujarat', 'West India', 22.2587, 71.1924),
+    ('Haryana', 'North India', 29.0588, 76.0856),
+    ('Himachal Pradesh', 'North India', 31.1048, 77.1734),
+    ('Jammu and Kashmir', 'North India', 34.0837, 74.7973),
+    ('Jharkhand', 'East India', 23.6102, 85.2799),
+    ('Karnataka', 'South India', 15.3173, 75.7139),
+    ('Kerala', 'South India', 10.8505, 76.2711),
+    ('Ladakh', 'North India', 34.1526, 77.5771),
+    ('Lakshadweep', 'South India', 10.5667, 72.6417),
+    ('Madhya Pradesh', 'Central India', 22.9734, 78.6569),
+    ('Maharashtra', 'West India', 19.7515, 75.7139),
+    ('Manipur', 'Northeast India', 24.6637, 93.9063),
+    ('Meghalaya', 'Northeast India', 25.4670, 91.3662),
+    ('Mizoram', 'Northeast India', 23.1645, 92.9376),
+    ('Nagaland', 'Northeast India', 26.1584, 94.5624),
+    ('Odisha', 'East India', 20.9517, 85.0985),
+    ('Puducherry', 'South India', 11.9416, 79.8083),
+    ('Punjab', 'North India', 31.1471, 75.3412),
+    ('Rajasthan', 'West India', 27.0238, 74.2179),
+    ('Sikkim', 'Northeast India', 27.5330, 88.5122),
+    ('Tamil Nadu', 'South India', 11.1271, 78.6569),
+    ('Telangana', 'South India', 18.1124, 79.0193),
+    ('Tripura', 'Northeast India', 23.9408, 91.9882),
+    ('Uttar Pradesh', 'North India', 26.8467, 80.9462),
+    ('Uttarakhand', 'North India', 30.0668, 79.0193),
+    ('West Bengal', 'East India', 22.9868, 87.8550)
+]
+
+# Alternative spellings and historical names found in the source datasets
+STATE_ALIASES = {
+    'Kashmir': 'Jammu and Kashmir',
+    'Maharastra': 'Maharashtra',
+    'Daman and Diu': 'Dadra and Nagar Haveli and Daman and Diu',
+    'Dadra and Nagar Haveli': 'Dadra and Nagar Haveli and Daman and Diu',
+    'Orissa': 'Odisha',
+    'Pondicherry': 'Puducherry',
+    'NCT of Delhi': 'Delhi'
+}
+
+# Approximate coordinates (lat, lon) of frequently visited cities, used to
+# place facts that only name a city; other cities fall back to their state
+CITIES = [
+    ('Agra', 27.1767, 78.0081),
+    ('Ahmedabad', 23.0225, 72.5714),
+    ('Ajmer', 26.4499, 74.6399),
+    ('Amritsar', 31.6340, 74.8723),
+    ('Aurangabad', 19.8762, 75.3433),
+    ('Bangalore', 12.9716, 77.5946),
+    ('Bengaluru', 12.9716, 77.5946),
+    ('Bhopal', 23.2599, 77.4126),
+    ('Bhubaneswar', 20.2961, 85.8245),
+    ('Chandigarh', 30.7333, 76.7794),
+    ('Chennai', 13.0827, 80.2707),
+    ('Coimbatore', 11.0168, 76.9558),
+    ('Darjeeling', 27.0410, 88.2663),
+    ('Dehradun', 30.3165, 78.0322),
+    ('Delhi', 28.6139, 77.2090),
+    ('Diu', 20.7144, 70.9874),
+    ('Gandhinagar', 23.2156, 72.6369),
+    ('Gangtok', 27.3389, 88.6065),
+    ('Goa', 15.4909, 73.8278),
+    ('Gurugram', 28.4595, 77.0266),
+    ('Guwahati', 26.1445, 91.7362),
+    ('Hampi', 15.3350, 76.4600),
+    ('Haridwar', 29.9457, 78.1642),
+    ('Hyderabad', 17.3850, 78.4867),
+    ('Indore', 22.7196, 75.8577),
+    ('Jaipur', 26.9124, 75.7873),
+    ('Jaisalmer', 26.9157, 70.9083),
+    ('Jodhpur', 26.2389, 73.0243),
+    ('Kanyakumari', 8.0883, 77.5385),
+    ('Khajuraho', 24.8318, 79.9199),
+    ('Kochi', 9.9312, 76.2673),
+    ('Kolkata', 22.5726, 88.3639),
+    ('Konark', 19.8876, 86.0945),
+    ('Leh', 34.1526, 77.5771),
+    ('Lonavala', 18.7546, 73.4062),
+    ('Lucknow', 26.8467, 80.9462),
+    ('Madurai', 9.9252, 78.1198),
+    ('Mahabalipuram', 12.6208, 80.1945),
+    ('Manali', 32.2432, 77.1892),
+    ('Mathura', 27.4924, 77.6737),
+    ('Mount Abu', 24.5926, 72.7156),
+    ('Mumbai', 19.0760, 72.8777),
+    ('Munnar', 10.0889, 77.0595),
+    ('Mussoorie', 30.4598, 78.0644),
+    ('Mysore', 12.2958, 76.6394),
+    ('Nagpur', 21.1458, 79.0882),
+    ('Nainital', 29.3919, 79.4542),
+    ('New Delhi', 28.6139, 77.2090),
+    ('Noida', 28.5355, 77.3910),
+    ('Ooty', 11.4102, 76.6950),
+    ('Patna', 25.5941, 85.1376),
+    ('Port Blair', 11.6234, 92.7265),
+    ('Puducherry', 11.9416, 79.8083),
+    ('Pune', 18.5204, 73.8567),
+    ('Puri', 19.8135, 85.8312),
+    ('Pushkar', 26.4897, 74.5511),
+    ('Rameswaram', 9.2876, 79.3129),
+    ('Rishikesh', 30.0869, 78.2676),
+    ('Shimla', 31.1048, 77.1734),
+    ('Srinagar', 34.0837, 74.7973),
+    ('Thanjavur', 10.7870, 79.1378),
+    ('Thiruvananthapuram', 8.5241, 76.9366),
+    ('Udaipur', 24.5854, 73.7125),
+    ('Ujjain', 23.1765, 75.7885),
+    ('Varanasi', 25.3176, 82.9739),
+    ('Visakhapatnam', 17.6868, 83.2185),
+    ('Vrindavan', 27.5650, 77.6593)
+]
+
+
+def build_dim_region():
+    """
+    Builds the region dimension table.
+    Region centroids are the mean of their member state centroids.
+
+    Returns:
+        pandas.DataFrame: Region_ID, Region, Latitude, Longitude
+    """
+    states = pd.DataFrame(STATES, columns=['State', 'Region', 'Latitude', 'Longitude'])
+    centroids = states.groupby('Region')[['Latitude', 'Longitude']].mean().round(4)
+    dim = pd.DataFrame({'Region_ID': np.arange(len(REGIONS), dtype=np.int8), 'Region': REGIONS})
+    return dim.join(centroids, on='Region')
+
+
+def build_dim_state():
+    """
+    Builds the state dimension table.
+
+    Returns:
+        pandas.DataFrame: State_ID, State, Region_ID, Latitude, Longitude
+    """
+    states = pd.DataFrame(STATES, columns=['State', 'Region', 'Latitude', 'Longitude'])
+    region_ids = pd.Index(REGIONS).get_indexer(states['Region']).astype(np.int8)
+    return pd.DataFrame({
+        'State_ID': np.arange(len(states), dtype=np.int16),
+        'State': states['State'],
+        'Region_ID': region_ids,
+        'Latitude': states['Latitude'],
+        'Longitude': states['Longitude']
+    })
+
+
+def resolve_state_ids(names, dim_state=None):
+    """
+    Maps state names (including known aliases) to State_IDs.
+
+    Args:
+        names (pandas.Series): State names
+        dim_state (pandas.DataFrame, optional): State dimension. Built if omitted
+
+    Returns:
+        numpy.ndarray: int16 State_IDs, -1 where the name is unknown
+    """
+    if dim_state is None:
+        dim_state = build_dim_state()
+    names = names.astype(str).str.strip()
+    canonical = names.map(STATE_ALIASES).fillna(names)
+    positions = pd.Index(dim_state['State']).get_indexer(canonical)
+    state_ids = dim_state['State_ID'].to_numpy()
+    return np.where(positions >= 0, state_ids[positions], -1).astype(np.int16)
+
+
+def resolve_locations(names, dim_state=None, dim_region=None):
+    """
+    Maps free-text locations that may be either states or regions
+    (e.g. 'Kerala', 'Kashmir' or 'North India') to State and Region IDs.
+
+    Args:
+        names (pandas.Series): Location names
+        dim_state (pandas.DataFrame, optional): State dimension. Built if omitted
+        dim_region (pandas.DataFrame, optional): Region dimension. Built if omitted
+
+    Returns:
+        tuple: (int16 State_IDs with -1 for non-states, int8 Region_IDs with 0 for unknown)
+    """
+    if dim_state is None:
+        dim_state = build_dim_state()
+    if dim_region is None:
+        dim_region = build_dim_region()
+    state_ids = resolve_state_ids(names, dim_state)
+
+    # States inherit their region; otherwise try the name as a region
+    state_regions = dim_state.set_index('State_ID')['Region_ID'].reindex(state_ids).to_numpy()
+    region_positions = pd.Index(dim_region['Region']).get_indexer(names.astype(str).str.strip())
+    direct_regions = np.where(region_positions >= 0,
+                              dim_region['Region_ID'].to_numpy()[region_positions], 0)
+    region_ids = np.where(state_ids >= 0, state_regions, direct_regions)
+    return state_ids, np.nan_to_num(region_ids).astype(np.int8)
+
+
+def location_centroids(state_ids, region_ids, dim_state, dim_region):
+    """
+    Looks up coordinates for facts keyed by State_ID and Region_ID.
+    The state centroid is used when the state is known, otherwise the region's.
+
+    Args:
+        state_ids (array-like): State_IDs, -1 where unknown
+        region_ids (array-like): Region_IDs
+        dim_state (pandas.DataFrame): State dimension
+        dim_region (pandas.DataFrame): Region dimension
+
+    Returns:
+        tuple: (latitudes, longitudes) as float arrays, NaN where unknown
+    """
+    state_ids = np.asarray(state_ids)
+    states = dim_state.set_index('State_ID')[['Latitude', 'Longitude']].reindex(state_ids).to_numpy()
+    regions = dim_region.set_index('Region_ID')[['Latitude', 'Longitude']].reindex(np.asarray(region_ids)).to_numpy()
+    coords = np.where((state_ids >= 0)[:, None], states, regions)
+    return coords[:, 0], coords[:, 1]
+
+
+def place_coordinates(cities, state_ids, dim_state):
+    """
+    Looks up approximate coordinates for facts that name a city and a state.
+    Cities listed in CITIES get the city's coordinates; the others get the
+    centroid of their state.
+
+    Args:
+        cities (pandas.Series): City names
+        state_ids (array-like): State_IDs, -1 where unknown
+        dim_state (pandas.DataFrame): State dimension
+
+    Returns:
+        tuple: (latitudes, longitudes, precision) where precision is 'city',
+            'state' or 'unknown' per fact
+    """
+    known = pd.DataFrame(CITIES, columns=['City', 'Latitude', 'Longitude'])
+    positions = pd.Index(known['City'].str.lower()).get_indexer(cities.astype(str).str.strip().str.lower())
+    city_coords = known[['Latitude', 'Longitude']].to_numpy()[positions]
+    states = dim_state.set_index('State_ID')[['Latitude', 'Longitude']].reindex(np.asarray(state_ids)).to_numpy()
+
+    has_city = (positions >= 0)[:, None]
+    coords = np.where(has_city, city_coords, states)
+    precision = np.where(positions >= 0, 'city', np.where(np.isnan(states[:, 0]), 'unknown', 'state'))
+    return coords[:, 0], coords[:, 1], precision
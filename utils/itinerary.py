@@ -0,0 +1,339 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.spatial import haversine_km
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Order of the Best_Time_To_Visit values within a day
+TIME_SLOTS = {'Morning': 0, 'All': 1, 'Afternoon': 1, 'Evening': 2, 'Night': 3}
+
+DAY_START_HOUR = 9
+DEFAULT_SPEED_KMH = 40
+# Roads are longer than the great-circle distance between two points
+ROAD_FACTOR = 1.3
+# Allowance for moving between two stops, even when their approximate
+# coordinates are the same (e.g. two places located by the same city)
+MIN_LEG_HOURS = 0.25
+# Number of nearest stops whose travel times measure how central a stop is
+SEED_NEIGHBOURS = 3
+
+ITINERARY_COLUMNS = ['Day', 'Date', 'Weekday', 'Stop', 'Name', 'City', 'Start', 'Visit_Hours',
+                     'Travel_km', 'Travel_Hours', 'Travel_Days', 'Best_Time_To_Visit', 'Latitude', 'Longitude']
+
+
+def distance_matrix(lat, lon):
+    """
+    Pairwise great-circle distances between stops.
+
+    Args:
+        lat (numpy.ndarray): Latitudes in degrees
+        lon (numpy.ndarray): Longitudes in degrees
+
+    Returns:
+        numpy.ndarray: Square matrix of distances in km
+    """
+    lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+
+def travel_hours(distances, speed_kmh=DEFAULT_SPEED_KMH):
+    """
+    Converts a distance matrix to travel hours by road.
+
+    Args:
+        distances (numpy.ndarray): Square matrix of distances in km
+        speed_kmh (float): Average travel speed
+
+    Returns:
+        numpy.ndarray: Square matrix of hours, at least MIN_LEG_HOURS between two stops
+    """
+    hours = np.maximum(distances * ROAD_FACTOR / speed_kmh, MIN_LEG_HOURS)
+    np.fill_diagonal(hours, 0.0)
+    return hours
+
+
+def route_cost(route, cost):
+    """Returns the total cost of the legs of an open route."""
+    return float(cost[route[:-1], route[1:]].sum()) if len(route) > 1 else 0.0
+
+
+def two_opt(route, cost, max_rounds=None):
+    """
+    Improves an open route by reversing segments while that shortens it.
+
+    The route is closed through a dummy stop that costs nothing to reach,
+    so the usual cyclic 2-opt move also moves the route's ends. Each round
+    scores every segment reversal at once and applies the best one.
+
+    Args:
+        route (numpy.ndarray): Stop positions in visiting order
+        cost (numpy.ndarray): Square, symmetric cost matrix
+        max_rounds (int, optional): Limit on the reversals applied. Defaults to n²
+
+    Returns:
+        numpy.ndarray: Improved route
+    """
+    n = len(route)
+    if n < 4:
+        return route
+    extended = np.zeros((n + 1, n + 1))
+    extended[:n, :n] = cost
+    tour = np.concatenate([[n], route])
+    upper = np.triu(np.ones((n + 1, n + 1), dtype=bool), 1)
+    for _ in range(max_rounds or n * n):
+        a, b = tour, np.roll(tour, -1)
+        edges = extended[a, b]
+        gain = edges[:, None] + edges[None, :] - extended[a[:, None], a[None, :]] - extended[b[:, None], b[None, :]]
+        gain[~upper] = 0.0
+        i, j = np.unravel_index(np.argmax(gain), gain.shape)
+        if gain[i, j] <= 1e-9:
+            break
+        tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1].copy()
+    dummy = int(np.flatnonzero(tour == n)[0])
+    return np.concatenate([tour[dummy + 1:], tour[:dummy]])
+
+
+def _insertion_costs(route, candidates, hours, visit_hours):
+    """
+    Extra hours of adding each candidate to a route at its cheapest
+    position, and that position.
+    """
+    extra = np.full(len(candidates), np.inf)
+    where = np.zeros(len(candidates), dtype=np.int64)
+    for position, (before, after) in enumerate(zip([None] + route, route + [None])):
+        added = np.zeros(len(candidates))
+        if before is not None:
+            added += hours[before, candidates]
+        if after is not None:
+            added += hours[candidates, after]
+            if before is not None:
+                added -= hours[before, after]
+        better = added < extra
+        extra[better] = added[better]
+        where[better] = position
+    return extra + visit_hours[candidates], where
+
+
+def _central_stop(candidates, hours, values):
+    """The candidate with the most value close by, where the trip begins."""
+    if len(candidates) == 1:
+        return int(candidates[0])
+    nearby = min(SEED_NEIGHBOURS, len(candidates) - 1)
+    sub = hours[np.ix_(candidates, candidates)] + np.diag(np.full(len(candidates), np.inf))
+    closest = np.sort(sub, axis=1)[:, :nearby].sum(axis=1)
+    return int(candidates[np.lexsort((-values[candidates], closest))[0]])
+
+
+def schedule_route(route, hours, visit_hours, closed, weekdays, budget):
+    """
+    Cuts a trip's route into days of at most `budget` hours of travel and visits.
+
+    Stops are taken in route order. A stop that does not fit in the rest of
+    a day, or is closed on its weekday, moves to the next day; when even a
+    whole day cannot hold its transfer and visit, whole days are spent
+    travelling first, so no day runs over.
+
+    Args:
+        route (list): Stops in visiting order
+        hours (numpy.ndarray): Travel-time matrix
+        visit_hours (numpy.ndarray): Hours spent at each stop
+        closed (numpy.ndarray): Weekly off day of each stop, or None
+        weekdays (list): Weekday of each day of the trip
+        budget (float): Hours per day
+
+    Returns:
+        list: (day, stop, start hour, travel days) per stop, or None when the
+            route needs more days than the trip has
+    """
+    plan = []
+    day, used, previous = 0, 0.0, None
+    for stop in route:
+        transfer = hours[previous, stop] if previous is not None else 0.0
+        travel_days = 0
+        while True:
+            if day >= len(weekdays):
+                return None
+            if closed[stop] != weekdays[day] and used + transfer + visit_hours[stop] <= budget + 1e-9:
+                break
+            if used == 0 and closed[stop] != weekdays[day]:
+                # Not even a whole day holds the transfer and the visit
+                days_on_road = max(1, int(np.ceil((transfer + visit_hours[stop] - budget) / budget - 1e-9)))
+                day += days_on_road
+                travel_days += days_on_road
+                transfer = max(0.0, transfer - days_on_road * budget)
+            else:
+                day, used = day + 1, 0.0
+        plan.append((day, stop, DAY_START_HOUR + used + transfer, travel_days))
+        used += transfer + visit_hours[stop]
+        previous = stop
+    return plan
+
+
+def choose_route(candidates, hours, visit_hours, values, fits):
+    """
+    Picks the stops of a trip and their order (greedy orienteering).
+
+    The route starts at the candidate with the most value close by. While
+    any candidate can be added, the one adding the most value per extra
+    hour is inserted where it costs least, provided the route still `fits`;
+    when nothing more fits, the route is shortened with 2-opt and filling
+    resumes. Nearby stops are therefore kept before far-off ones.
+
+    Args:
+        candidates (list): Stops that may be visited
+        hours (numpy.ndarray): Travel-time matrix
+        visit_hours (numpy.ndarray): Hours spent at each stop
+        values (numpy.ndarray): Value of visiting each stop
+        fits (callable): Returns whether a route can be scheduled
+
+    Returns:
+        list: Stops in visiting order
+    """
+    candidates = np.asarray(candidates, dtype=np.int64)
+    if len(candidates) == 0:
+        return []
+    seed = _central_stop(candidates, hours, values)
+    if not fits([seed]):
+        return []
+    route = [seed]
+    candidates = candidates[candidates != seed]
+    while True:
+        while len(candidates):
+            extra, where = _insertion_costs(route, candidates, hours, visit_hours)
+            for pick in np.argsort(-values[candidates] / np.maximum(extra, 1e-9), kind='stable'):
+                trial = route[:where[pick]] + [int(candidates[pick])] + route[where[pick]:]
+                if fits(trial):
+                    route = trial
+                    candidates = np.delete(candidates, pick)
+                    break
+            else:
+                break
+        if not len(candidates) or len(route) < 4:
+            return route
+        stops = np.array(route)
+        shorter = [int(stop) for stop in stops[two_opt(np.arange(len(stops)), hours[np.ix_(stops, stops)])]]
+        if route_cost(shorter, hours) >= route_cost(route, hours) - 1e-9 or not fits(shorter):
+            return route
+        route = shorter
+
+
+def _format_hour(hour):
+    minutes = int(round(hour * 60))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _order_by_time_slot(visits, slots, hours, visit_hours, start, budget, keep_last=False):
+    """
+    Reorders a day's stops by their best time to visit when the day still
+    fits in its hours; otherwise keeps the route order. With keep_last, the
+    order must also end at the same stop, where the next day starts from.
+    """
+    ordered = sorted(visits, key=lambda stop: slots[stop])
+    if ordered == visits or (keep_last and ordered[-1] != visits[-1]):
+        return visits
+
+    def day_hours(order):
+        legs = [start] + order if start is not None else order
+        return sum(hours[a, b] for a, b in zip(legs[:-1], legs[1:])) + visit_hours[order].sum()
+
+    return ordered if day_hours(ordered) <= max(day_hours(visits), budget) else visits
+
+
+def plan_itinerary(stops, days, start_date, hours_per_day=8, speed_kmh=DEFAULT_SPEED_KMH):
+    """
+    Plans a multi-day itinerary over a set of places.
+
+    Not every stop fits in a short trip, so the plan chooses which to keep:
+    choose_route grows one route over the precomputed travel-time matrix by
+    value (Google rating, when known) per extra hour, accepting a stop only
+    while schedule_route can still cut the route into the trip's days. Those
+    days never run over hours_per_day: a stop moves to a later day when it
+    does not fit or is closed on its weekly off day, and a transfer too long
+    for a day is spread over whole travel days (Travel_Days). Each day's
+    stops are finally put in their best-time-to-visit order when that does
+    not make the day longer than it may be.
+
+    Args:
+        stops (pandas.DataFrame): Places with Name, City, Latitude, Longitude,
+            Visit_Hours, Weekly_Off and Best_Time_To_Visit columns, and
+            optionally Google_Rating
+        days (int): Number of days
+        start_date (datetime.date): Date of the first day
+        hours_per_day (float): Hours of visiting and travel per day
+        speed_kmh (float): Average travel speed
+
+    Returns:
+        tuple: (itinerary DataFrame with ITINERARY_COLUMNS, DataFrame of the
+            stops left out with Name, City and Reason)
+    """
+    stops = stops.reset_index(drop=True)
+    unscheduled = []
+    located = stops['Latitude'].notna() & stops['Longitude'].notna()
+    for name, city in stops.loc[~located, ['Name', 'City']].itertuples(index=False):
+        unscheduled.append((name, city, "No coordinates"))
+    stops = stops[located].reset_index(drop=True)
+
+    distances = distance_matrix(stops['Latitude'].to_numpy(), stops['Longitude'].to_numpy())
+    hours = travel_hours(distances, speed_kmh)
+
+    visit_hours = stops['Visit_Hours'].fillna(1.0).to_numpy(dtype=float)
+    closed = stops['Weekly_Off'].where(stops['Weekly_Off'].isin(WEEKDAYS)).to_numpy(dtype=object)
+    slots = stops['Best_Time_To_Visit'].map(TIME_SLOTS).fillna(1).to_numpy()
+    if 'Google_Rating' in stops.columns:
+        ratings = pd.to_numeric(stops['Google_Rating'], errors='coerce')
+        values = ratings.fillna(ratings.mean() if ratings.notna().any() else 1.0).clip(lower=0.1).to_numpy(dtype=float)
+    else:
+        values = np.ones(len(stops))
+
+    remaining = []
+    for stop in range(len(stops)):
+        if visit_hours[stop] > hours_per_day:
+            unscheduled.append((stops.at[stop, 'Name'], stops.at[stop, 'City'], "Needs more than a day"))
+        else:
+            remaining.append(stop)
+
+    weekdays = [WEEKDAYS[(start_date.weekday() + day) % 7] for day in range(days)]
+
+    def fits(route):
+        return schedule_route(route, hours, visit_hours, closed, weekdays, hours_per_day) is not None
+
+    route = choose_route(remaining, hours, visit_hours, values, fits)
+    plan = schedule_route(route, hours, visit_hours, closed, weekdays, hours_per_day)
+    scheduled = set(route)
+    remaining = [stop for stop in remaining if stop not in scheduled]
+
+    rows = []
+    previous = None
+    day_plans = [[entry for entry in plan if entry[0] == day] for day in sorted({entry[0] for entry in plan})]
+    for number_of_day, day_plan in enumerate(day_plans):
+        day, first_stop, first_start, travel_days = day_plan[0]
+        visits = [entry[1] for entry in day_plan]
+        start = previous
+        if travel_days == 0:
+            visits = _order_by_time_slot(visits, slots, hours, visit_hours, start, hours_per_day,
+                                         keep_last=number_of_day < len(day_plans) - 1)
+        # The day starts when the part of the transfer not covered by travel days is done
+        clock = first_start - (hours[start, first_stop] if start is not None else 0.0) if travel_days \
+            else DAY_START_HOUR
+        for number, stop in enumerate(visits, 1):
+            travel = hours[previous, stop] if previous is not None else 0.0
+            km = distances[previous, stop] * ROAD_FACTOR if previous is not None else 0.0
+            clock += travel
+            rows.append((day + 1, start_date + timedelta(days=day), weekdays[day], number,
+                         stops.at[stop, 'Name'], stops.at[stop, 'City'], _format_hour(clock),
+                         visit_hours[stop], round(km, 1), round(travel, 2), travel_days if number == 1 else 0,
+                         stops.at[stop, 'Best_Time_To_Visit'],
+                         stops.at[stop, 'Latitude'], stops.at[stop, 'Longitude']))
+            clock += visit_hours[stop]
+            previous = stop
+
+    for stop in remaining:
+        reason = (f"Closed on {closed[stop]}" if set(weekdays) == {closed[stop]}
+                  else f"Does not fit in {days} day{'s' if days != 1 else ''}")
+        unscheduled.append((stops.at[stop, 'Name'], stops.at[stop, 'City'], reason))
+
+    return (pd.DataFrame(rows, columns=ITINERARY_COLUMNS),
+            pd.DataFrame(unscheduled, columns=['Name', 'City', 'Reason']))
@@ -0,0 +1,128 @@
+import os
+import threading
+from collections import OrderedDict
+
+import folium
+import streamlit.components.v1 as components
+
+
+def render_map_html(m):
+    """
+    Renders a Folium map to a standalone HTML document, as folium_static does.
+
+    Args:
+        m (folium.Map): Map to render
+
+    Returns:
+        str: HTML document
+    """
+    fig = folium.Figure().add_child(m)
+    return fig.render()
+
+
+class RenderedMapCache:
+    """
+    Process-wide LRU cache of rendered map HTML.
+
+    Keys should capture everything the map depends on, typically the version
+    of the datasets it is built from plus any active filters, so an identical
+    view costs a dictionary lookup instead of rebuilding and serialising the
+    map. Bounded by entry count and total HTML size.
+    """
+
+    def __init__(self, max_entries=64, max_mb=64):
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_html(self, key, build_map):
+        """
+        Returns the HTML for `key`, building and rendering the map on a miss.
+
+        Args:
+            key (hashable): Cache key, e.g. a tuple of dataset versions and filters
+            build_map (callable): Function returning a folium.Map
+
+        Returns:
+            str: Rendered map HTML
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        html = render_map_html(build_map())
+        size = len(html.encode('utf-8'))
+
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = html
+                self.current_bytes += size
+                while self._entries and (len(self._entries) > self.max_entries
+                                         or self.current_bytes > self.max_bytes):
+                    _, old_html = self._entries.popitem(last=False)
+                    self.current_bytes -= len(old_html.encode('utf-8'))
+                    self.evictions += 1
+        return html
+
+    def configure(self, max_entries=None, max_mb=None):
+        """Changes the cache limits. Entries over the new limits are evicted on the next insert."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_mb is not None:
+                self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def clear(self):
+        """Removes every cached map."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """
+        Returns cache counters as a dictionary.
+
+        Returns:
+            dict: Hits, misses, evictions, entry count and HTML bytes held
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+            }
+
+
+_map_cache = RenderedMapCache(
+    max_entries=int(os.getenv('MAP_CACHE_MAX_ENTRIES', '64')),
+    max_mb=float(os.getenv('MAP_CACHE_MAX_MB', '64'))
+)
+
+
+def get_map_cache():
+    """Returns the process-wide rendered map cache."""
+    return _map_cache
+
+
+def show_cached_map(key, build_map, width=700, height=500):
+    """
+    Displays a Folium map in Streamlit, reusing cached HTML for identical views.
+
+    Args:
+        key (hashable): Cache key covering the data version and active filters
+        build_map (callable): Function returning the folium.Map on a cache miss
+        width (int): Width of the map frame
+        height (int): Height of the map frame
+    """
+    html = _map_cache.get_html(key, build_map)
+    return components.html(html, height=height + 10, width=width)
@@ -0,0 +1,294 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Frames with object columns above this size are measured without `deep`,
+# which would otherwise walk every Python string
+DEEP_MEMORY_MAX_ROWS = 100000
+
+logger = logging.getLogger('metrics')
+
+
+def frame_memory(df):
+    """
+    Returns the memory held by a DataFrame in bytes.
+
+    Args:
+        df (pandas.DataFrame): Frame to measure
+
+    Returns:
+        int: Bytes, including string contents unless the frame has large object columns
+    """
+    has_objects = any(dtype == object for dtype in df.dtypes)
+    deep = not has_objects or len(df) <= DEEP_MEMORY_MAX_ROWS
+    return int(df.memory_usage(index=True, deep=deep).sum())
+
+
+class Span:
+    """Timing of one section of work, with the size of the data it produced."""
+
+    def __init__(self, name, labels, depth, parent, offset):
+        self.name = name
+        self.labels = labels
+        self.depth = depth
+        self.parent = parent
+        self.offset = offset
+        self.seconds = 0.0
+        self.rows = None
+        self.memory_bytes = None
+
+    def record_frame(self, df):
+        """Attaches the row count and memory usage of a DataFrame (adds up over several calls)."""
+        if df is None:
+            return
+        self.rows = (self.rows or 0) + len(df)
+        self.memory_bytes = (self.memory_bytes or 0) + frame_memory(df)
+
+    def to_dict(self):
+        record = {
+            'span': self.name,
+            'seconds': round(self.seconds, 6),
+            'offset': round(self.offset, 6),
+            'depth': self.depth,
+            'parent': self.parent,
+        }
+        if self.rows is not None:
+            record['rows'] = self.rows
+            record['memory_bytes'] = self.memory_bytes
+        record.update(self.labels)
+        return record
+
+
+class MetricsRecorder:
+    """
+    Collects timing spans.
+
+    Spans of the current thread are kept as a trace, which a Streamlit rerun
+    or a pipeline run resets with start_trace(), so a breakdown of the last
+    run is always available. Every finished span is also added to
+    process-wide aggregates exported in the Prometheus text format, and
+    logged as a JSON line when a log destination is configured.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._aggregates = {}
+
+    def _state(self):
+        if not hasattr(self._local, 'trace'):
+            self._local.trace = []
+            self._local.stack = []
+            self._local.start = time.perf_counter()
+        return self._local
+
+    def start_trace(self):
+        """Starts a new trace for the current thread, e.g. at the top of a rerun."""
+        state = self._state()
+        state.trace = []
+        state.stack = []
+        state.start = time.perf_counter()
+
+    def trace_seconds(self):
+        """Returns the seconds elapsed since the current thread's trace started."""
+        return time.perf_counter() - self._state().start
+
+    def trace(self):
+        """Returns the spans recorded by the current thread since start_trace(), in start order."""
+        return [span.to_dict() for span in sorted(self._state().trace, key=lambda s: s.offset)]
+
+    @contextmanager
+    def span(self, name, df=None, **labels):
+        """
+        Times the enclosed block.
+
+        Args:
+            name (str): Span name, dotted by area (e.g. 'app.art.map')
+            df (pandas.DataFrame, optional): Frame whose size to record
+            **labels: Extra fields for the log record, e.g. dataset='art_forms'
+
+        Yields:
+            Span: Call record_frame() on it to attach frames produced inside the block
+        """
+        state = self._state()
+        parent = state.stack[-1].name if state.stack else None
+        start = time.perf_counter()
+        current = Span(name, labels, len(state.stack), parent, start - state.start)
+        state.stack.append(current)
+        try:
+            yield current
+        finally:
+            current.seconds = time.perf_counter() - start
+            state.stack.pop()
+            if df is not None:
+                current.record_frame(df)
+            self._finish(current)
+
+    def record(self, name, seconds, rows=None, memory_bytes=None, **labels):
+        """
+        Records a span measured elsewhere, e.g. in a worker process.
+
+        Args:
+            name (str): Span name
+            seconds (float): Elapsed time
+            rows (int, optional): Rows produced
+            memory_bytes (int, optional): Memory of the data produced
+            **labels: Extra fields for the log record
+        """
+        state = self._state()
+        current = Span(name, labels, len(state.stack),
+                       state.stack[-1].name if state.stack else None,
+                       time.perf_counter() - state.start - seconds)
+        current.seconds = seconds
+        current.rows = rows
+        current.memory_bytes = memory_bytes
+        self._finish(current)
+
+    def _finish(self, current):
+        self._state().trace.append(current)
+        with self._lock:
+            agg = self._aggregates.setdefault(current.name, {
+                'count': 0, 'seconds_total': 0.0, 'seconds_max': 0.0, 'seconds_last': 0.0,
+                'rows_last': None, 'memory_bytes_last': None
+            })
+            agg['count'] += 1
+            agg['seconds_total'] += current.seconds
+            agg['seconds_max'] = max(agg['seconds_max'], current.seconds)
+            agg['seconds_last'] = current.seconds
+            if current.rows is not None:
+                agg['rows_last'] = current.rows
+                agg['memory_bytes_last'] = current.memory_bytes
+        if logger.handlers:
+            logger.info(json.dumps(dict(current.to_dict(), ts=round(time.time(), 3))))
+
+    def aggregates(self):
+        """Returns a copy of the per-span aggregates."""
+        with self._lock:
+            return {name: dict(agg) for name, agg in self._aggregates.items()}
+
+    def to_prometheus(self, prefix='heritage_span'):
+        """
+        Renders the span aggregates in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Metrics text
+        """
+        aggregates = self.aggregates()
+        metrics = [
+            ('seconds_total', 'counter', 'seconds_total'),
+            ('runs_total', 'counter', 'count'),
+            ('seconds_max', 'gauge', 'seconds_max'),
+            ('last_seconds', 'gauge', 'seconds_last'),
+            ('last_rows', 'gauge', 'rows_last'),
+            ('last_memory_bytes', 'gauge', 'memory_bytes_last'),
+        ]
+        lines = []
+        for suffix, metric_type, key in metrics:
+            lines.append(f"# TYPE {prefix}_{suffix} {metric_type}")
+            for name, agg in sorted(aggregates.items()):
+                if agg[key] is not None:
+                    lines.append(f'{prefix}_{suffix}{{span="{name}"}} {agg[key]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Clears the aggregates and the current thread's trace."""
+        with self._lock:
+            self._aggregates.clear()
+        self.start_trace()
+
+
+_recorder = MetricsRecorder()
+
+
+def get_recorder():
+    """Returns the process-wide metrics recorder."""
+    return _recorder
+
+
+def span(name, df=None, **labels):
+    """Times the enclosed block with the process-wide recorder. See MetricsRecorder.span."""
+    return _recorder.span(name, df, **labels)
+
+
+def record_span(name, seconds, rows=None, memory_bytes=None, **labels):
+    """Records an externally measured span with the process-wide recorder."""
+    _recorder.record(name, seconds, rows, memory_bytes, **labels)
+
+
+def start_trace():
+    """Starts a new trace for the current thread."""
+    _recorder.start_trace()
+
+
+def current_trace():
+    """Returns the spans of the current thread's trace."""
+    return _recorder.trace()
+
+
+def trace_seconds():
+    """Returns the seconds elapsed since the current thread's trace started."""
+    return _recorder.trace_seconds()
+
+
+def configure_logging(destination=None):
+    """
+    Sends span records to a JSON-lines log.
+    Configured by METRICS_LOG when no destination is given: '-' for stderr or
+    a file path to append to. Unset disables span logging. Safe to call more
+    than once.
+
+    Args:
+        destination (str, optional): '-' or a file path
+    """
+    destination = destination or os.getenv('METRICS_LOG')
+    if not destination or logger.handlers:
+        return
+    if destination == '-':
+        handler = logging.StreamHandler(sys.stderr)
+    else:
+        handler = logging.FileHandler(destination)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def prometheus_enabled():
+    """Returns whether write_prometheus() has a file to write, i.e. METRICS_PROM_FILE is set."""
+    return bool(os.getenv('METRICS_PROM_FILE'))
+
+
+def export_enabled():
+    """Returns whether spans leave the process, through METRICS_LOG or METRICS_PROM_FILE."""
+    return bool(logger.handlers) or prometheus_enabled()
+
+
+def write_prometheus(path=None, extra=None):
+    """
+    Writes the span aggregates to a Prometheus text file, e.g. for the node
+    exporter textfile collector. Configured by METRICS_PROM_FILE when no path
+    is given; unset disables the export.
+
+    Args:
+        path (str, optional): Output file
+        extra (list, optional): Further metric texts to append, e.g. cache stats
+
+    Returns:
+        str: Path written, or None
+    """
+    path = path or os.getenv('METRICS_PROM_FILE')
+    if not path:
+        return None
+    text = _recorder.to_prometheus() + ''.join(extra or [])
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+# Matches single-quoted literals and double-quoted identifiers, which must
+# not be touched when normalising whitespace
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+# Tag of a query whose tables were not given; it is invalidated by any table
+ALL_TABLES = '*'
+
+
+def normalize_sql(query):
+    """
+    Collapses whitespace outside quoted text and drops a trailing semicolon,
+    so that formatting differences do not produce separate cache entries.
+    """
+    parts = _QUOTED.split(query.strip())
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r'\s+', ' ', parts[i])
+    return ''.join(parts).strip().rstrip(';').strip()
+
+
+def _table_key(name):
+    """Returns the unqualified, case-folded form of a table name."""
+    last = re.split(r'\s*\.\s*(?=(?:[^"]*"[^"]*")*[^"]*$)', name)[-1]
+    if last.startswith('"') and last.endswith('"'):
+        return last[1:-1]
+    return last.upper()
+
+
+def is_cacheable(query):
+    """Only read-only statements are cached."""
+    first_word = normalize_sql(query).split(' ', 1)[0].upper()
+    return first_word in ('SELECT', 'WITH', 'SHOW', 'DESCRIBE', 'DESC')
+
+
+class QueryCache:
+    """
+    Two-tier cache of query results keyed by normalised SQL and parameters.
+
+    The memory tier is an LRU bounded by entry count and total bytes. If a
+    directory is given, results are also written there as Parquet files with
+    a small JSON sidecar, so they survive restarts. Every entry carries its
+    own expiry time and the tables it reads from, which allows explicit
+    invalidation after those tables change.
+    """
+
+    def __init__(self, max_entries=256, max_mb=128, directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query, params=None):
+        """Builds the cache key for a query and its parameters."""
+        payload = json.dumps([normalize_sql(query), params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _disk_paths(self, key):
+        return (os.path.join(self.directory, f"{key}.parquet"),
+                os.path.join(self.directory, f"{key}.json"))
+
+    def get(self, query, params=None):
+        """
+        Returns the cached result for a query, or None on a miss or expiry.
+        """
+        key = self.make_key(query, params)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                df, expires_at, _, _ = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return df
+                self._remove(key)
+
+        if self.directory:
+            df, meta = self._read_disk(key)
+            if df is not None and meta['expires_at'] > now:
+                with self._lock:
+                    self.disk_hits += 1
+                self._store(key, df, meta['expires_at'], set(meta['tables']))
+                return df
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, query, params, df, ttl, tables=None):
+        """
+        Stores a query result for `ttl` seconds in memory and, if configured, on disk.
+
+        Args:
+            query (str): SQL query
+            params (dict): Parameters of the query
+            df (pandas.DataFrame): Result to cache
+            ttl (float): Seconds the result stays valid
+            tables (iterable, optional): Tables the query reads, optionally
+                schema-qualified. When omitted the result is invalidated by
+                a change to any table
+        """
+        key = self.make_key(query, params)
+        expires_at = time.time() + ttl
+        tables = {_table_key(name) for name in tables} if tables is not None else {ALL_TABLES}
+        self._store(key, df, expires_at, tables)
+        if self.directory:
+            self._write_disk(key, df, expires_at, tables)
+
+    def _store(self, key, df, expires_at, tables):
+        size = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (df, expires_at, tables, size)
+            self.current_bytes += size
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self.current_bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        _, _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def _read_disk(self, key):
+        data_path, meta_path = self._disk_paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta['expires_at'] <= time.time():
+                self._delete_disk(key)
+                return None, None
+            return pd.read_parquet(data_path), meta
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+    def _write_disk(self, key, df, expires_at, tables):
+        data_path, meta_path = self._disk_paths(key)
+        try:
+            # Both files are replaced atomically, so a reader never sees a partial file;
+            # the sidecar is written last so it never sees metadata without data
+            df.to_parquet(f"{data_path}.tmp", index=False)
+            os.replace(f"{data_path}.tmp", data_path)
+            with open(f"{meta_path}.tmp", 'w') as f:
+                json.dump({'expires_at': expires_at, 'tables': sorted(tables)}, f)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except Exception as e:
+            print(f"Could not write query cache entry to disk: {e}")
+
+    def _delete_disk(self, key):
+        for path in self._disk_paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def invalidate_tables(self, table_names):
+        """
+        Drops every cached result that reads from any of the given tables,
+        and every result whose tables are unknown (tagged ALL_TABLES).
+
+        Args:
+            table_names (iterable): Table names, optionally schema-qualified
+
+        Returns:
+            int: Number of distinct entries removed, whether from memory, disk or both
+        """
+        targets = {_table_key(name) for name in table_names}
+        removed = set()
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e[2] & targets or ALL_TABLES in e[2]]:
+                self._remove(key)
+                removed.add(key)
+
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if not name.endswith('.json'):
+                    continue
+                key = name[:-len('.json')]
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        tables = set(json.load(f).get('tables', []))
+                except (OSError, ValueError):
+                    continue
+                if tables & targets or ALL_TABLES in tables:
+                    self._delete_disk(key)
+                    removed.add(key)
+
+        with self._lock:
+            self.invalidations += len(removed)
+        return len(removed)
+
+    def clear(self):
+        """Removes every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(('.parquet', '.json')):
+                    self._delete_disk(os.path.splitext(name)[0])
+
+    def stats(self):
+        """
+        Returns cache counters as a dictionary.
+
+        Returns:
+            dict: Memory and disk hits, misses, invalidations and memory usage
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+            }
+
+
+_query_cache = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache():
+    """
+    Returns the process-wide query cache, creating it on first use.
+    Configured by QUERY_CACHE_MAX_ENTRIES (default 256), QUERY_CACHE_MAX_MB
+    (default 128) and QUERY_CACHE_DIR (unset disables the disk tier).
+    """
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = QueryCache(
+                max_entries=int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '256')),
+                max_mb=float(os.getenv('QUERY_CACHE_MAX_MB', '128')),
+                directory=os.getenv('QUERY_CACHE_DIR') or None
+            )
+        return _query_cache
@@ -0,0 +1,153 @@
+import hashlib
+import json
+
+import numpy as np
+
+# Pre-aggregated tables built from the processed datasets by
+# scripts/data_processing.py. Each entry names the processed dataset it
+# reads, the grouping columns, named aggregations as (column, function)
+# pairs and an optional sort order and row limit. The app reads the
+# materialized tables instead of aggregating the fact tables on every rerun.
+ROLLUPS = {
+    'art_forms_by_region': {
+        'source': 'art_forms_processed',
+        'group_by': ['Region', 'State_ID', 'Region_ID'],
+        'aggregations': {
+            'Art_Forms': ('Art_Form', 'count'),
+            'Cultural_Significance': ('Cultural_Significance', 'mean'),
+        },
+    },
+    'art_forms_by_type': {
+        'source': 'art_forms_processed',
+        'group_by': ['Type'],
+        'aggregations': {
+            'Art_Forms': ('Art_Form', 'count'),
+            'Practitioners_Estimate': ('Practitioners_Estimate', 'sum'),
+        },
+    },
+    'sites_by_state': {
+        'source': 'cultural_sites_processed',
+        'group_by': ['State', 'State_ID'],
+        'aggregations': {
+            'Sites': ('Site_Name', 'count'),
+            'Visitors_2022': ('Visitors_2022', 'sum'),
+            'UNESCO_Sites': ('UNESCO_Heritage', 'sum'),
+        },
+        'sort_by': 'Visitors_2022',
+        'ascending': False,
+    },
+    'top_sites_by_visitors': {
+        'source': 'cultural_sites_processed',
+        'columns': ['Site_Name', 'State', 'Region', 'Visitors_2022', 'UNESCO_Heritage'],
+        'sort_by': 'Visitors_2022',
+        'ascending': False,
+        'limit': 10,
+    },
+    'funding_by_ministry': {
+        'source': 'government_funding_processed',
+        'group_by': ['Ministry'],
+        'aggregations': {
+            'Budget_Allocation_Crores': ('Budget_Allocation_Crores', 'sum'),
+            'Actual_Utilization_Crores': ('Actual_Utilization_Crores', 'sum'),
+            'Utilization_Percentage': ('Utilization_Percentage', 'mean'),
+        },
+        'sort_by': 'Budget_Allocation_Crores',
+        'ascending': False,
+    },
+    'funding_by_year': {
+        'source': 'government_funding_processed',
+        'group_by': ['Year'],
+        'aggregations': {
+            'Budget_Allocation_Crores': ('Budget_Allocation_Crores', 'sum'),
+            'Actual_Utilization_Crores': ('Actual_Utilization_Crores', 'sum'),
+        },
+    },
+    'places_by_zone_type': {
+        'source': 'places_processed',
+        'group_by': ['Zone', 'Type'],
+        'aggregations': {
+            'Places': ('Name', 'count'),
+            'Google_Rating': ('Google_Rating', 'mean'),
+        },
+    },
+}
+
+REGISTRY_NAME = 'rollups.json'
+# Bumped when build_rollup changes the tables it writes
+ROLLUP_VERSION = 2
+
+
+def rollup_file_name(name):
+    """Returns the processed file name (without extension) of a rollup table."""
+    return f"rollup_{name}"
+
+
+def spec_hash(spec):
+    """Returns a hash of a rollup definition, so edited definitions are rebuilt."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def output_dtypes(spec, source_dtypes):
+    """
+    Column types of a rollup table, derived from its definition and the
+    declared column types of its source, so the table is the same whether
+    the source was read from Parquet or from CSV.
+
+    Args:
+        spec (dict): Rollup definition from ROLLUPS
+        source_dtypes (dict): Source column mapped to its declared NumPy dtype
+
+    Returns:
+        dict: Output column mapped to its dtype; columns of undeclared type are left out
+    """
+    if not spec.get('group_by'):
+        columns = spec.get('columns', list(source_dtypes))
+        return {col: source_dtypes[col] for col in columns if col in source_dtypes}
+
+    dtypes = {col: source_dtypes[col] for col in spec['group_by'] if col in source_dtypes}
+    for name, (col, func) in spec['aggregations'].items():
+        source = source_dtypes.get(col)
+        if func in ('count', 'nunique', 'size'):
+            dtypes[name] = np.dtype(np.int64)
+        elif func == 'sum' and source is not None:
+            dtypes[name] = np.dtype(np.int64) if source.kind in 'iub' else np.dtype(np.float64)
+        elif func in ('min', 'max', 'first', 'last') and source is not None:
+            dtypes[name] = source
+        elif func in ('mean', 'median', 'std', 'var'):
+            dtypes[name] = np.dtype(np.float64)
+    return dtypes
+
+
+def build_rollup(df, spec, dtypes=None):
+    """
+    Computes a rollup table from its source dataset.
+
+    Args:
+        df (pandas.DataFrame): Processed source dataset
+        spec (dict): Rollup definition from ROLLUPS
+        dtypes (dict, optional): Output column types, see output_dtypes
+
+    Returns:
+        pandas.DataFrame: Aggregated table
+    """
+    if spec.get('group_by'):
+        aggregations = {name: tuple(agg) for name, agg in spec['aggregations'].items()}
+        result = df.groupby(spec['group_by'], observed=True, sort=True).agg(**aggregations).reset_index()
+    else:
+        result = df[spec.get('columns', list(df.columns))]
+
+    if spec.get('sort_by'):
+        result = result.sort_values(spec['sort_by'], ascending=spec.get('ascending', True), kind='stable')
+    if spec.get('limit'):
+        result = result.head(spec['limit'])
+
+    # Mean columns are rounded so the CSV export stays readable
+    result = result.round(4).reset_index(drop=True)
+    for col, dtype in (dtypes or {}).items():
+        if col not in result.columns:
+            continue
+        if dtype.kind in 'iub' and result[col].isna().any():
+            # Missing values need the nullable variant of the type
+            dtype = 'boolean' if dtype.kind == 'b' else 'Int64'
+        result[col] = result[col].astype(dtype)
+    return result
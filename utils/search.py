@@ -0,0 +1,426 @@
+import os
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from utils.facets import IndexCache
+
+# Searchable catalogue built from the processed datasets. Each source names
+# the processed dataset, the column shown as the result title, the columns
+# shown underneath it, the columns whose words are indexed and the columns
+# used to rank equally good matches (a Google rating and a popularity
+# figure, e.g. review count). Title words weigh more than the other fields.
+SOURCES = {
+    'place': {
+        'dataset': 'places_processed',
+        'title': 'Name',
+        'subtitle': ['City', 'State', 'Type'],
+        'fields': ['City', 'State', 'Type', 'Significance', 'Zone'],
+        'rating': 'Google_Rating',
+        'popularity': 'Google_Reviews_Lakhs',
+    },
+    'site': {
+        'dataset': 'cultural_sites_processed',
+        'title': 'Site_Name',
+        'subtitle': ['State', 'Region'],
+        'fields': ['State', 'Region'],
+        'rating': None,
+        'popularity': 'Visitors_2022',
+    },
+    'art_form': {
+        'dataset': 'art_forms_processed',
+        'title': 'Art_Form',
+        'subtitle': ['Type', 'Region'],
+        'fields': ['Type', 'Region'],
+        'rating': None,
+        'popularity': 'Practitioners_Estimate',
+    },
+}
+
+DOCUMENTS_NAME = 'search_documents'
+INDEX_NAME = 'search_index.npz'
+
+TITLE_WEIGHT = 1.0
+FIELD_WEIGHT = 0.6
+# Score of a term matched as a word prefix or with one edit, relative to an
+# exact word; every further edit multiplies the fuzzy score again
+PREFIX_SCORE = 0.9
+FUZZY_SCORE = 0.8
+# Edits (insertions, deletions, substitutions, swaps of adjacent letters) a
+# fuzzy match may need: one for words up to FUZZY_SHORT_LENGTH letters, two
+# for longer words. How many similar words a term may expand to
+FUZZY_SHORT_LENGTH = 5
+FUZZY_MAX_WORDS = 32
+# Shorter terms are only matched exactly or as prefixes
+FUZZY_MIN_LENGTH = 3
+
+
+# Columns of a search result, besides its Score
+RESULT_COLUMNS = ['Kind', 'Title', 'Subtitle', 'Rating', 'Popularity']
+
+# Arrays making up a SearchIndex, as saved to INDEX_NAME
+ARRAY_NAMES = ['vocab', 'word_ptr', 'doc_ids', 'weights', 'doc_freq',
+               'gram_vocab', 'gram_ptr', 'gram_words', 'word_grams']
+
+
+def normalize_text(values):
+    """
+    Normalizes text for indexing: accents are stripped, letters lower-cased
+    and anything but ASCII letters and digits becomes a word break.
+
+    Args:
+        values (pandas.Series): Text values
+
+    Returns:
+        pyarrow.Array: Normalized text
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    text = pa.array(values.fillna('').astype(str).to_numpy(dtype=object), type=pa.string())
+    text = pc.replace_substring_regex(pc.utf8_normalize(text, 'NFKD'), r'\p{Mn}', '')
+    return pc.utf8_trim_whitespace(pc.replace_substring_regex(pc.utf8_lower(text), r'[^0-9a-z]+', ' '))
+
+
+def tokenize(text):
+    """Splits a query into words, normalized like normalize_text."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r'[^0-9a-z]+', ' ', text.lower()).split()
+
+
+def trigrams(word):
+    """Returns the set of padded character trigrams of a word."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_documents(datasets):
+    """
+    Builds the search catalogue from the processed datasets.
+
+    Args:
+        datasets (dict): Processed dataset name mapped to its DataFrame; sources
+            whose dataset is missing are left out
+
+    Returns:
+        pandas.DataFrame: One row per searchable entry with Kind, Title,
+            Subtitle, Text (indexed non-title words), Rating and Popularity
+    """
+    def join(df, columns, separator):
+        parts = [df[col].fillna('').astype(str) for col in columns]
+        joined = parts[0]
+        for part in parts[1:]:
+            joined = joined + separator + part
+        return joined.to_numpy(dtype=object)
+
+    frames = []
+    for kind, source in SOURCES.items():
+        df = datasets.get(source['dataset'])
+        if df is None or len(df) == 0:
+            continue
+        frames.append(pd.DataFrame({
+            'Kind': kind,
+            'Title': df[source['title']].astype(str).to_numpy(dtype=object),
+            'Subtitle': join(df, source['subtitle'], ', '),
+            'Text': join(df, source['fields'], ' '),
+            'Rating': df[source['rating']].to_numpy(dtype=float) if source['rating'] else np.nan,
+            'Popularity': df[source['popularity']].to_numpy(dtype=float) if source['popularity'] else np.nan,
+        }))
+    if not frames:
+        return pd.DataFrame(columns=['Kind', 'Title', 'Subtitle', 'Text', 'Rating', 'Popularity'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_index_arrays(documents):
+    """
+    Builds the inverted index and trigram index of a catalogue.
+    Tokenizing and trigram extraction run as vectorized Arrow kernels, so
+    catalogues of millions of entries build in seconds.
+
+    Returns:
+        dict: NumPy arrays, see SearchIndex
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    words = []
+    for column, weight in (('Title', TITLE_WEIGHT), ('Text', FIELD_WEIGHT)):
+        tokens = pc.split_pattern(normalize_text(documents[column]), ' ')
+        flat = pc.list_flatten(tokens)
+        keep = pc.greater(pc.utf8_length(flat), 0)
+        words.append(pd.DataFrame({
+            'word': flat.filter(keep).to_numpy(zero_copy_only=False).astype(str),
+            'doc': pc.list_parent_indices(tokens).filter(keep).to_numpy().astype(np.int32),
+            'weight': np.float32(weight),
+        }))
+    postings = (pd.concat(words, ignore_index=True)
+                .groupby(['word', 'doc'], sort=True)['weight'].max().reset_index())
+
+    # Word postings in CSR layout: the documents of vocab[i] are doc_ids[word_ptr[i]:word_ptr[i + 1]]
+    vocab, word_start = np.unique(postings['word'].to_numpy(dtype=str), return_index=True)
+    word_ptr = np.append(word_start, len(postings)).astype(np.int64)
+
+    # Trigrams of every vocabulary word, one slice position at a time
+    padded = pc.binary_join_element_wise('  ', pa.array(vocab), ' ', '')
+    lengths = pc.utf8_length(padded).to_numpy()
+    grams = []
+    for start in range(int(lengths.max(initial=0)) - 2):
+        has_gram = np.flatnonzero(lengths - 2 > start)
+        gram = pc.utf8_slice_codeunits(padded.take(has_gram), start, start + 3)
+        grams.append(pd.DataFrame({'gram': gram.to_numpy(zero_copy_only=False).astype(str),
+                                   'word': has_gram.astype(np.int32)}))
+    grams = (pd.concat(grams, ignore_index=True) if grams else pd.DataFrame({'gram': [], 'word': []}))
+    grams = grams.drop_duplicates().sort_values(['gram', 'word'], kind='stable')
+    gram_vocab, gram_start = np.unique(grams['gram'].to_numpy(dtype=str), return_index=True)
+
+    return {
+        'vocab': vocab,
+        'word_ptr': word_ptr,
+        'doc_ids': postings['doc'].to_numpy(dtype=np.int32),
+        'weights': postings['weight'].to_numpy(dtype=np.float32),
+        'doc_freq': np.diff(word_ptr).astype(np.int32),
+        'gram_vocab': gram_vocab,
+        'gram_ptr': np.append(gram_start, len(grams)).astype(np.int64),
+        'gram_words': grams['word'].to_numpy(dtype=np.int32),
+        'word_grams': np.bincount(grams['word'].to_numpy(dtype=np.int64), minlength=len(vocab)).astype(np.int32),
+    }
+
+
+def max_edits(word):
+    """Returns the edit distance a fuzzy match of `word` may have."""
+    return 1 if len(word) <= FUZZY_SHORT_LENGTH else 2
+
+
+def edit_distances(word, candidates):
+    """
+    Damerau-Levenshtein distances (optimal string alignment: insertions,
+    deletions, substitutions and swaps of adjacent letters) from a word to
+    many candidate words, computed for all candidates at once.
+
+    Args:
+        word (str): Query word
+        candidates (numpy.ndarray): Candidate words
+
+    Returns:
+        numpy.ndarray: int64 distance to each candidate
+    """
+    count = len(candidates)
+    lengths = np.char.str_len(candidates).astype(np.int64) if count else np.empty(0, dtype=np.int64)
+    width = int(lengths.max(initial=0))
+    if count == 0 or width == 0:
+        return np.full(count, len(word), dtype=np.int64)
+    # Candidates as a zero-padded (count, width) matrix of code points
+    chars = np.asarray(candidates, dtype=f'<U{width}').view(np.uint32).reshape(count, width)
+    codes = [ord(char) for char in word]
+
+    before = None
+    previous = np.broadcast_to(np.arange(width + 1, dtype=np.int64), (count, width + 1))
+    for i, code in enumerate(codes, 1):
+        current = np.empty((count, width + 1), dtype=np.int64)
+        current[:, 0] = i
+        for j in range(1, width + 1):
+            substitution = previous[:, j - 1] + (chars[:, j - 1] != code)
+            current[:, j] = np.minimum(np.minimum(previous[:, j], current[:, j - 1]) + 1, substitution)
+            if i > 1 and j > 1:
+                swapped = (chars[:, j - 2] == code) & (chars[:, j - 1] == codes[i - 2])
+                current[:, j] = np.where(swapped, np.minimum(current[:, j], before[:, j - 2] + 1), current[:, j])
+        before, previous = previous, current
+    return previous[np.arange(count), lengths]
+
+
+def _gather(ptr, ids):
+    """Returns the positions of the CSR rows `ids` of an index pointer array, concatenated."""
+    starts = ptr[ids]
+    lengths = ptr[ids + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+class SearchIndex:
+    """
+    Inverted index with trigram fuzzy matching over the search catalogue.
+
+    Words are kept in a sorted vocabulary with their postings in CSR
+    layout, so exact and prefix lookups are binary searches followed by
+    array slices. Each vocabulary word is also indexed by its character
+    trigrams; a query word that matches nothing exactly is expanded to the
+    vocabulary words within one or two edits of it, looked up among the
+    words sharing a trigram with it, which tolerates typos without
+    scanning the catalogue. Closer words score higher. Every query term has to match a
+    document; documents are ranked by match score, then rating, then
+    popularity.
+    """
+
+    def __init__(self, documents, arrays=None):
+        self.documents = documents.reset_index(drop=True)
+        arrays = arrays if arrays is not None else build_index_arrays(self.documents)
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        # Result rows are taken from plain NumPy columns, which is much
+        # cheaper than taking rows of Arrow-backed string columns
+        self._columns = {col: self.documents[col].to_numpy(dtype=object if col in ('Kind', 'Title', 'Subtitle')
+                                                           else float)
+                         for col in RESULT_COLUMNS}
+        self._kinds = self.documents['Kind'].to_numpy(dtype=object)
+        self._word_lengths = np.char.str_len(self.vocab).astype(np.int64)
+        # Rating (to a tenth) and popularity rank folded into one integer
+        # tie-breaker, so ranking is a single key instead of a lexsort
+        rating = np.round(np.nan_to_num(self._columns['Rating'], nan=0.0) * 10).astype(np.int64)
+        popularity_rank = np.argsort(np.argsort(np.nan_to_num(self._columns['Popularity'], nan=-1.0),
+                                                kind='stable'), kind='stable')
+        self._tiebreak = rating * len(self.documents) + popularity_rank
+        self._score_scale = (int(rating.max(initial=0)) + 1) * len(self.documents)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def save(self, path):
+        """Writes the index arrays to an .npz file; the catalogue is saved separately."""
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, **{name: getattr(self, name) for name in ARRAY_NAMES})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, documents, path):
+        """Loads index arrays written by save() for the given catalogue."""
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in ARRAY_NAMES}
+        return cls(documents, arrays)
+
+    def _prefix_range(self, prefix):
+        """Returns the range of vocabulary ids of the words starting with `prefix`."""
+        return (int(np.searchsorted(self.vocab, prefix, side='left')),
+                int(np.searchsorted(self.vocab, prefix + '\uffff', side='left')))
+
+    def _similar_words(self, word):
+        """
+        Returns vocabulary ids and edit distances of the words within
+        max_edits(word) of `word`, closest first. The trigram index only
+        supplies the candidates: words sharing a trigram with `word` whose
+        length is within the allowed edits.
+        """
+        limit = max_edits(word)
+        grams = np.array(sorted(trigrams(word)))
+        positions = np.searchsorted(self.gram_vocab, grams)
+        found = positions < len(self.gram_vocab)
+        positions = positions[found][self.gram_vocab[positions[found]] == grams[found]]
+        word_ids = np.unique(self.gram_words[_gather(self.gram_ptr, positions)])
+        word_ids = word_ids[np.abs(self._word_lengths[word_ids] - len(word)) <= limit]
+        distances = edit_distances(word, self.vocab[word_ids])
+        keep = distances <= limit
+        word_ids, distances = word_ids[keep], distances[keep]
+        top = np.argsort(distances, kind='stable')[:FUZZY_MAX_WORDS]
+        return word_ids[top], distances[top]
+
+    def _term_scores(self, term, prefix):
+        """Returns the best score of one query term in every document."""
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        groups = []
+
+        start, end = self._prefix_range(term)
+        if start < end and self.vocab[start] == term:
+            groups.append((np.array([start]), np.ones(1)))
+        if prefix and end - start > (1 if groups else 0):
+            ids = np.arange(start, end)
+            ids = ids[self.vocab[ids] != term]
+            groups.append((ids, np.full(len(ids), PREFIX_SCORE)))
+        if not groups and len(term) >= FUZZY_MIN_LENGTH:
+            ids, distances = self._similar_words(term)
+            groups.append((ids, FUZZY_SCORE ** distances))
+
+        for word_ids, word_scores in groups:
+            lengths = self.word_ptr[word_ids + 1] - self.word_ptr[word_ids]
+            postings = _gather(self.word_ptr, word_ids)
+            docs = self.doc_ids[postings]
+            values = self.weights[postings] * np.repeat(word_scores, lengths).astype(np.float32)
+            if len(word_ids) == 1:
+                # A word lists each document once, so plain assignment is safe and much faster
+                scores[docs] = np.maximum(scores[docs], values)
+            else:
+                np.maximum.at(scores, docs, values)
+        return scores
+
+    def search(self, query, limit=10, kinds=None):
+        """
+        Finds the catalogue entries matching a free-text query.
+        The last word of the query also matches as a prefix, so results
+        update while a word is being typed.
+
+        Args:
+            query (str): Search text
+            limit (int): Maximum number of results
+            kinds (list, optional): Restrict results to these kinds of SOURCES
+
+        Returns:
+            pandas.DataFrame: Matching entries, best first, with a Score column
+        """
+        terms = tokenize(query)
+        if not terms or len(self.documents) == 0:
+            return self._results(np.empty(0, dtype=np.int64), np.empty(0))
+
+        total = None
+        for i, term in enumerate(terms):
+            scores = self._term_scores(term, prefix=i == len(terms) - 1)
+            total = scores if total is None else np.where((total > 0) & (scores > 0), total + scores, 0)
+        if kinds is not None:
+            total = np.where(np.isin(self._kinds, kinds), total, 0)
+
+        matches = np.flatnonzero(total > 0)
+        # Scores are rounded to hundredths so that ties are broken by rating, then popularity
+        key = np.round(total[matches].astype(np.float64) * 100).astype(np.int64) * self._score_scale \
+            + self._tiebreak[matches]
+        if len(matches) > limit:
+            top = np.argpartition(-key, limit)[:limit]
+            matches, key = matches[top], key[top]
+        best = matches[np.argsort(-key, kind='stable')]
+        return self._results(best, np.round(total[best].astype(np.float64), 3))
+
+    def _results(self, rows, scores):
+        """Returns the result table of the given catalogue rows."""
+        return pd.DataFrame(dict({col: values[rows] for col, values in self._columns.items()}, Score=scores))
+
+    def complete(self, prefix, limit=5):
+        """
+        Suggests completions of the last word of `prefix`, most frequent
+        first. When earlier words were typed, only words occurring in
+        documents that match them are suggested, so every suggestion has
+        results.
+
+        Args:
+            prefix (str): Text typed so far
+            limit (int): Maximum number of suggestions
+
+        Returns:
+            list: Suggested completions of the whole text
+        """
+        terms = tokenize(prefix)
+        if not terms:
+            return []
+        start, end = self._prefix_range(terms[-1])
+        ids = np.arange(start, end)
+        if len(terms) == 1:
+            frequency = self.doc_freq[ids]
+        else:
+            matched = np.ones(len(self.documents), dtype=bool)
+            for term in terms[:-1]:
+                matched &= self._term_scores(term, prefix=False) > 0
+            lengths = self.word_ptr[ids + 1] - self.word_ptr[ids]
+            frequency = np.bincount(np.repeat(np.arange(len(ids)), lengths),
+                                    weights=matched[self.doc_ids[_gather(self.word_ptr, ids)]],
+                                    minlength=len(ids))
+        order = np.argsort(-frequency, kind='stable')[:limit + 1]
+        head = ' '.join(terms[:-1])
+        completions = [f"{head} {word}".strip() for word, count in zip(self.vocab[ids[order]], frequency[order])
+                       if count > 0 and word != terms[-1]]
+        return completions[:limit]
+
+
+_search_cache = IndexCache(max_entries=2)
+
+
+def get_search_index(key, load):
+    """Returns the shared search index for a catalogue version, loading it on first use."""
+    return _search_cache.get(key, load)
@@ -0,0 +1,193 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils import geography
+
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+
+CUBE_NAME = 'seasonal_cube.npz'
+
+# Month names and abbreviations mapped to their position in MONTHS
+_MONTH_LOOKUP = {**{month.lower(): i for i, month in enumerate(MONTHS)},
+                 **{month[:3].lower(): i for i, month in enumerate(MONTHS)}}
+
+
+def month_positions(months):
+    """
+    Maps month names, abbreviations or numbers (1-12) to positions in MONTHS.
+
+    Args:
+        months (pandas.Series): Month values
+
+    Returns:
+        numpy.ndarray: int64 positions, -1 for unrecognised values
+    """
+    # Resolve each distinct value once
+    codes, values = pd.factorize(months, use_na_sentinel=True)
+    values = pd.Series(values)
+    positions = values.astype(str).str.strip().str.lower().map(_MONTH_LOOKUP)
+    numbers = pd.to_numeric(values, errors='coerce')
+    numbers = numbers.where((numbers >= 1) & (numbers <= 12)) - 1
+    lookup = np.append(positions.fillna(numbers).fillna(-1).to_numpy(dtype=np.int64), -1)
+    return lookup[codes]
+
+
+class SeasonalCube:
+    """
+    Dense visitors cube over (year, month, region).
+
+    Regions are laid out by Region_ID of the region dimension, so the cube
+    lines up with the other processed tables. Sources without a Year column
+    get a single year slot and `years` is empty. Alongside the visitor sums
+    the cube keeps the number of records and of peak-season records per
+    cell, so views can take shares and means by slicing and summing axes
+    instead of grouping the raw rows.
+    """
+
+    def __init__(self, visitors, records, peak_records, years, regions):
+        self.visitors = visitors
+        self.records = records
+        self.peak_records = peak_records
+        self.years = np.asarray(years, dtype=np.int64)
+        self.regions = list(regions)
+
+    @property
+    def nbytes(self):
+        return self.visitors.nbytes + self.records.nbytes + self.peak_records.nbytes
+
+    @classmethod
+    def from_frame(cls, df, dim_region=None):
+        """
+        Builds the cube from seasonal tourism rows.
+
+        Args:
+            df (pandas.DataFrame): Month, Region, Visitors and Peak_Season
+                ('Yes'/'No') columns, optionally Year
+            dim_region (pandas.DataFrame, optional): Region dimension. Built if omitted
+
+        Returns:
+            SeasonalCube: Cube over the rows with a recognised month
+        """
+        if dim_region is None:
+            dim_region = geography.build_dim_region()
+        months = month_positions(df['Month'])
+        codes, region_names = pd.factorize(df['Region'].astype(str))
+        _, region_ids = geography.resolve_locations(pd.Series(region_names), dim_region=dim_region)
+        region_ids = region_ids[codes]
+        if 'Year' in df.columns:
+            years, year_positions = np.unique(df['Year'].to_numpy(dtype=np.int64), return_inverse=True)
+        else:
+            years, year_positions = np.empty(0, dtype=np.int64), np.zeros(len(df), dtype=np.int64)
+
+        valid = months >= 0
+        num_regions = len(dim_region)
+        shape = (max(len(years), 1), len(MONTHS), num_regions)
+        cells = np.ravel_multi_index((year_positions[valid], months[valid], region_ids[valid].astype(np.int64)),
+                                     shape)
+        size = int(np.prod(shape))
+
+        def cube(weights=None):
+            return np.bincount(cells, weights=weights, minlength=size).reshape(shape)
+
+        visitors = cube(pd.to_numeric(df['Visitors'], errors='coerce').fillna(0).to_numpy(dtype=float)[valid])
+        peak = (df['Peak_Season'].astype(str).str.strip().str.lower() == 'yes').to_numpy()[valid]
+        return cls(visitors, cube().astype(np.int64), cube(peak.astype(float)).astype(np.int64),
+                   years, dim_region.sort_values('Region_ID')['Region'])
+
+    def save(self, path):
+        """Writes the cube to an .npz file atomically."""
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, visitors=self.visitors, records=self.records,
+                            peak_records=self.peak_records, years=self.years,
+                            regions=np.array(self.regions, dtype=str))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a cube written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['visitors'], data['records'], data['peak_records'],
+                       data['years'], data['regions'].tolist())
+
+    def _year_slice(self, years):
+        if years is None or len(self.years) == 0:
+            return slice(None)
+        return np.isin(self.years, years)
+
+    def month_region(self, years=None, average=True):
+        """
+        Visitors per month and region, over all years or the given ones.
+
+        Args:
+            years (list, optional): Years to include. Defaults to all
+            average (bool): Mean visitors per year of data instead of the total
+
+        Returns:
+            numpy.ndarray: (12, regions) matrix
+        """
+        selected = self.visitors[self._year_slice(years)]
+        totals = selected.sum(axis=0)
+        if not average:
+            return totals
+        years_with_data = (self.records[self._year_slice(years)] > 0).sum(axis=0)
+        return np.divide(totals, years_with_data, out=np.zeros_like(totals), where=years_with_data > 0)
+
+    def peak_share(self, years=None):
+        """Share of the records flagged as peak season, as a (12, regions) matrix."""
+        selection = self._year_slice(years)
+        records = self.records[selection].sum(axis=0)
+        peak = self.peak_records[selection].sum(axis=0)
+        return np.divide(peak, records, out=np.zeros(records.shape), where=records > 0)
+
+    def active_regions(self):
+        """Positions of the regions that have any records."""
+        return np.flatnonzero(self.records.sum(axis=(0, 1)) > 0)
+
+    def best_months(self, region, count=3, years=None):
+        """
+        The busiest months of a region.
+
+        Args:
+            region (str): Region name
+            count (int): Number of months
+            years (list, optional): Years to include. Defaults to all
+
+        Returns:
+            pandas.DataFrame: Month, Visitors and Peak_Share, busiest first
+        """
+        position = self.regions.index(region)
+        visitors = self.month_region(years)[:, position]
+        shares = self.peak_share(years)[:, position]
+        top = np.argsort(-visitors, kind='stable')[:count]
+        return pd.DataFrame({
+            'Month': np.array(MONTHS, dtype=object)[top],
+            'Visitors': visitors[top].round().astype(np.int64),
+            'Peak_Share': shares[top].round(2)
+        })
+
+    def to_frame(self):
+        """
+        Flattens the cells that have records into a long table.
+
+        Returns:
+            pandas.DataFrame: Year (when present), Month, Month_Num, Region_ID,
+                Region, Visitors, Records, Peak_Share
+        """
+        year_idx, month_idx, region_idx = np.nonzero(self.records)
+        records = self.records[year_idx, month_idx, region_idx]
+        frame = {}
+        if len(self.years):
+            frame['Year'] = self.years[year_idx]
+        frame.update({
+            'Month': np.array(MONTHS, dtype=object)[month_idx],
+            'Month_Num': (month_idx + 1).astype(np.int8),
+            'Region_ID': region_idx.astype(np.int8),
+            'Region': np.array(self.regions, dtype=object)[region_idx],
+            'Visitors': self.visitors[year_idx, month_idx, region_idx].round().astype(np.int64),
+            'Records': records,
+            'Peak_Share': (self.peak_records[year_idx, month_idx, region_idx] / records).round(4)
+        })
+        return pd.DataFrame(frame)
@@ -1,6 +1,11 @@
 import snowflake.connector
 import os
+import atexit
+import threading
 from dotenv import load_dotenv
+from utils.bulk_load import BACKENDS, bulk_upload
+from utils.connection_pool import ConnectionPool
+from utils.query_cache import get_query_cache, is_cacheable
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,104 +29,174 @@ def get_snowflake_connection():
         print(f"Error connecting to Snowflake: {e}")
         return None
 
-def execute_query(query, params=None):
+def _snowflake_health_check(conn):
+    """Returns True if a pooled Snowflake connection is still usable"""
+    if conn.is_closed():
+        return False
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        return True
+    finally:
+        cursor.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_snowflake_pool():
+    """
+    Returns the process-wide Snowflake connection pool, creating it on first use.
+    Sized by SNOWFLAKE_POOL_SIZE (default 4) with idle connections closed
+    after SNOWFLAKE_POOL_IDLE_TIMEOUT seconds (default 300).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                get_snowflake_connection,
+                max_size=int(os.getenv('SNOWFLAKE_POOL_SIZE', '4')),
+                idle_timeout=float(os.getenv('SNOWFLAKE_POOL_IDLE_TIMEOUT', '300')),
+                health_check=_snowflake_health_check
+            )
+            atexit.register(_pool.close_all)
+        return _pool
+
+def snowflake_connection():
+    """
+    Context manager yielding a pooled Snowflake connection.
+    
+    Usage:
+        with snowflake_connection() as conn:
+            conn.cursor().execute(...)
+    """
+    return get_snowflake_pool().connection()
+
+def get_pool_metrics():
+    """Returns the Snowflake pool counters (creations, reuse rate, waits, ...)"""
+    return get_snowflake_pool().metrics()
+
+def iter_query_batches(query, params=None, batch_size=None, as_arrow=False):
+    """
+    Executes a query on Snowflake and yields the results in batches.
+    Rows are fetched with fetchmany, so memory stays bounded by the batch
+    size and the first batch is usable before the last row arrives. The
+    pooled connection is held until the generator is exhausted or closed.
+    
+    Args:
+        query (str): SQL query to execute
+        params (dict, optional): Parameters for the query
+        batch_size (int, optional): Rows per batch. Defaults to QUERY_BATCH_SIZE or 50000
+        as_arrow (bool): Yield pyarrow Tables instead of pandas DataFrames
+        
+    Yields:
+        pandas.DataFrame or pyarrow.Table: One batch of rows. A query that
+            returns no rows yields a single empty batch with the result columns
+    """
+    import pandas as pd
+    import pyarrow as pa
+    
+    batch_size = batch_size or int(os.getenv('QUERY_BATCH_SIZE', '50000'))
+    
+    with snowflake_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            
+            # Statements without a result set have nothing to yield
+            if cursor.description is None:
+                return
+            column_names = [desc[0] for desc in cursor.description]
+            
+            yielded = False
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows and yielded:
+                    break
+                if as_arrow:
+                    columns = list(zip(*rows)) if rows else [[] for _ in column_names]
+                    yield pa.table({name: pa.array(col) for name, col in zip(column_names, columns)})
+                else:
+                    yield pd.DataFrame.from_records(rows, columns=column_names)
+                yielded = True
+                if len(rows) < batch_size:
+                    break
+        finally:
+            cursor.close()
+
+def execute_query(query, params=None, cache_ttl=None, batch_size=None, tables=None):
     """
     Executes a query on Snowflake and returns the results as a pandas DataFrame.
+    The connection is borrowed from the shared pool rather than opened per
+    query, and the frame is assembled from the batches of iter_query_batches.
     
     Args:
         query (str): SQL query to execute
         params (dict, optional): Parameters for the query
+        cache_ttl (float, optional): Seconds to serve this read query's result
+            from the query cache. Results are not cached when omitted
+        batch_size (int, optional): Rows fetched per round trip
+        tables (list, optional): Tables the query reads, so that its cached
+            result is only invalidated by uploads to them. Any upload
+            invalidates it when omitted
         
     Returns:
-        pandas.DataFrame: Results of the query
+        pandas.DataFrame: Results of the query (shared with other callers when cached)
     """
     import pandas as pd
     
-    conn = get_snowflake_connection()
-    if conn is None:
-        return pd.DataFrame()
+    use_cache = bool(cache_ttl) and is_cacheable(query)
+    if use_cache:
+        cached = get_query_cache().get(query, params)
+        if cached is not None:
+            return cached
     
     try:
-        cursor = conn.cursor()
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        # Fetch results and column names
-        results = cursor.fetchall()
-        column_names = [desc[0] for desc in cursor.description]
-        
-        # Create DataFrame
-        df = pd.DataFrame(results, columns=column_names)
+        batches = list(iter_query_batches(query, params, batch_size))
+        if not batches:
+            return pd.DataFrame()
+        df = batches[0] if len(batches) == 1 else pd.concat(batches, ignore_index=True)
+        if use_cache:
+            get_query_cache().put(query, params, df, cache_ttl, tables)
         return df
     except Exception as e:
         print(f"Error executing query: {e}")
         return pd.DataFrame()
-    finally:
-        if conn:
-            conn.close()
-
-# Add this function to the existing snowflake_conn.py file
 
-def upload_dataframe_to_snowflake(df, table_name, create_table=True):
+def upload_dataframe_to_snowflake(df, table_name, create_table=True, method='copy', batch_size=None, conn=None):
     """
     Uploads a pandas DataFrame to a Snowflake table.
+    By default the data is written to compressed Parquet chunks, staged and
+    loaded with COPY INTO, falling back to chunked INSERTs if that fails.
     
     Args:
         df (pandas.DataFrame): DataFrame to upload
         table_name (str): Name of the Snowflake table
         create_table (bool): Whether to create the table if it doesn't exist
+        method (str): 'copy' for staged Parquet loading or 'insert' for chunked INSERTs
+        batch_size (int, optional): Rows per Parquet file or INSERT batch
+        conn (optional): Connection to use instead of borrowing one from the pool
         
     Returns:
         bool: True if successful, False otherwise
     """
-    import pandas as pd
-    
-    conn = get_snowflake_connection()
-    if conn is None:
-        print("Failed to connect to Snowflake")
-        return False
-    
     try:
-        cursor = conn.cursor()
-        
-        # Create table if it doesn't exist
-        if create_table:
-            # Generate column definitions based on DataFrame dtypes
-            columns = []
-            for col, dtype in df.dtypes.items():
-                if pd.api.types.is_integer_dtype(dtype):
-                    col_type = "INTEGER"
-                elif pd.api.types.is_float_dtype(dtype):
-                    col_type = "FLOAT"
-                elif pd.api.types.is_bool_dtype(dtype):
-                    col_type = "BOOLEAN"
-                else:
-                    col_type = "VARCHAR(255)"
-                columns.append(f'"{col}" {col_type}')
-            
-            # Create table
-            create_query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(columns)})"
-            cursor.execute(create_query)
-            print(f"Created table {table_name} in Snowflake")
-        
-        # Convert DataFrame to list of tuples for insertion
-        values = [tuple(row) for row in df.values]
-        placeholders = ", ".join(["(%s" + ", %s" * (len(df.columns) - 1) + ")"] * len(values))
-        
-        # Flatten the values list for cursor.execute
-        flat_values = [item for sublist in values for item in sublist]
-        
-        # Insert data
-        insert_query = f"INSERT INTO {table_name} ({', '.join([f'"{col}"' for col in df.columns])}) VALUES {placeholders}"
-        cursor.execute(insert_query, flat_values)
-        
-        print(f"Successfully uploaded {len(df)} rows to {table_name}")
+        if conn is not None:
+            rows = bulk_upload(conn, df, table_name, BACKENDS['snowflake'],
+                               create_table=create_table, method=method, batch_size=batch_size)
+        else:
+            with snowflake_connection() as pooled_conn:
+                rows = bulk_upload(pooled_conn, df, table_name, BACKENDS['snowflake'],
+                                   create_table=create_table, method=method, batch_size=batch_size)
+        print(f"Successfully uploaded {rows} rows to {table_name}")
+        # Cached reads of this table are now out of date
+        get_query_cache().invalidate_tables([table_name])
         return True
+    except ConnectionError:
+        print("Failed to connect to Snowflake")
+        return False
     except Exception as e:
         print(f"Error uploading data to Snowflake: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
\ No newline at end of file
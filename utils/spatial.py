@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+from utils.facets import IndexCache
+
+# Point sets indexed for proximity queries. Each source names the processed
+# dataset, the column used as the point's name and the columns shown next
+# to it. Places carry approximate coordinates (see geography.place_coordinates).
+SOURCES = {
+    'site': {
+        'dataset': 'cultural_sites_processed',
+        'name': 'Site_Name',
+        'subtitle': ['State'],
+    },
+    'place': {
+        'dataset': 'places_processed',
+        'name': 'Name',
+        'subtitle': ['City', 'State'],
+    },
+}
+
+POINTS_NAME = 'spatial_points'
+
+EARTH_RADIUS_KM = 6371.0088
+# Grid cell edge in degrees; about 28 km north-south
+CELL_DEG = 0.25
+_COLS = int(round(360 / CELL_DEG))
+_ROWS = int(round(180 / CELL_DEG))
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in kilometres, vectorized over NumPy arrays.
+
+    Args:
+        lat1, lon1 (float or numpy.ndarray): First points in degrees
+        lat2, lon2 (float or numpy.ndarray): Second points in degrees
+
+    Returns:
+        numpy.ndarray: Distances in km
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def cell_keys(lat, lon):
+    """Returns the grid cell key of each point: row-major over CELL_DEG cells."""
+    rows = np.clip(np.floor((np.asarray(lat) + 90) / CELL_DEG), 0, _ROWS - 1).astype(np.int64)
+    cols = np.clip(np.floor((np.asarray(lon) + 180) / CELL_DEG), 0, _COLS - 1).astype(np.int64)
+    return rows * _COLS + cols
+
+
+def build_points(datasets):
+    """
+    Collects the points to index from the processed datasets.
+
+    Args:
+        datasets (dict): Processed dataset name mapped to its DataFrame; sources
+            whose dataset is missing are left out
+
+    Returns:
+        pandas.DataFrame: Kind, Name, Subtitle, Latitude, Longitude, sorted by
+            grid cell, without points lacking coordinates
+    """
+    frames = []
+    for kind, source in SOURCES.items():
+        df = datasets.get(source['dataset'])
+        if df is None or len(df) == 0 or 'Latitude' not in df.columns:
+            continue
+        subtitle = df[source['subtitle'][0]].fillna('').astype(str)
+        for col in source['subtitle'][1:]:
+            subtitle = subtitle + ', ' + df[col].fillna('').astype(str)
+        frames.append(pd.DataFrame({
+            'Kind': kind,
+            'Name': df[source['name']].astype(str).to_numpy(dtype=object),
+            'Subtitle': subtitle.to_numpy(dtype=object),
+            'Latitude': df['Latitude'].to_numpy(dtype=float),
+            'Longitude': df['Longitude'].to_numpy(dtype=float),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=['Kind', 'Name', 'Subtitle', 'Latitude', 'Longitude'])
+    points = pd.concat(frames, ignore_index=True).dropna(subset=['Latitude', 'Longitude'])
+    order = np.argsort(cell_keys(points['Latitude'].to_numpy(), points['Longitude'].to_numpy()), kind='stable')
+    return points.iloc[order].reset_index(drop=True)
+
+
+class SpatialIndex:
+    """
+    Grid index over latitude/longitude points for radius and nearest-neighbour queries.
+
+    Points are sorted by the key of the CELL_DEG grid cell they fall in, so
+    the cells of one grid row that overlap a query's bounding box are a
+    single contiguous slice found by binary search. A radius query gathers
+    the candidate slices of the few rows the box spans and filters them by
+    exact haversine distance; a k-nearest query runs radius queries with a
+    doubling radius until at least k points are inside, which makes the
+    answer exact. Queries do not wrap around the antimeridian. The points
+    table written by the pipeline is already in cell order, so building
+    the index from it only computes the cell keys.
+    """
+
+    def __init__(self, points):
+        self.points = points.reset_index(drop=True)
+        self.lat = self.points['Latitude'].to_numpy(dtype=float)
+        self.lon = self.points['Longitude'].to_numpy(dtype=float)
+        self.keys = cell_keys(self.lat, self.lon)
+        if len(self.keys) > 1 and np.any(np.diff(self.keys) < 0):
+            raise ValueError("Points must be sorted by grid cell, see build_points")
+        self._lat_rad = np.radians(self.lat)
+        self._lon_rad = np.radians(self.lon)
+        self._cos_lat = np.cos(self._lat_rad)
+        self._columns = {col: self.points[col].to_numpy(dtype=object) for col in ('Kind', 'Name', 'Subtitle')}
+
+    def __len__(self):
+        return len(self.points)
+
+    def _candidates(self, lat, lon, radius_km):
+        """Returns the positions of the points in the cells overlapping the query's bounding box."""
+        dlat = np.degrees(radius_km / EARTH_RADIUS_KM)
+        # Longitude span of the box at the widest latitude it reaches
+        widest = min(abs(lat) + dlat, 89.9)
+        dlon = min(dlat / np.cos(np.radians(widest)), 180.0)
+
+        row_lo, row_hi = (np.clip(np.floor((np.array([lat - dlat, lat + dlat]) + 90) / CELL_DEG), 0, _ROWS - 1)
+                          .astype(np.int64))
+        col_lo, col_hi = (np.clip(np.floor((np.array([lon - dlon, lon + dlon]) + 180) / CELL_DEG), 0, _COLS - 1)
+                          .astype(np.int64))
+        rows = np.arange(row_lo, row_hi + 1)
+        starts = np.searchsorted(self.keys, rows * _COLS + col_lo, side='left')
+        ends = np.searchsorted(self.keys, rows * _COLS + col_hi, side='right')
+        lengths = ends - starts
+        return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+    def _distances(self, lat, lon, positions):
+        """Haversine distances in km from the query point to the given points."""
+        lat_rad, lon_rad = np.radians(lat), np.radians(lon)
+        a = (np.sin((self._lat_rad[positions] - lat_rad) / 2) ** 2
+             + np.cos(lat_rad) * self._cos_lat[positions] * np.sin((self._lon_rad[positions] - lon_rad) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def _within(self, lat, lon, radius_km):
+        positions = self._candidates(lat, lon, radius_km)
+        distances = self._distances(lat, lon, positions)
+        inside = distances <= radius_km
+        return positions[inside], distances[inside]
+
+    def within(self, lat, lon, radius_km, limit=None):
+        """
+        Finds the points within a distance of a location, nearest first.
+
+        Args:
+            lat (float): Latitude in degrees
+            lon (float): Longitude in degrees
+            radius_km (float): Search radius in km
+            limit (int, optional): Maximum number of points returned
+
+        Returns:
+            pandas.DataFrame: Kind, Name, Subtitle, Latitude, Longitude, Distance_km
+        """
+        positions, distances = self._within(lat, lon, radius_km)
+        return self._results(*self._nearest_first(positions, distances, limit))
+
+    def nearest(self, lat, lon, k=5, max_km=None):
+        """
+        Finds the k points nearest to a location.
+
+        Args:
+            lat (float): Latitude in degrees
+            lon (float): Longitude in degrees
+            k (int): Number of points
+            max_km (float, optional): Ignore points farther than this
+
+        Returns:
+            pandas.DataFrame: Kind, Name, Subtitle, Latitude, Longitude, Distance_km
+        """
+        k = min(k, len(self.points))
+        limit_km = max_km if max_km is not None else np.pi * EARTH_RADIUS_KM
+        radius = min(CELL_DEG * 111.0, limit_km)
+        while True:
+            positions, distances = self._within(lat, lon, radius)
+            if len(positions) >= k or radius >= limit_km:
+                return self._results(*self._nearest_first(positions, distances, k))
+            radius = min(radius * 2, limit_km)
+
+    @staticmethod
+    def _nearest_first(positions, distances, limit):
+        if limit is not None and len(positions) > limit:
+            top = np.argpartition(distances, limit - 1)[:limit]
+            positions, distances = positions[top], distances[top]
+        order = np.argsort(distances, kind='stable')
+        return positions[order], distances[order]
+
+    def _results(self, positions, distances):
+        """Returns the result table of the given points."""
+        result = {col: values[positions] for col, values in self._columns.items()}
+        result.update(Latitude=self.lat[positions], Longitude=self.lon[positions],
+                      Distance_km=np.round(distances, 2))
+        return pd.DataFrame(result)
+
+
+_spatial_cache = IndexCache(max_entries=2)
+
+
+def get_spatial_index(key, load):
+    """Returns the shared spatial index for a version of the points, loading it on first use."""
+    return _spatial_cache.get(key, load)
@@ -1,8 +1,12 @@
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import folium
+import time
+from folium.plugins import FastMarkerCluster
 import streamlit as st
+from utils.metrics import record_span, export_enabled
 
 def create_choropleth_map(df, geo_json, locations_col, color_col, title, color_scale='Viridis'):
     """
@@ -31,17 +35,120 @@ def create_choropleth_map(df, geo_json, locations_col, color_col, title, color_s
     fig.update_layout(margin={"r":0,"t":30,"l":0,"b":0})
     return fig
 
-def create_time_series(df, x_col, y_col, title, color=None, labels=None):
+# Default chart width in pixels; time series keep about one point per pixel per series
+DEFAULT_CHART_WIDTH = 1200
+# Figures with more points than this are drawn with WebGL (Scattergl) instead of SVG
+WEBGL_MIN_POINTS = 5000
+
+def _numeric_x(values):
+    """Returns x values as floats for downsampling: datetimes as nanoseconds, other non-numeric values by position"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+    numeric = pd.to_numeric(values, errors='coerce')
+    if numeric.isna().any():
+        return np.arange(len(values), dtype=float)
+    return numeric.to_numpy(dtype=float)
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling: keeps the first and last
+    points and, from each of n_out - 2 equal buckets in between, the point
+    forming the largest triangle with the point kept before it and the
+    mean of the next bucket. Preserves the visual shape of a line.
+    
+    Args:
+        x (numpy.ndarray): Sorted x values as floats
+        y (numpy.ndarray): y values as floats
+        n_out (int): Number of points to keep
+        
+    Returns:
+        numpy.ndarray: Positions of the kept points, ascending
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # The last bucket looks ahead to the final point
+    mean_x, mean_y = np.append(mean_x[1:], x[-1]), np.append(mean_y[1:], y[-1])
+    
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        area = np.abs((x[previous] - mean_x[bucket]) * (y[lo:hi] - y[previous])
+                      - (x[previous] - x[lo:hi]) * (mean_y[bucket] - y[previous]))
+        previous = lo + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+def minmax_indices(y, n_out):
+    """
+    Min-max downsampling: keeps the lowest and highest point of each of
+    n_out / 2 equal buckets, plus the first and last points. Cheaper than
+    LTTB and keeps every spike.
+    
+    Args:
+        y (numpy.ndarray): y values as floats, ordered by x
+        n_out (int): Approximate number of points to keep
+        
+    Returns:
+        numpy.ndarray: Positions of the kept points, ascending
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    starts = np.unique(np.linspace(0, n, max(n_out // 2, 1) + 1).astype(np.int64)[:-1])
+    bucket = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n)))
+    kept = [[0, n - 1]]
+    for extreme in (np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts)):
+        # First point of each bucket that reaches the bucket's extreme
+        candidates = np.flatnonzero(y == extreme[bucket])
+        _, first = np.unique(bucket[candidates], return_index=True)
+        kept.append(candidates[first])
+    return np.unique(np.concatenate(kept))
+
+def downsample_indices(x, y, max_points, method='lttb'):
+    """
+    Picks the points of one series to draw.
+    
+    Args:
+        x (numpy.ndarray): Sorted x values as floats
+        y (numpy.ndarray): y values as floats
+        max_points (int): Number of points to keep
+        method (str): 'lttb' or 'minmax'
+        
+    Returns:
+        numpy.ndarray: Positions of the kept points, ascending
+    """
+    if method == 'lttb':
+        return lttb_indices(x, y, max_points)
+    if method == 'minmax':
+        return minmax_indices(y, max_points)
+    raise ValueError(f"Unknown downsampling method: {method}")
+
+def create_time_series(df, x_col, y_col, title, color=None, labels=None, width=None,
+                       downsample='lttb', render_mode='auto'):
     """
     Creates a time series line chart using Plotly.
+    Series longer than the chart is wide are downsampled to about one point
+    per pixel, and figures that still hold more than WEBGL_MIN_POINTS points
+    are drawn with WebGL, so large series stay interactive.
     
     Args:
         df (pandas.DataFrame): Data containing time series
         x_col (str): Column name for x-axis (typically dates)
-        y_col (str): Column name for y-axis values
+        y_col (str or list): Column name for y-axis values, or several columns
+            to draw as one series each
         title (str): Chart title
         color (str, optional): Column name for color differentiation
         labels (dict, optional): Custom axis labels
+        width (int, optional): Chart width in pixels. Defaults to DEFAULT_CHART_WIDTH
+        downsample (str, optional): 'lttb', 'minmax', or None to draw every point
+        render_mode (str): 'svg', 'webgl', or 'auto' to pick by point count
         
     Returns:
         plotly.graph_objects.Figure: Line chart figure
@@ -49,17 +156,74 @@ def create_time_series(df, x_col, y_col, title, color=None, labels=None):
     if labels is None:
         labels = {}
     
+    # Several y columns become one long table with a series per column, as in Plotly's wide form
+    if not isinstance(y_col, str):
+        if color is not None:
+            raise ValueError("color cannot be combined with several y columns")
+        df = df.melt(id_vars=[x_col], value_vars=list(y_col), var_name='variable', value_name='value')
+        y_col, color = 'value', 'variable'
+    
+    max_points = width or DEFAULT_CHART_WIDTH
+    parts = []
+    for _, series in (df.groupby(color, sort=False, observed=True) if color else [(None, df)]):
+        series = series.dropna(subset=[y_col]).sort_values(x_col, kind='stable')
+        if downsample and len(series) > max_points:
+            keep = downsample_indices(_numeric_x(series[x_col]), series[y_col].to_numpy(dtype=float),
+                                      max_points, downsample)
+            series = series.iloc[keep]
+        parts.append(series)
+    plotted = pd.concat(parts) if parts else df
+    
+    if render_mode == 'auto':
+        render_mode = 'webgl' if len(plotted) > WEBGL_MIN_POINTS else 'svg'
+    
     fig = px.line(
-        df,
+        plotted,
         x=x_col,
         y=y_col,
         color=color,
         title=title,
-        labels=labels
+        labels=labels,
+        render_mode=render_mode
     )
     fig.update_layout(margin={"r":10,"t":30,"l":10,"b":10})
     return fig
 
+def _figure_points(fig):
+    """Returns the number of data points across the traces of a figure"""
+    points = 0
+    for trace in fig.data:
+        # Heatmaps count their cells; other traces their x, y or slice values
+        for attr in ('z', 'x', 'y', 'values'):
+            values = getattr(trace, attr, None)
+            if values is not None:
+                points += int(np.size(values))
+                break
+    return points
+
+def show_chart(fig, name, **kwargs):
+    """
+    Renders a Plotly figure in Streamlit and records it as a 'chart.<name>'
+    span: the time spent handing the figure to the browser, the points drawn
+    (as the span's rows) and the size of the figure's JSON payload (as its
+    memory), which appear in the performance breakdown and the exported
+    metrics. Measuring the payload serializes the figure again, so it is only
+    done while the breakdown is shown or the spans are exported.
+    
+    Args:
+        fig (plotly.graph_objects.Figure): Figure to render
+        name (str): Chart name, dotted by page (e.g. 'tourism.trends')
+        **kwargs: Passed to st.plotly_chart
+    """
+    payload_bytes = None
+    if export_enabled() or st.session_state.get('show_perf', False):
+        payload_bytes = len(fig.to_json().encode())
+    webgl = any(trace.type.endswith('gl') for trace in fig.data)
+    start = time.perf_counter()
+    st.plotly_chart(fig, **kwargs)
+    record_span(f"chart.{name}", time.perf_counter() - start, _figure_points(fig), payload_bytes,
+                mode='webgl' if webgl else 'svg')
+
 def create_folium_map(center=[20.5937, 78.9629], zoom=5):
     """
     Creates a Folium map centered on India.
@@ -74,7 +238,50 @@ def create_folium_map(center=[20.5937, 78.9629], zoom=5):
     m = folium.Map(location=center, zoom_start=zoom, tiles="OpenStreetMap")
     return m
 
-def add_markers_to_map(m, df, lat_col, lon_col, popup_col, tooltip_col=None, color='blue'):
+# Point counts at which add_markers_to_map switches rendering mode in 'auto'
+MARKER_MODE_MAX_POINTS = 100
+GEOJSON_MODE_MAX_POINTS = 2000
+
+# JavaScript used by FastMarkerCluster to build each point in the browser.
+# Rows are [lat, lon, popup, tooltip, color].
+_FAST_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 6, color: row[4], fillColor: row[4], fillOpacity: 0.7
+    });
+    if (row[2]) { marker.bindPopup(row[2]); }
+    if (row[3]) { marker.bindTooltip(row[3]); }
+    return marker;
+}
+"""
+
+def _marker_columns(df, lat_col, lon_col, popup_col, tooltip_col, color, color_col):
+    """
+    Extracts marker attributes as aligned lists, dropping rows without coordinates.
+    Works on whole columns instead of iterating over rows.
+    """
+    lat = pd.to_numeric(df[lat_col], errors='coerce').to_numpy(dtype=float)
+    lon = pd.to_numeric(df[lon_col], errors='coerce').to_numpy(dtype=float)
+    valid = ~(np.isnan(lat) | np.isnan(lon))
+    
+    def text(col):
+        if col is None:
+            return [None] * int(valid.sum())
+        return df[col].astype(str).to_numpy()[valid].tolist()
+    
+    colors = text(color_col) if color_col else [color] * int(valid.sum())
+    return lat[valid].tolist(), lon[valid].tolist(), text(popup_col), text(tooltip_col), colors
+
+def choose_marker_mode(n_points):
+    """Returns the rendering mode used by add_markers_to_map(mode='auto') for a point count"""
+    if n_points <= MARKER_MODE_MAX_POINTS:
+        return 'markers'
+    if n_points <= GEOJSON_MODE_MAX_POINTS:
+        return 'geojson'
+    return 'cluster'
+
+def add_markers_to_map(m, df, lat_col, lon_col, popup_col, tooltip_col=None, color='blue',
+                       color_col=None, icon=None, mode='auto'):
     """
     Adds markers to a Folium map from DataFrame coordinates.
     
@@ -86,16 +293,58 @@ def add_markers_to_map(m, df, lat_col, lon_col, popup_col, tooltip_col=None, col
         popup_col (str): Column name for popup content
         tooltip_col (str, optional): Column name for tooltip content
         color (str): Marker color
+        color_col (str, optional): Column name holding a color per row, overriding `color`
+        icon (str, optional): Icon name for 'markers' mode
+        mode (str): How to render the points:
+            'markers' - one folium.Marker per row (small datasets)
+            'geojson' - a single GeoJSON layer of circle markers
+            'cluster' - a FastMarkerCluster built in the browser from a compact array
+            'auto'    - pick by point count (see choose_marker_mode)
         
     Returns:
         folium.Map: Map with markers added
     """
-    for idx, row in df.iterrows():
-        tooltip = row[tooltip_col] if tooltip_col else None
-        folium.Marker(
-            location=[row[lat_col], row[lon_col]],
-            popup=row[popup_col],
-            tooltip=tooltip,
-            icon=folium.Icon(color=color)
+    lats, lons, popups, tooltips, colors = _marker_columns(
+        df, lat_col, lon_col, popup_col, tooltip_col, color, color_col
+    )
+    if mode == 'auto':
+        mode = choose_marker_mode(len(lats))
+    
+    if mode == 'markers':
+        for lat, lon, popup, tooltip, marker_color in zip(lats, lons, popups, tooltips, colors):
+            icon_kwargs = {'color': marker_color}
+            if icon:
+                icon_kwargs['icon'] = icon
+            folium.Marker(
+                location=[lat, lon],
+                popup=popup,
+                tooltip=tooltip,
+                icon=folium.Icon(**icon_kwargs)
+            ).add_to(m)
+    elif mode == 'geojson':
+        features = [
+            {
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+                'properties': {'popup': popup, 'tooltip': tooltip, 'color': marker_color}
+            }
+            for lat, lon, popup, tooltip, marker_color in zip(lats, lons, popups, tooltips, colors)
+        ]
+        folium.GeoJson(
+            {'type': 'FeatureCollection', 'features': features},
+            marker=folium.CircleMarker(radius=6, fill=True, fill_opacity=0.7),
+            style_function=lambda feature: {
+                'color': feature['properties']['color'],
+                'fillColor': feature['properties']['color']
+            },
+            popup=folium.GeoJsonPopup(fields=['popup'], labels=False) if popup_col else None,
+            tooltip=folium.GeoJsonTooltip(fields=['tooltip'], labels=False) if tooltip_col else None
         ).add_to(m)
-    return m
\ No newline at end of file
+    elif mode == 'cluster':
+        FastMarkerCluster(
+            [list(row) for row in zip(lats, lons, popups, tooltips, colors)],
+            callback=_FAST_MARKER_CALLBACK
+        ).add_to(m)
+    else:
+        raise ValueError(f"Unknown marker mode: {mode}")
+    return m